@@ -0,0 +1,76 @@
+"""
+Сравнение скорости шага казино: логирование в потоке симуляции, логирование через очередь в фоновом
+потоке (политики 'drop' и 'block') и headless-режим.
+
+Запуск: python benchmarks/bench_engine.py --steps 200000
+"""
+import copy
+import io
+import logging
+import logging.config
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import typer  # noqa: E402
+
+from casino import Casino  # noqa: E402
+from chip import ChipCollection  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from config import LOGGING_CONFIG, AsyncLogging  # noqa: E402
+from events import ListSink  # noqa: E402
+
+
+def configure_logging(log_dir: str) -> None:
+    """Настраивает логирование как в simulation.py, но пишет в tmp и глушит консоль."""
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["handlers"]["file"]["filename"] = str(Path(log_dir) / "sim.log")
+    config["handlers"]["console"]["stream"] = io.StringIO()
+    logging.config.dictConfig(config)
+
+
+def measure(casino: Casino, steps: int) -> float:
+    """
+    Выполняет steps шагов и возвращает скорость.
+
+    :return: Количество шагов в секунду.
+    """
+    start = time.perf_counter()
+    for _ in range(steps):
+        casino.perform_step()
+    return steps / (time.perf_counter() - start)
+
+
+def main(steps: int = 200_000, seed: int = 42) -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        configure_logging(log_dir)
+        logged = measure(Casino(ChipCollection(), seed, clock=VirtualClock()), steps)
+        logging.shutdown()
+    queued = {}
+    for policy in ("drop", "block"):
+        with tempfile.TemporaryDirectory() as log_dir:
+            configure_logging(log_dir)
+            # Время меряется в потоке симуляции: дописывание очереди после прогона в него не входит
+            with AsyncLogging(policy=policy) as logs:
+                queued[policy] = measure(Casino(ChipCollection(), seed, clock=VirtualClock()), steps)
+            logging.shutdown()
+        if logs.dropped:
+            print(f"очередь ({policy}): отброшено записей {logs.dropped}")
+    headless = measure(Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True), steps)
+
+    sink_casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True)
+    sink_casino.attach_sink(ListSink())
+    with_sink = measure(sink_casino, steps)
+
+    print(f"{'режим':<24}{'шагов/с':>14}{'ускорение':>12}")
+    for name, rate in (("логирование", logged), ("очередь, drop", queued["drop"]),
+                       ("очередь, block", queued["block"]), ("headless", headless),
+                       ("headless + ListSink", with_sink)):
+        print(f"{name:<24}{rate:>14,.0f}{rate / logged:>11.1f}x")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,103 @@
+"""
+Память на сущность: классы со __slots__ против таких же объектов с __dict__ у каждого экземпляра,
+а также казино целиком (объекты и коллекции) и векторный движок.
+
+Запуск: python benchmarks/bench_memory.py --entities 1000000
+"""
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import typer  # noqa: E402
+
+from casino import Casino  # noqa: E402
+from chip import Chip, ChipCollection  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from goose import HonkGoose, RichGoose  # noqa: E402
+from player import Player, PsychoPlayer  # noqa: E402
+
+
+def slot_fields(cls: type) -> list[str]:
+    """Все поля класса из __slots__ по всей иерархии."""
+    return [field for klass in reversed(cls.__mro__) for field in getattr(klass, "__slots__", ())]
+
+
+def dict_backed(cls: type) -> type:
+    """Класс с теми же полями, что у cls, но с __dict__ у каждого экземпляра (как было до __slots__)."""
+    fields = slot_fields(cls)
+
+    def __init__(self, *values):
+        for field, value in zip(fields, values):
+            setattr(self, field, value)
+
+    return type(f"Dict{cls.__name__}", (), {"__init__": __init__})
+
+
+def allocated(build) -> int:
+    """Сколько байт выделяет build() и удерживает его результат."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def per_object(objects: list) -> tuple[float, float]:
+    """
+    Память на объект для готовых объектов со __slots__ и для их двойников с __dict__.
+
+    Значения полей общие, поэтому в разницу попадает только устройство самих объектов.
+
+    :return: Байт на объект: (со __slots__, с __dict__).
+    """
+    cls = type(objects[0])
+    fields = slot_fields(cls)
+    twin = dict_backed(cls)
+    values = [[getattr(obj, field) for field in fields] for obj in objects]
+    slotted = allocated(lambda: [cls.__new__(cls) for _ in values])
+    dicts = allocated(lambda: [twin(*row) for row in values])
+    return slotted / len(objects), dicts / len(objects)
+
+
+def main(entities: int = 100_000, seed: int = 42) -> None:
+    samples = {
+        "Player": [Player(f"Игрок {i}", 100) for i in range(entities)],
+        "PsychoPlayer": [PsychoPlayer(f"Игрок {i}", 100) for i in range(entities)],
+        "HonkGoose": [HonkGoose(f"Гусь {i}", 5) for i in range(entities)],
+        "RichGoose": [RichGoose(f"Гусь {i}", 5) for i in range(entities)],
+        "Chip": [Chip("Белый", 1) for _ in range(entities)],
+    }
+    print(f"{'класс':<16}{'__slots__, Б':>14}{'__dict__, Б':>14}{'экономия':>10}")
+    for name, objects in samples.items():
+        slotted, dicts = per_object(objects)
+        print(f"{name:<16}{slotted:>14.0f}{dicts:>14.0f}{1 - slotted / dicts:>9.0%}")
+    del samples
+
+    chips = ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Зелёный", 25), Chip("Чёрный", 100)])
+    for label, casino_chips in (("Casino", ChipCollection()), ("Casino + фишки", chips)):
+        def build():
+            casino = Casino(casino_chips, seed, clock=VirtualClock(), headless=True, max_entities=entities)
+            for _ in range(entities):
+                casino.add_random_entity()
+            return casino
+        print(f"{label:<16}{allocated(build) / entities:>14.0f} Б на сущность (объекты, коллекции, индексы)")
+
+    try:
+        from vectorized import VectorCasino
+    except ImportError:
+        return
+
+    def build_vector():
+        casino = VectorCasino(ChipCollection(), seed, clock=VirtualClock(), headless=True, capacity=entities)
+        casino.add_players([f"Игрок {i}" for i in range(entities)], [100] * entities, [i % 2 for i in range(entities)])
+        return casino
+    print(f"{'VectorCasino':<16}{allocated(build_vector) / entities:>14.0f} Б на игрока (массивы и имена)")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,61 @@
+"""
+Время запуска: импорт точки входа и модулей, которые загружают процессы-исполнители, по python -X importtime,
+и полное время короткого вызова CLI.
+
+Запуск: python benchmarks/bench_startup.py --runs 10
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import typer
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+MODULES = ("main", "simulation", "ensemble", "floor", "casino")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Импортирует модуль в новом интерпретаторе с -X importtime.
+
+    :return: Словарь модуль -> (собственное время, время вместе с зависимостями) в микросекундах.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=SRC,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def wall_time(args: list[str]) -> float:
+    """Полное время работы команды в новом процессе, в секундах."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=SRC, capture_output=True, check=True)
+    return time.perf_counter() - started
+
+
+def main(runs: int = 10, top: int = 10) -> None:
+    print(f"{'модуль':<14}{'импорт, мс (медиана)':>22}{'мин':>8}")
+    for module in MODULES:
+        totals = [import_times(module)[module][1] / 1000 for _ in range(runs)]
+        print(f"{module:<14}{statistics.median(totals):>22.1f}{min(totals):>8.1f}")
+
+    print(f"\nСамые дорогие импорты main (собственное время, медиана по {runs} запускам):")
+    samples = [import_times("main") for _ in range(runs)]
+    own = {name: statistics.median(sample[name][0] for sample in samples if name in sample) for name in samples[0]}
+    for name, micros in sorted(own.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40}{micros / 1000:>8.1f} мс")
+
+    for label, args in (("python -c pass", ["-c", "pass"]), ("main.py --help", ["main.py", "--help"])):
+        times = [wall_time(args) for _ in range(runs)]
+        print(f"{label:<20}{statistics.median(times) * 1000:>10.1f} мс (медиана)")
+
+
+if __name__ == "__main__":
+    typer.run(main)
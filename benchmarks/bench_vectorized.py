@@ -0,0 +1,79 @@
+"""
+Сравнение Casino (список объектов) и VectorCasino (массивы NumPy) на больших столах.
+
+Замеряются операции, которые проходят по всем игрокам: расчёт ставок после вращения,
+крик и подарок гуся, поиск сорвавшегося психопата и расчёт весов событий.
+
+Запуск: python benchmarks/bench_vectorized.py --players 2000
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import typer  # noqa: E402
+
+from casino import Casino  # noqa: E402
+from chip import ChipCollection  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from goose import HonkGoose, RichGoose  # noqa: E402
+from player import Player, PsychoPlayer  # noqa: E402
+from vectorized import VectorCasino  # noqa: E402
+
+
+def build(casino_class, players: int, seed: int) -> Casino:
+    casino = casino_class(ChipCollection(), seed, clock=VirtualClock(), headless=True)
+    for i in range(players):
+        player_class = PsychoPlayer if i % 2 else Player
+        casino.add_player(player_class(f"Игрок-{i}", 100 + i % 400))
+    casino.add_goose(HonkGoose("Крикун", 3))
+    casino.add_goose(RichGoose("Богатый", 1))
+    return casino
+
+
+def place_all_bets(casino: Casino) -> None:
+    for _ in range(len(casino.players)):
+        casino.make_random_bet()
+
+
+def timed(action, repeat: int) -> float:
+    """Возвращает среднее время одного вызова action в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(players: int = 2000, repeat: int = 5, seed: int = 42) -> None:
+    results = {}
+    for name, casino_class in (("Casino", Casino), ("VectorCasino", VectorCasino)):
+        casino = build(casino_class, players, seed)
+        honk, rich = casino.geese[0], casino.geese[1]
+
+        def spin():
+            place_all_bets(casino)
+            start = time.perf_counter()
+            casino.spin_wheel()
+            return time.perf_counter() - start
+
+        spin_time = sum(spin() for _ in range(repeat)) / repeat * 1e6
+        casino.rng.choice = lambda seq: honk
+        honk_time = timed(casino.goose_action, repeat)
+        casino.rng.choice = lambda seq: rich
+        gift_time = timed(casino.goose_action, repeat)
+        del casino.rng.choice
+        killer_time = timed(lambda: casino.find_killer(1.0), repeat)
+        weights_time = timed(casino.evualuate_weights, repeat)
+        results[name] = (spin_time, honk_time, gift_time, killer_time, weights_time)
+
+    print(f"Игроков: {players}; время одной операции, мкс")
+    print(f"{'операция':<22}{'Casino':>14}{'VectorCasino':>14}{'ускорение':>12}")
+    labels = ("spin_wheel", "крик гуся", "подарок гуся", "поиск психопата", "evualuate_weights")
+    for i, label in enumerate(labels):
+        plain, vector = results["Casino"][i], results["VectorCasino"][i]
+        print(f"{label:<22}{plain:>14,.0f}{vector:>14,.0f}{plain / vector:>11.1f}x")
+
+
+if __name__ == "__main__":
+    typer.run(main)
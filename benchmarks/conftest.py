@@ -0,0 +1,59 @@
+"""
+Общие фикстуры набора замеров (pytest-benchmark).
+
+Замеры не входят в обычный прогон тестов (testpaths = tests) и запускаются отдельно:
+
+    python -m pytest benchmarks --no-cov --benchmark-compare
+
+Сравнение падает, если медиана замера выросла больше чем на COMPARE_FAIL; порог можно
+переопределить явным --benchmark-compare-fail. Базовые результаты лежат в
+benchmarks/baselines/<машина>/ (записаны на интерпретаторе из requires-python); записать новые:
+
+    python -m pytest benchmarks --no-cov --benchmark-save=baseline
+"""
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+from casino import Casino
+from chip import Chip, ChipCollection
+from clock import VirtualClock
+
+BASELINE_STORAGE = Path(__file__).resolve().parent / "baselines"
+DEFAULT_STORAGE = "file://./.benchmarks"
+# Допустимый рост медианы относительно базовых результатов
+COMPARE_FAIL = "median:25%"
+
+
+def pytest_configure(config):
+    # Хранилище по умолчанию переносится в репозиторий, чтобы сравнивать с закоммиченными базовыми замерами
+    if getattr(config.option, "benchmark_storage", None) == DEFAULT_STORAGE:
+        config.option.benchmark_storage = f"file://{BASELINE_STORAGE}"
+    # Порог регрессии задан здесь, а не в командной строке, чтобы сравнение без него не проходило молча
+    if getattr(config.option, "benchmark_compare", None) and not config.option.benchmark_compare_fail:
+        config.option.benchmark_compare_fail = [parse_compare_fail(COMPARE_FAIL)]
+
+
+def make_chips() -> ChipCollection:
+    """Фишки, как в run_simulation."""
+    return ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Зелёный", 25), Chip("Чёрный", 100)])
+
+
+def make_casino(entities: int, seed: int = 42) -> Casino:
+    """
+    Создаёт headless-казино на виртуальных часах, заполненное до лимита сущностей.
+
+    :param entities: Лимит сущностей; казино заполняется до него случайными игроками и гусями.
+    :param seed: Сид генератора.
+    :return: Казино.
+    """
+    casino = Casino(make_chips(), seed, clock=VirtualClock(), headless=True, max_entities=entities)
+    for _ in range(entities):
+        casino.add_random_entity()
+    return casino
+
+
+@pytest.fixture
+def chips() -> ChipCollection:
+    return make_chips()
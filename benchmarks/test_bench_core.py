@@ -0,0 +1,103 @@
+"""
+Замеры горячего пути симуляции: шаг казино, вращение колеса, поиск игроков, фишки, веса событий,
+прогон целиком на виртуальных часах и перемотка записи прогона.
+"""
+import random
+
+import pytest
+
+from chip import Chip, ChipCollection
+from clock import VirtualClock
+from conftest import make_casino
+from player import Player, PlayerCollection
+from replay import ReplayRecorder
+from simulation import run_simulation
+
+
+@pytest.mark.parametrize("entities, steps_per_round", [(10, 1000), (1_000, 1000), (100_000, 100)])
+def test_perform_step(benchmark, entities, steps_per_round):
+    casino = make_casino(entities)
+    benchmark.group = "perform_step"
+    benchmark.extra_info["steps_per_round"] = steps_per_round
+
+    def steps():
+        for _ in range(steps_per_round):
+            casino.perform_step()
+
+    benchmark.pedantic(steps, rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("bets", [100, 10_000])
+def test_spin_wheel(benchmark, bets):
+    casino = make_casino(bets)
+    players = list(casino.players)
+    benchmark.group = "spin_wheel"
+
+    def place_bets():
+        casino.bets.open_window()
+        for player in players:
+            if player.balance <= 0:
+                player.balance = 100
+            casino.place_player_bet(player)
+        casino.bets.close_window()
+
+    benchmark.pedantic(casino.spin_wheel, setup=place_bets, rounds=30)
+
+
+def test_get_player_by_name(benchmark):
+    players = PlayerCollection()
+    for i in range(100_000):
+        players.append(Player(f"Игрок {i}", 100))
+    names = [f"Игрок {i}" for i in random.Random(1).sample(range(100_000), 1000)] + ["Нет такого"]
+
+    def lookup():
+        for name in names:
+            players.get_player_by_name(name)
+
+    benchmark(lookup)
+
+
+def test_chip_collection(benchmark):
+    chips = [Chip(color, value) for color, value in
+             (("Белый", 1), ("Красный", 5), ("Зелёный", 25), ("Чёрный", 100))] * 250
+
+    def operations():
+        collection = ChipCollection()
+        for chip in chips:
+            collection.append(chip)
+        total = sum(chip.value for chip in collection)
+        for chip in chips[:4]:
+            assert chip in collection
+            collection.remove(chip)
+        return total
+
+    benchmark(operations)
+
+
+@pytest.mark.parametrize("entities", [1_000, 100_000])
+def test_evualuate_weights(benchmark, entities):
+    casino = make_casino(entities)
+    benchmark.group = "evualuate_weights"
+    casino.bets.open_window()
+    for player in list(casino.players)[::2]:
+        casino.place_player_bet(player)
+    benchmark(casino.evualuate_weights)
+
+
+def test_run_simulation_virtual(benchmark):
+    benchmark.extra_info["steps"] = 5000
+    benchmark.pedantic(run_simulation, kwargs={"steps": 5000, "seed": 7, "clock": VirtualClock(),
+                                               "headless": True}, rounds=5)
+
+
+def test_replay_seek(benchmark):
+    casino = make_casino(12)
+    recorder = ReplayRecorder(casino, keyframe_every=10_000)
+    for _ in range(100_000):
+        casino.perform_step()
+        recorder.step()
+    recorder.close()
+    log = recorder.log()
+    benchmark.extra_info["keyframe_every"] = 10_000
+    # Худший случай: шаг прямо перед ключевым кадром
+    benchmark(log.seek, 99_999)
@@ -0,0 +1,226 @@
+import asyncio
+import math
+from array import array
+
+from casino import Casino
+from chip import ChipCollection
+from clock import Clock
+from constants import ENTITIES_MAX_COUNT
+from goose import Goose
+from params import CasinoParams, DEFAULT_PARAMS
+from player import Player, PsychoPlayer
+from rng import RandomSource
+
+
+class LoopClock(Clock):
+    """
+    Часы асинхронного казино: симулированное время — это время цикла asyncio, умноженное на scale.
+
+    Пауз часы не делают: ожиданием занимаются сами агенты через asyncio.sleep.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        super().__init__()
+        if scale <= 0:
+            raise ValueError(f"Коэффициент ускорения должен быть положительным: {scale}")
+        self.scale = scale
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._origin = 0.0
+
+    def __repr__(self):
+        return f"LoopClock(scale={self.scale}, now={self.now():.1f})"
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Привязывает часы к циклу событий, продолжая с текущего симулированного времени."""
+        self._origin = loop.time() - self._now / self.scale
+        self._loop = loop
+
+    def stop(self) -> None:
+        """Отвязывает часы от цикла, запоминая достигнутое время."""
+        self._now = self.now()
+        self._loop = None
+
+    def now(self) -> float:
+        if self._loop is None:
+            return self._now
+        return (self._loop.time() - self._origin) * self.scale
+
+    def _wait(self, seconds: float) -> None:
+        pass
+
+
+class LatencyStats:
+    """
+    Задержки пробуждения агентов: насколько позже запланированного момента агент получил управление.
+
+    Значения хранятся в реальных секундах в компактном массиве.
+    """
+
+    def __init__(self):
+        self._samples = array('d')
+
+    def __len__(self):
+        return len(self._samples)
+
+    def __repr__(self):
+        return f"LatencyStats(count={len(self)}, p99={self.percentile(99) * 1e3:.2f}ms)"
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def mean(self) -> float:
+        return sum(self._samples) / len(self._samples) if self._samples else 0.0
+
+    def max(self) -> float:
+        return max(self._samples, default=0.0)
+
+    def percentile(self, q: float) -> float:
+        """
+        Возвращает q-й процентиль задержки (ближайший ранг).
+
+        :param q: Процентиль от 0 до 100.
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+class AgentCasino(Casino):
+    """
+    Асинхронное казино: каждый игрок и гусь — отдельная сопрограмма-агент со своим таймером.
+
+    Игроки делают ставки, пока открыто окно ставок; психопат после каждого действия
+    может сорваться с вероятностью, равной его уровню психоза. Гуси крадут, кричат и
+    раздают деньги. Крупье по расписанию открывает окно ставок, закрывает его и крутит
+    колесо. Новые сущности приходят пуассоновским потоком. Интервалы между действиями
+    агентов распределены экспоненциально. Всё работает в одном потоке на asyncio.
+    """
+
+    def __init__(self, chips: ChipCollection, seed: int | None = None, headless: bool = True,
+                 rng: RandomSource | None = None, max_entities: int = ENTITIES_MAX_COUNT, time_scale: float = 1.0,
+                 spin_interval: float = 30.0, betting_window: float = 25.0, think_time: float = 10.0,
+                 goose_think_time: float = 20.0, arrival_rate: float = 0.2,
+                 params: CasinoParams = DEFAULT_PARAMS):
+        if not 0 < betting_window < spin_interval:
+            raise ValueError("Окно ставок должно быть короче интервала между вращениями")
+        super().__init__(chips, seed, clock=LoopClock(time_scale), headless=headless, rng=rng,
+                         max_entities=max_entities, params=params)
+        self.spin_interval = spin_interval
+        self.betting_window = betting_window
+        self.think_time = think_time
+        self.goose_think_time = goose_think_time
+        self.arrival_rate = arrival_rate
+        self.latency = LatencyStats()
+        self.spins = 0
+        self._running = False
+        self._tasks: set[asyncio.Task] = set()
+        self._errors: list[BaseException] = []
+        self._failed: asyncio.Event | None = None
+
+    def add_player(self, player: Player) -> None:
+        super().add_player(player)
+        if self._running:
+            self._spawn(self.player_agent(player))
+
+    def add_goose(self, goose: Goose) -> None:
+        super().add_goose(goose)
+        if self._running:
+            self._spawn(self.goose_agent(goose))
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Упавший агент останавливает весь прогон
+            self._errors.append(task.exception())
+            self._failed.set()
+
+    def _interval(self, mean: float) -> float:
+        """Экспоненциально распределённый интервал со средним mean симулированных секунд."""
+        return -math.log(1.0 - self.rng.random()) * mean
+
+    async def _sleep(self, seconds: float) -> None:
+        """Ждёт seconds симулированных секунд и записывает задержку пробуждения."""
+        loop = asyncio.get_running_loop()
+        delay = seconds / self.clock.scale
+        wake_at = loop.time() + delay
+        await asyncio.sleep(delay)
+        self.latency.add(loop.time() - wake_at)
+
+    async def run(self, duration: float) -> None:
+        """
+        Запускает агентов на duration симулированных секунд.
+
+        :param duration: Длительность в симулированных секундах.
+        """
+        self.clock.start(asyncio.get_running_loop())
+        self._running = True
+        self._errors = []
+        self._failed = asyncio.Event()
+        try:
+            for player in list(self.players):
+                self._spawn(self.player_agent(player))
+            for goose in list(self.geese):
+                self._spawn(self.goose_agent(goose))
+            self._spawn(self.croupier())
+            self._spawn(self.door())
+            try:
+                await asyncio.wait_for(self._failed.wait(), duration / self.clock.scale)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            self._running = False
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.clock.stop()
+        if self._errors:
+            raise self._errors[0]
+
+    def is_seated(self, player: Player) -> bool:
+        """Сидит ли игрок всё ещё в казино."""
+        return self.players.get_player_by_id(player.id) is player
+
+    async def player_agent(self, player: Player) -> None:
+        while self.is_seated(player):
+            await self._sleep(self._interval(self.think_time))
+            if not self.is_seated(player):
+                return
+            self.step_count += 1
+            if player.balance > 0:
+                self.place_player_bet(player)
+            if isinstance(player, PsychoPlayer) and player.psycho > self.rng.random():
+                self.kill_player(player)
+
+    async def goose_agent(self, goose: Goose) -> None:
+        while True:
+            await self._sleep(self._interval(self.goose_think_time))
+            self.step_count += 1
+            if self.rng.random() < 0.5:
+                self.steal_by(goose)
+            else:
+                self.act_as(goose)
+
+    async def croupier(self) -> None:
+        while True:
+            self.bets.open_window()
+            await self._sleep(self.betting_window)
+            self.bets.close_window()
+            await self._sleep(self.spin_interval - self.betting_window)
+            self.step_count += 1
+            self.spins += 1
+            self.spin_wheel()
+
+    async def door(self) -> None:
+        if self.arrival_rate <= 0:
+            return
+        while True:
+            await self._sleep(self._interval(1.0 / self.arrival_rate))
+            self.step_count += 1
+            self.add_random_entity()
@@ -0,0 +1,340 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from casino import BET_TYPES, Casino
+from goose import HonkGoose, RichGoose
+from params import DEFAULT_PARAMS
+from player import Player, PsychoPlayer
+from roulette import BET_BOOK, BET_INDEX, PAYOUT_TABLE, POCKETS
+
+# RichGoose.spend: randint(1, 100)
+GIFT_AMOUNTS = range(1, 101)
+# Средняя выплата на единицу ставки для каждого столбца таблицы выплат
+COLUMN_RETURN = tuple(sum(row[column] for row in PAYOUT_TABLE) / POCKETS for column in range(len(BET_BOOK)))
+
+
+def bet_multipliers(bet_weights: tuple[float, ...] = DEFAULT_PARAMS.bet_weights) -> dict[int, float]:
+    """
+    Распределение множителя выплаты случайной ставки (вместе со ставкой; 0 — проигрыш).
+
+    Тип ставки выбирается по весам bet_weights, выпавшее число — одна из 37 равновероятных лунок.
+
+    :param bet_weights: Веса ставок на красное, чёрное и зеро (CasinoParams.bet_weights).
+    :return: Словарь множитель -> вероятность.
+    """
+    total = sum(bet_weights)
+    multipliers: dict[int, float] = {}
+    for bet_type, weight in zip(BET_TYPES, bet_weights):
+        column = BET_INDEX[bet_type]
+        for row in PAYOUT_TABLE:
+            multipliers[row[column]] = multipliers.get(row[column], 0.0) + weight / total / POCKETS
+    return multipliers
+
+
+def bet_amounts(balance: int) -> range:
+    """Равновероятные размеры случайной ставки игрока с положительным балансом (Casino.place_player_bet)."""
+    return range(balance // 4 + 1, balance + 1)
+
+
+def bet_outcome(balance: int, bet_weights: tuple[float, ...] = DEFAULT_PARAMS.bet_weights) -> dict[int, float]:
+    """
+    Точное распределение баланса после случайной ставки и вращения колеса.
+
+    :param balance: Положительный баланс до ставки.
+    :param bet_weights: Веса ставок на красное, чёрное и зеро.
+    :return: Словарь баланс -> вероятность.
+    """
+    amounts = bet_amounts(balance)
+    outcome: dict[int, float] = {}
+    for multiplier, probability in bet_multipliers(bet_weights).items():
+        for amount in amounts:
+            result = balance - amount + amount * multiplier
+            outcome[result] = outcome.get(result, 0.0) + probability / len(amounts)
+    return outcome
+
+
+def house_edge(bet_type: str) -> float:
+    """Доля ставки, которую в среднем оставляет себе казино (для европейской рулетки — 1/37)."""
+    return 1.0 - COLUMN_RETURN[BET_INDEX[bet_type]]
+
+
+def expected_house_take(casino: Casino) -> float:
+    """
+    Ожидаемый доход казино от ставок, открытых к следующему вращению колеса.
+
+    :param casino: Казино (ставки в CasinoBets).
+    :return: Сумма ставок минус ожидаемые выплаты.
+    """
+    return sum(bet.amount * (1.0 - COLUMN_RETURN[bet.column])
+               for player_bets in casino.bets.values() for bet in player_bets)
+
+
+class StepRates(NamedTuple):
+    """Вероятности событий шага, которые меняют баланс отслеживаемого игрока."""
+    bet: float
+    steal: float
+    honks: dict[int, float]
+    gift: float
+    killed: float
+
+
+class Forecast(NamedTuple):
+    """Итоги распределения баланса через steps шагов."""
+    steps: int
+    mean_balance: float
+    ruin_probability: float
+    killed_probability: float
+    overflow_probability: float
+
+
+class BalanceModel:
+    """
+    Цепь Маркова баланса одного обычного игрока при замороженном остальном казино.
+
+    Шаг цепи — шаг Casino.perform_step. Вероятности событий берутся из тех же формул,
+    что и в казино: веса Casino.event_weights_for (вес гусей зависит от баланса игрока),
+    срыв психопата с вероятностью максимального уровня психоза, выбор игрока для ставки
+    и кражи, громкость кричащих гусей и подарки богатых, размер ставки из place_player_bet,
+    тип ставки по весам casino.params.bet_weights и выплаты из таблицы рулетки.
+
+    Допущения: состав казино, балансы и ставки остальных игроков и уровни психоза не меняются;
+    ставка игрока рассчитывается в том же шаге, в котором сделана; баланс выше max_balance
+    учитывается как max_balance. Вероятность хотя бы раз выйти за max_balance (погрешность
+    этого допущения) считает overflow_probability.
+
+    Состояния — балансы 0..max_balance и последнее состояние «убит психопатом». Шаг считается
+    разностными массивами за O(max_balance): переходы из каждого баланса — это равномерные
+    распределения на арифметических прогрессиях (проигрыш, выигрыш, кража, подарок).
+    """
+
+    def __init__(self, casino: Casino, player: Player, max_balance: int | None = None):
+        if casino.players.get_player_by_id(player.id) is not player:
+            raise ValueError(f"Игрок {player.name} не сидит в этом казино")
+        if isinstance(player, PsychoPlayer):
+            raise TypeError("Модель описывает обычного игрока, а не психопата")
+        self.casino = casino
+        self.player = player
+        self.max_balance = max_balance if max_balance is not None else max(2000, 10 * player.balance)
+        if self.max_balance < player.balance:
+            raise ValueError(f"max_balance меньше текущего баланса игрока: {self.max_balance}")
+        others = [p for p in casino.players if p is not player]
+        self._others_total = sum(p.balance for p in others)
+        self._others_available = sum(1 for p in others if p.id not in casino.bets and p.balance > 0)
+        self._others_positive = sum(1 for p in others if p.balance > 0)
+        self._psycho_max = min(1.0, casino.players.psycho_index.max_level())
+        self._multipliers = bet_multipliers(casino.params.bet_weights)
+        self._build()
+
+    def __repr__(self):
+        return f"BalanceModel(player={self.player.name}, max_balance={self.max_balance})"
+
+    def rates(self, balance: int) -> StepRates:
+        """
+        Вероятности событий шага для игрока с балансом balance.
+
+        :param balance: Баланс игрока.
+        """
+        casino = self.casino
+        weights = dict(casino.event_weights)
+        weights.update(casino.event_weights_for(self._others_total + balance))
+        total = sum(weights.values())
+        no_snap = 1.0 - self._psycho_max
+        if total <= 0:
+            return StepRates(0.0, 0.0, {}, 0.0, self._killed())
+        event = {name: no_snap * weight / total for name, weight in weights.items()}
+
+        bet = steal = 0.0
+        if balance > 0:
+            bet = event["player_bet"] / (self._others_available + 1)
+            if len(casino.geese):
+                steal = event["goose_steal"] / (self._others_positive + 1)
+        honks: dict[int, float] = {}
+        gift = 0.0
+        if len(casino.geese):
+            per_goose = event["goose_action"] / len(casino.geese)
+            for goose in casino.geese:
+                if isinstance(goose, HonkGoose):
+                    loss = int(goose.honk_volume) * 2
+                    honks[loss] = honks.get(loss, 0.0) + per_goose
+                if isinstance(goose, RichGoose):
+                    gift += per_goose
+        return StepRates(bet, steal, honks, gift, self._killed())
+
+    def _killed(self) -> float:
+        others = len(self.casino.players) - 1
+        # Срыв психопата заканчивается убийством другого игрока с вероятностью 1 - suicide_chance
+        kill_share = 1.0 - self.casino.params.suicide_chance
+        return self._psycho_max * kill_share / others if others > 0 else 0.0
+
+    def transition(self, balance: int) -> dict[int, float]:
+        """
+        Распределение баланса через один шаг (перебором исходов; -1 — игрок убит).
+
+        :param balance: Баланс до шага.
+        :return: Словарь баланс -> вероятность (балансы выше max_balance сведены к max_balance).
+        """
+        rates = self.rates(balance)
+        result: dict[int, float] = {}
+
+        def add(target: int, probability: float) -> None:
+            target = min(target, self.max_balance)
+            result[target] = result.get(target, 0.0) + probability
+
+        if rates.bet:
+            for target, probability in bet_outcome(balance, self.casino.params.bet_weights).items():
+                add(target, rates.bet * probability)
+        if rates.steal:
+            steals = range(1, balance // 2 + 1) if balance // 2 > 1 else range(1, 2)
+            for amount in steals:
+                add(balance - amount, rates.steal / len(steals))
+        for loss, probability in rates.honks.items():
+            add(balance - loss if balance > loss else balance, probability)
+        if rates.gift:
+            for amount in GIFT_AMOUNTS:
+                add(balance + amount, rates.gift / len(GIFT_AMOUNTS))
+        if rates.killed:
+            result[-1] = rates.killed
+        add(balance, 1.0 - sum(result.values()))
+        return result
+
+    def _build(self) -> None:
+        """Раскладывает переходы всех состояний по группам прогрессий с одинаковым шагом."""
+        cap = self.max_balance
+        groups: dict[int, tuple[list, list, list, list]] = {}
+        stay = np.zeros(cap + 1)
+        overflow = np.zeros(cap + 1)
+        killed = np.zeros(cap + 1)
+
+        def progression(source: int, start: int, count: int, stride: int, weight: float) -> None:
+            # Члены start, start + stride, ... выше cap сводятся к cap
+            kept = 0 if start > cap else min(count, (cap - start) // stride + 1)
+            if kept < count:
+                overflow[source] += weight * (count - kept)
+            if kept:
+                sources, starts, counts, weights = groups.setdefault(stride, ([], [], [], []))
+                sources.append(source)
+                starts.append(start)
+                counts.append(kept)
+                weights.append(weight)
+
+        for balance in range(cap + 1):
+            rates = self.rates(balance)
+            moved = rates.killed
+            killed[balance] = rates.killed
+            if rates.bet:
+                amounts = bet_amounts(balance)
+                for multiplier, probability in self._multipliers.items():
+                    weight = rates.bet * probability / len(amounts)
+                    if multiplier == 0:
+                        progression(balance, balance - amounts[-1], len(amounts), 1, weight)
+                    elif multiplier == 1:
+                        progression(balance, balance, 1, 1, weight * len(amounts))
+                    else:
+                        progression(balance, balance + (multiplier - 1) * amounts[0], len(amounts), multiplier - 1,
+                                    weight)
+                moved += rates.bet
+            if rates.steal:
+                half = balance // 2
+                if half > 1:
+                    progression(balance, balance - half, half, 1, rates.steal / half)
+                else:
+                    progression(balance, balance - 1, 1, 1, rates.steal)
+                moved += rates.steal
+            for loss, probability in rates.honks.items():
+                if balance > loss:
+                    progression(balance, balance - loss, 1, 1, probability)
+                    moved += probability
+            if rates.gift:
+                progression(balance, balance + GIFT_AMOUNTS[0], len(GIFT_AMOUNTS), 1, rates.gift / len(GIFT_AMOUNTS))
+                moved += rates.gift
+            stay[balance] = 1.0 - moved
+
+        self._groups = {stride: (np.array(sources), np.array(starts), np.array(starts) + stride * np.array(counts),
+                                 np.array(weights))
+                        for stride, (sources, starts, counts, weights) in groups.items()}
+        self._stay = stay
+        self._overflow = overflow
+        self._killed_rates = killed
+
+    def initial(self, balance: int | None = None) -> np.ndarray:
+        """
+        Распределение, сосредоточенное в одном балансе.
+
+        :param balance: Начальный баланс (по умолчанию текущий баланс игрока).
+        """
+        balance = self.player.balance if balance is None else balance
+        if not 0 <= balance <= self.max_balance:
+            raise ValueError(f"Баланс вне диапазона модели: {balance}")
+        distribution = np.zeros(self.max_balance + 2)
+        distribution[balance] = 1.0
+        return distribution
+
+    def step(self, distribution: np.ndarray, absorb_at_zero: bool = False,
+             absorb_overflow: bool = False) -> np.ndarray:
+        """
+        Делает один шаг цепи.
+
+        :param distribution: Вероятности балансов 0..max_balance и состояния «убит» (последний элемент).
+        :param absorb_at_zero: Считать нулевой баланс поглощающим (для вероятности разорения).
+        :param absorb_overflow: Переходы выше max_balance уводят в поглощающее состояние «вышел за границу»,
+            которое не хранится: его вероятность — недостающая до единицы масса распределения.
+        :return: Новое распределение.
+        """
+        cap = self.max_balance
+        alive = distribution[:cap + 1]
+        zero = 0.0
+        if absorb_at_zero:
+            zero = alive[0]
+            alive = alive.copy()
+            alive[0] = 0.0
+        result = np.zeros(cap + 2)
+        result[:cap + 1] = alive * self._stay
+        for stride, (sources, starts, ends, weights) in self._groups.items():
+            mass = alive[sources] * weights
+            length = -(-(cap + 1 + stride) // stride) * stride
+            diff = (np.bincount(starts, mass, minlength=length)[:length]
+                    - np.bincount(ends, mass, minlength=length)[:length])
+            result[:cap + 1] += diff.reshape(-1, stride).cumsum(axis=0).ravel()[:cap + 1]
+        if not absorb_overflow:
+            result[cap] += alive @ self._overflow
+        result[cap + 1] = distribution[cap + 1] + alive @ self._killed_rates
+        result[0] += zero
+        return result
+
+    def distribution(self, steps: int, balance: int | None = None, absorb_at_zero: bool = False,
+                     absorb_overflow: bool = False) -> np.ndarray:
+        """
+        Распределение баланса через steps шагов.
+
+        :param steps: Количество шагов.
+        :param balance: Начальный баланс (по умолчанию текущий баланс игрока).
+        :param absorb_at_zero: Игрок, у которого закончились деньги, остаётся с нулём.
+        :param absorb_overflow: Игрок, чей баланс вышел за max_balance, выбывает из распределения.
+        """
+        distribution = self.initial(balance)
+        for _ in range(steps):
+            distribution = self.step(distribution, absorb_at_zero, absorb_overflow)
+        return distribution
+
+    def ruin_probability(self, steps: int, balance: int | None = None) -> float:
+        """Вероятность хотя бы раз остаться без денег за steps шагов."""
+        return float(self.distribution(steps, balance, absorb_at_zero=True)[0])
+
+    def overflow_probability(self, steps: int, balance: int | None = None) -> float:
+        """Вероятность хотя бы раз выйти за max_balance за steps шагов."""
+        return max(0.0, 1.0 - float(self.distribution(steps, balance, absorb_overflow=True).sum()))
+
+    def forecast(self, steps: int, balance: int | None = None) -> Forecast:
+        """
+        Средний баланс живого игрока и вероятности разорения, гибели и выхода за max_balance через steps шагов.
+
+        :param steps: Количество шагов.
+        :param balance: Начальный баланс (по умолчанию текущий баланс игрока).
+        """
+        distribution = self.distribution(steps, balance)
+        alive = distribution[:-1]
+        alive_mass = alive.sum()
+        mean = float(alive @ np.arange(len(alive)) / alive_mass) if alive_mass > 0 else 0.0
+        return Forecast(steps, mean, self.ruin_probability(steps, balance), float(distribution[-1]),
+                        self.overflow_probability(steps, balance))
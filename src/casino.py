@@ -1,28 +1,65 @@
 import logging
-import random
-import time
 from collections import UserDict
-from colorama import init, Fore
+from functools import lru_cache
 
 from player import PlayerCollection, Player, PsychoPlayer
 from goose import GooseCollection, Goose, HonkGoose, RichGoose
-from chip import ChipCollection
-from constants import ENTITIES_MAX_COUNT
-
-init(autoreset=True)
+from chip import ChipCollection, ChipRack
+from clock import Clock, RealTimeClock
+from events import Event, EventKind, EventSink, LoggingSink
+from rng import RandomSource, make_rng
+from sampler import AliasSampler, CumulativeSampler
+from names import NamePool, PLAYER_NAMES, GOOSE_NAMES
+from roulette import POCKET_COLORS, PAYOUT_TABLE, make_bet
+from params import CasinoParams, DEFAULT_PARAMS
+from constants import ENTITIES_MAX_COUNT, STEP_DURATION, SPIN_DURATION
 
 logger = logging.getLogger()
 
+BET_TYPES = ('красное', 'чёрное', 'зеро')
+
+
+@lru_cache(maxsize=None)
+def make_sampler(population: tuple, weights: tuple) -> AliasSampler:
+    """Таблицы псевдонимов строятся один раз для каждого набора весов и общие для всех казино."""
+    return AliasSampler(population, weights)
+
+
+# Распределения с параметрами по умолчанию
+BET_SAMPLER = make_sampler(BET_TYPES, DEFAULT_PARAMS.bet_weights)
+BALANCE_SAMPLER = make_sampler(DEFAULT_PARAMS.balance_values, DEFAULT_PARAMS.balance_weights)
+PLAYER_CLASS_SAMPLER = make_sampler((Player, PsychoPlayer), DEFAULT_PARAMS.player_class_weights)
+
 
 class Casino:
-    def __init__(self, chips: ChipCollection, seed: int | None = None):
+    def __init__(self, chips: ChipCollection, seed: int | None = None, clock: Clock | None = None,
+                 headless: bool = False, rng: RandomSource | None = None, max_entities: int = ENTITIES_MAX_COUNT,
+                 params: CasinoParams = DEFAULT_PARAMS):
+        if max_entities < 1:
+            raise ValueError(f"Лимит сущностей должен быть положительным: {max_entities}")
+        params.check()
+        self.max_entities = max_entities
+        self.params = params
+        self.bet_sampler = make_sampler(BET_TYPES, params.bet_weights)
+        self.balance_sampler = make_sampler(params.balance_values, params.balance_weights)
+        self.player_class_sampler = make_sampler((Player, PsychoPlayer), params.player_class_weights)
+        self.rng = rng if rng is not None else make_rng(seed)
+        self.clock = clock if clock is not None else RealTimeClock()
+        self.headless = headless
+        self.sinks: list[EventSink] = [] if headless else [LoggingSink()]
+        self.step_count = 0
         self.players = PlayerCollection()
         self.geese = GooseCollection()
         self.bets = CasinoBets()
         self.chips = chips
+        # Если есть фишка номиналом 1, ставки, выигрыши и кражи рассчитываются фишками через кассу
+        self.chip_rack = ChipRack(chips) if any(chip.value == 1 for chip in chips) else None
+        self.players.chip_rack = self.chip_rack
+        self.players.psycho_growth = params.psycho_growth
+        self.players.psycho_exponent = params.psycho_exponent
 
-        self.player_names = ["Александр", "Дмитрий", "Иван", "Сергей", "Андрей", "Владимир", "Максим", "Артем", "Николай", "Павел", "Хуан", "Карлос", "Марко", "Джованни", "Джеймс", "Уильям", "Михаэль", "Томас", "Жан", "Пьер"]
-        self.goose_names = ["Сигма", "Крутой", "Проказник", "Воришка", "Шутник", "Гусь-Гусь", "Кряк", "Пух", "Дональд", "Гусьня", "Шалун", "Ворюга", "Крикун", "Богатый", "Орёл", "Злодей", "Милый", "Хитрый", "Голодный", "Счастливчик"]
+        self.player_names = NamePool(PLAYER_NAMES, in_use=self.player_name_in_use)
+        self.goose_names = NamePool(GOOSE_NAMES, in_use=self.goose_name_in_use)
 
         self.events = {
             "player_bet": self.make_random_bet,
@@ -31,15 +68,15 @@ class Casino:
             "new_entity": self.add_random_entity,
             "goose_action": self.goose_action
         }
-        self.event_weights = {
+        # Веса меняются только через set_events_weight, который сбрасывает кеш выборки
+        self.event_sampler = CumulativeSampler({
             "player_bet": 0.0,
             "spin_wheel": 0.0,
             "goose_steal": 0.0,
             "new_entity": 1.0,
             "goose_action": 0.0
-        }
-        if seed is not None:
-            random.seed(seed)
+        })
+        self.event_weights = self.event_sampler.weights
 
     def add_player(self, player: Player) -> None:
         """
@@ -51,37 +88,119 @@ class Casino:
 
     def remove_player(self, player: Player) -> None:
         """
-        Удаляет игрока из казино.
+        Удаляет игрока из казино. Имя ушедшего игрока возвращается в пул свободных имён.
 
         :param player: Объект игрока, который будет удалён.
         """
         self.players.remove(player)
-        self.bets.remove_bet(player.name)
+        self.bets.remove_bet(player.id)
+        self.player_names.release(player.name)
+
+    def player_name_in_use(self, name: str) -> bool:
+        """Сидит ли в казино игрок с таким именем."""
+        return self.players.get_player_by_name(name) is not None
+
+    def goose_name_in_use(self, name: str) -> bool:
+        """Есть ли в казино гусь с таким именем."""
+        return any(goose.name == name for goose in self.geese)
 
     def add_goose(self, goose: Goose) -> None:
         """
         Добавляет нового гуся в казино.
 
-        :param goose: Объект гуся, который будет добавлен.
+        :param goose: Объект гуся, который будет добавлен. Гусь начинает пользоваться генератором казино.
         """
+        goose.rng = self.rng
         self.geese.append(goose)
 
+    def remove_goose(self, goose: Goose) -> None:
+        """
+        Удаляет гуся из казино. Его имя возвращается в пул свободных имён.
+
+        :param goose: Объект гуся, который будет удалён.
+        """
+        self.geese.remove(goose)
+        self.goose_names.release(goose.name)
+
+    def attach_sink(self, sink: EventSink) -> None:
+        """
+        Подключает приёмник событий.
+
+        :param sink: Вызываемый объект, принимающий Event.
+        """
+        self.sinks.append(sink)
+
+    def detach_sink(self, sink: EventSink) -> None:
+        """
+        Отключает приёмник событий.
+
+        :param sink: Ранее подключённый приёмник.
+        """
+        self.sinks.remove(sink)
+
+    def emit(self, kind: EventKind, actor: str = "", target: str = "", tag: str = "",
+             amount: int = 0, value: int = 0, balance: int = 0) -> None:
+        """
+        Публикует событие во все подключённые приёмники.
+
+        Вызывающий код проверяет `if self.sinks:` до вызова, чтобы в headless-режиме
+        без приёмников не тратить время даже на сборку аргументов.
+        """
+        event = Event(self.step_count, self.clock.now(), kind, actor, target, tag, amount, value, balance)
+        for sink in self.sinks:
+            sink(event)
+
+    def log_extra(self) -> dict:
+        """
+        Возвращает дополнительные поля записи лога с текущим симулированным временем.
+
+        :return: Словарь для параметра extra у logger.info / logger.debug.
+        """
+        return {"sim_time": self.clock.now()}
+
+    def total_balance(self) -> int:
+        """Суммарный баланс всех игроков казино (поддерживается коллекцией, O(1))."""
+        return self.players.total_balance
+
+    def open_bets_count(self) -> int:
+        """Количество игроков с открытыми ставками."""
+        return len(self.bets)
+
+    def psycho_count(self) -> int:
+        """Количество психопатов в казино."""
+        return len(self.players.psycho_index)
+
     def evualuate_weights(self) -> None:
+        self.set_events_weight(self.event_weights_for(self.total_balance()))
+
+    def event_weights_for(self, total_balance: int) -> dict[str, float]:
+        """
+        Считает веса событий для текущего состава казино при заданном суммарном балансе игроков.
+
+        Когда в казино нет гусей или игроков, веса событий гусей не пересчитываются и в результат не входят.
+
+        :param total_balance: Суммарный баланс игроков.
+        :return: Словарь событие -> вес.
+        """
+        weights = {}
         if len(self.players):
-            weight_bets = ((len(self.bets)) / len(self.players)) ** 0.5
-            self.set_events_weight({"player_bet": 1 - weight_bets,
-                                    "spin_wheel": weight_bets})
+            weight_bets = (self.open_bets_count() / len(self.players)) ** self.params.bet_weight_power
+            weights["player_bet"] = 1 - weight_bets
+            weights["spin_wheel"] = weight_bets
         else:
-            self.set_events_weight({"player_bet": 0.0,
-                                    "spin_wheel": 0.0})
+            weights["player_bet"] = 0.0
+            weights["spin_wheel"] = 0.0
 
         if len(self.geese) and len(self.players):
-            weight_goose = (sum(p.balance for p in self.players) / 300.0 / len(self.players)) ** 0.5
-            self.set_events_weight({"goose_steal": weight_goose,
-                                    "goose_action": weight_goose})
+            params = self.params
+            weight_goose = (total_balance / params.goose_balance_scale / len(self.players)) ** params.goose_weight_power
+            weights["goose_steal"] = weight_goose
+            weights["goose_action"] = weight_goose
 
-        weight_entity = ((ENTITIES_MAX_COUNT - len(self.players) - len(self.geese)) / 10.0) ** 2 * 2
-        self.set_events_weight({"new_entity": weight_entity})
+        # Масштаб подобран так, что при лимите по умолчанию формула совпадает с исходной
+        free_places = max(0, self.max_entities - len(self.players) - len(self.geese))
+        weights["new_entity"] = (free_places / (10.0 * self.max_entities / ENTITIES_MAX_COUNT)) ** 2 * 2
+        return weights
 
     def perform_step(self) -> None:
         """
@@ -90,19 +209,29 @@ class Casino:
         Событие может быть ставкой игрока, вращением колеса, кражей гуся, добавлением новой сущности
         или действием гуся. Вес событий корректируется динамически.
         """
-        psycho_chance = random.random()
+        self.step_count += 1
+        psycho_chance = self.rng.random()
         #  logger.debug("Psycho chance: %.2f", psycho_chance)
-        for p in self.players:
-            if isinstance(p, PsychoPlayer):
-                if p.psycho > psycho_chance:
-                    self.kill_player(p)
-                    break
+        killer = self.find_killer(psycho_chance)
+        if killer is not None:
+            self.kill_player(killer)
         else:
             self.evualuate_weights()
-            weights = [self.event_weights[k] for k in self.events.keys()]
-            event = random.choices(list(self.events.keys()), weights=weights)[0]
-            self.events[event]()
-        time.sleep(1.5)
+            # За полным столом из одних гусей ничего не может произойти: шаг проходит впустую
+            if self.event_sampler.total() > 0:
+                self.events[self.event_sampler.draw(self.rng)]()
+        self.clock.sleep(STEP_DURATION)
+
+    def find_killer(self, psycho_chance: float) -> PsychoPlayer | None:
+        """
+        Ищет первого (в порядке прихода) психопата, чей уровень психоза превысил порог.
+
+        Благодаря индексу психоза шаги без срыва не проходят по игрокам вовсе.
+
+        :param psycho_chance: Случайный порог этого шага.
+        :return: Психопат, который сорвётся, или None.
+        """
+        return self.players.psycho_index.first_above(psycho_chance)
 
     def make_random_bet(self) -> None:
         """
@@ -110,61 +239,79 @@ class Casino:
 
         Ставка выбирается случайным образом из доступных игроков, которые ещё не сделали ставку.
         """
-        available_players = [p for p in self.players if p.name not in self.bets and p.balance > 0]
-        player = random.choice(available_players)
-        bet_type = random.choices(['красное', 'чёрное', 'зеро'], weights=[0.47, 0.48, 0.05])[0]
-        if player.balance < 1: amount = player.balance
-        else: amount = random.randint(player.balance // 4 + 1, player.balance)
+        available_players = [p for p in self.players if p.id not in self.bets and p.balance > 0]
+        if not available_players:
+            return
+        self.place_player_bet(self.rng.choice(available_players))
+
+    def place_player_bet(self, player: Player) -> None:
+        """
+        Игрок делает случайную ставку на цвет или зеро, если окно ставок открыто, он ещё не ставил и у него есть деньги.
+
+        :param player: Игрок.
+        """
+        if not self.bets.is_open or player.id in self.bets or player.balance < 1:
+            return
+        bet_type = self.bet_sampler.draw(self.rng)
+        amount = self.rng.randint(player.balance // 4 + 1, player.balance)
+        self.place_bet(player, bet_type, amount)
+
+    def place_bet(self, player: Player, bet_type: str, amount: int) -> bool:
+        """
+        Игрок делает ставку из книги ставок; сумма списывается с его баланса.
 
-        self.bets.place_bet(player.name, bet_type, amount)
+        Игрок может сделать несколько ставок до следующего вращения колеса.
+
+        :param player: Игрок.
+        :param bet_type: Имя ставки, например 'красное', 'стрейт 17', 'сплит 1-2', 'каре 1-5', 'дюжина 2'.
+        :param amount: Размер ставки; неположительный размер — ошибка (ValueError), а не отказ.
+        :return: True, если ставка принята (окно открыто и у игрока хватает денег).
+        """
+        if amount <= 0:
+            # Проверяется до любых изменений баланса, книги ставок и кассы
+            raise ValueError(f"Размер ставки должен быть положительным: {amount}")
+        if amount > player.balance or not self.bets.place_bet(player.id, bet_type, amount):
+            return False
         player.balance -= amount
+        if self.chip_rack is not None:
+            self.chip_rack.deposit(amount)
 
-        logger.info(
-            Fore.BLUE + "🎰 Игрок %s сделал ставку: %d на %s. Баланс после ставки: %d",
-            player.name, amount, bet_type, player.balance
-        )
+        if self.sinks:
+            self.emit(EventKind.BET, actor=player.name, tag=bet_type, amount=amount, balance=player.balance)
+        return True
 
     def spin_wheel(self) -> None:
         """
         Генерирует случайное значение от 0 до 36, имитируя вращение колеса казино.
 
-        Определяет выигрышный цвет (красное, чёрное или зеро) и обновляет баланс игроков
-        в зависимости от их ставок.
+        Каждая ставка рассчитывается одним обращением к таблице выплат PAYOUT_TABLE[число][столбец ставки].
         """
-        logger.info(Fore.LIGHTYELLOW_EX + "🎡 Колёсико вращается...")
-        time.sleep(1.0)
+        self.clock.sleep(SPIN_DURATION)
 
-        number = random.randint(0, 36)
-        red_numbers = {1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36}
-        if number == 0:
-            winning_color = 'зеро'
-        elif number in red_numbers:
-            winning_color = 'красное'
-        else:
-            winning_color = 'чёрное'
-        logger.info(Fore.LIGHTYELLOW_EX + "🎲 Выпало: %d (%s)", number, winning_color)
+        number = self.rng.randint(0, 36)
+        if self.sinks:
+            self.emit(EventKind.SPIN, tag=POCKET_COLORS[number], amount=number)
 
-        for player_name, bet_info in self.bets.items():
-            bet_type = bet_info['type']
-            amount = bet_info['amount']
-            player = self.players[player_name]
+        payouts = PAYOUT_TABLE[number]
+        for player_id, player_bets in self.bets.items():
+            player = self.players.get_player_by_id(player_id)
             if player is None:
                 continue
 
-            if bet_type == winning_color:
-                player.balance += amount * 2
-                if isinstance(player, PsychoPlayer):
-                    player.update_psycho(amount)
-                result = "ВЫИГРАЛ"
-            else:
-                if isinstance(player, PsychoPlayer):
+            for bet in player_bets:
+                amount = bet.amount
+                payout = amount * payouts[bet.column]
+                if payout:
+                    player.balance += payout
+                    if self.chip_rack is not None:
+                        self.chip_rack.withdraw(payout)
+                    if isinstance(player, PsychoPlayer):
+                        player.update_psycho(payout - amount)
+                elif isinstance(player, PsychoPlayer):
                     player.update_psycho(-amount)
-                result = "ПРОИГРАЛ"
-            color = Fore.GREEN if bet_type == winning_color else Fore.RED
-            logger.info(
-                color + "💰 Игрок %s поставил %d на %s и %s. Новый баланс: %d",
-                player.name, amount, bet_type, result, player.balance
-            )
+                if self.sinks:
+                    self.emit(EventKind.PAYOUT, actor=player.name, tag=bet.type, amount=amount, value=payout,
+                              balance=player.balance)
 
         self.bets.clear_bets()
 
@@ -175,18 +322,35 @@ class Casino:
         if len(self.geese) == 0 or len(self.players) == 0:
             return
 
-        goose = random.choice(self.geese)
-        player = random.choice([p for p in self.players if p.balance > 0])
-        if player.balance // 2 > 1: steal_amount = random.randint(1, player.balance // 2)
+        available_players = [p for p in self.players if p.balance > 0]
+        if not available_players:
+            return
+        self.steal_by(self.rng.choice(self.geese), available_players)
+
+    def steal_by(self, goose: Goose, available_players: list[Player] | None = None) -> None:
+        """
+        Гусь крадёт деньги у случайного игрока с положительным балансом.
+
+        :param goose: Гусь-вор.
+        :param available_players: Игроки, у которых есть что красть (по умолчанию считаются заново).
+        """
+        if available_players is None:
+            available_players = [p for p in self.players if p.balance > 0]
+            if not available_players:
+                return
+        player = self.rng.choice(available_players)
+        if player.balance // 2 > 1: steal_amount = self.rng.randint(1, player.balance // 2)
         else: steal_amount = 1
 
         player.balance -= steal_amount
+        if self.chip_rack is not None:
+            # Гусь сдаёт украденные фишки в кассу
+            self.chip_rack.deposit(steal_amount)
         if isinstance(player, PsychoPlayer):
             player.update_psycho(-steal_amount)
-        logger.info(
-            Fore.MAGENTA + "🦢 Гусь %s украл у игрока %s %d грязных бумажек! Новый баланс игрока: %d",
-            goose.name, player.name, steal_amount, player.balance
-        )
+        if self.sinks:
+            self.emit(EventKind.STEAL, actor=goose.name, target=player.name, amount=steal_amount,
+                      balance=player.balance)
 
     def goose_action(self) -> None:
         """
@@ -195,24 +359,41 @@ class Casino:
         Если гусь является HonkGoose, он издаёт громкий крик. Если это RichGoose, он раздаёт
         деньги всем игрокам.
         """
-        goose = random.choice(self.geese)
+        if len(self.geese) == 0:
+            return
+        self.act_as(self.rng.choice(self.geese))
+
+    def act_as(self, goose: Goose) -> None:
+        """
+        Гусь выполняет своё действие: HonkGoose кричит, RichGoose раздаёт деньги.
+
+        :param goose: Гусь.
+        """
         if isinstance(goose, HonkGoose):
-            volume = goose()
+            volume = int(goose.honk_volume)
+            scared = 0
             for player in self.players:
                 if player.balance > volume * 2:
                     player.balance -= volume * 2
+                    scared += 1
                     if isinstance(player, PsychoPlayer):
                         player.update_psycho(-volume * 2)
-
-            logger.info(Fore.MAGENTA + "🦢 Крик гуся напугал игроков! Все потеряли по %s денег.",
-                        volume * 2)
+            if self.chip_rack is not None and scared:
+                # Выронённые со страху фишки гусь сдаёт в кассу одной суммой
+                self.chip_rack.deposit(volume * 2 * scared)
+            if self.sinks:
+                self.emit(EventKind.HONK, actor=goose.name, amount=volume, value=volume * 2)
         if isinstance(goose, RichGoose):
             money = goose.spend()
+            if self.chip_rack is not None:
+                # Гусь покупает в кассе фишки на все подарки
+                self.chip_rack.withdraw(money * len(self.players))
             for player in self.players:
                 player.balance += money
                 if isinstance(player, PsychoPlayer):
                     player.update_psycho(money)
-            logger.info(Fore.MAGENTA + "🦢 Гусь %s раздаёт челяди деньги! Все игроки получают по %d", goose.name, money)
+            if self.sinks:
+                self.emit(EventKind.GIFT, actor=goose.name, amount=money)
 
     def add_random_entity(self) -> None:
         """
@@ -220,40 +401,42 @@ class Casino:
 
         Используется формула для определения вероятности добавления игрока или гуся.
         Если добавляется гусь, его тип выбирается с учётом текущего баланса типов гусей.
+        Когда в казино уже max_entities сущностей, никто не добавляется.
         """
+        if len(self.players) + len(self.geese) >= self.max_entities:
+            return
         prob_player = (len(self.geese) + 1) / (len(self.players) + len(self.geese) + 2)
-        if (random.random() < prob_player and len(self.players) < ENTITIES_MAX_COUNT / 2 + 1) or len(self.geese) >= ENTITIES_MAX_COUNT / 2 + 1:
-            balances = [50, 100, 150, 200, 300, 500]
-            weights = [0.3, 0.25, 0.15, 0.15, 0.1, 0.05]
-            balance = random.choices(balances, weights=weights)[0]
-            name = random.choice(self.player_names)
-
-            player_classes = [Player, PsychoPlayer]
-            player_class = random.choices(player_classes, weights=[0.55, 0.45])[0]
+        half = self.max_entities / 2 + 1
+        if (self.rng.random() < prob_player and len(self.players) < half) or len(self.geese) >= half:
+            balance = self.balance_sampler.draw(self.rng)
+            name = self.player_names.take(self.rng)
+            player_class = self.player_class_sampler.draw(self.rng)
 
             new_player = player_class(
                 name=name,
                 balance=balance
             )
-            self.player_names.remove(name)
             self.add_player(new_player)
-            logger.info(Fore.CYAN + "➕ В казик пришёл новый игрок: %s с валютой в количестве %d", new_player.name, new_player.balance)
+            if self.sinks:
+                self.emit(EventKind.JOIN, actor=new_player.name, tag=player_class.__name__,
+                          balance=new_player.balance)
         else:
-            name = random.choice(self.goose_names)
+            name = self.goose_names.take(self.rng)
 
             goose_classes = [HonkGoose, RichGoose]
-            count_honk = sum(1 for g in self.geese if isinstance(g, HonkGoose))
-            count_rich = sum(1 for g in self.geese if isinstance(g, RichGoose))
+            count_honk = self.geese.count_of(HonkGoose)
+            count_rich = self.geese.count_of(RichGoose)
             weights = [1 / (count_honk + 1), 1 / (count_rich + 1)]
-            goose_class = random.choices(goose_classes, weights=weights)[0]
+            goose_class = self.rng.choices(goose_classes, weights=weights)[0]
 
             new_goose = goose_class(
                 name=name,
-                honk_volume=random.randint(1, 10)
+                honk_volume=self.rng.randint(1, 10)
             )
-            self.goose_names.remove(name)
             self.add_goose(new_goose)
-            logger.info(Fore.CYAN + "➕ В казик залетел новый гусь по имени %s", new_goose.name)
+            if self.sinks:
+                self.emit(EventKind.JOIN, actor=new_goose.name, tag=goose_class.__name__,
+                          amount=new_goose.honk_volume)
 
     def kill_player(self, killer: PsychoPlayer) -> None:
         """
@@ -264,18 +447,22 @@ class Casino:
 
         :param killer: Игрок, который совершает убийство.
         """
-        if len(self.players) == 1 or random.random() < 0.4:
+        if len(self.players) == 1 or self.rng.random() < self.params.suicide_chance:
             self.remove_player(killer)
-            logger.info(Fore.RED + "❌ Игрок %s больше так не может. Игрок %s покидает этот мир!",
-                        killer.name, killer.name)
+            if self.sinks:
+                self.emit(EventKind.SUICIDE, actor=killer.name, balance=killer.balance)
         else:
-            player = random.choice([p for p in self.players if p != killer])
+            player = self.rng.choice([p for p in self.players if p is not killer])
             money = player.balance
             killer.balance += money
+            if self.chip_rack is not None:
+                # Убийца получает фишки на сумму из кассы, а фишки жертвы касса забирает при удалении
+                self.chip_rack.withdraw(money)
             killer.update_psycho(money)
             self.remove_player(player)
-            logger.info(Fore.RED + "❌ Игрок %s психанул и убил игрока %s. Игрок %s покидает казино! Новый баланс убийцы: %d",
-                        killer.name, player.name, player.name, killer.balance)
+            if self.sinks:
+                self.emit(EventKind.KILL, actor=killer.name, target=player.name, amount=money,
+                          balance=killer.balance)
 
     def set_events_weight(self, weights: dict[str, float]) -> None:
         """
@@ -284,7 +471,7 @@ class Casino:
         :param weights: Словарь, где ключ — название события, а значение — его вес.
         """
         for event, weight in weights.items():
-            self.event_weights[event] = weight
+            self.event_sampler.set_weight(event, weight)
 
         # other_total = sum(v for k, v in self.event_weights.items() if k != event_name)
         # if other_total == 0:
@@ -297,29 +484,60 @@ class Casino:
         #         if k != event_name:
         #             self.event_weights[k] *= scale
 
-        logger.debug("New events weights: %s", self.event_weights)
+        if not self.headless:
+            logger.debug("New events weights: %s", self.event_weights, extra=self.log_extra())
 
 
 class CasinoBets(UserDict):
     """
-    Словарная коллекция для хранения ставок игроков (player_name -> {'type': bet_type, 'amount': amount}).
-    Логирует изменения ставок при установке значений.
+    Словарная коллекция для хранения ставок игроков (player_id -> [Bet, ...]).
+    Ключ — идентификатор игрока из PlayerCollection, поэтому расчёт ставок линеен по их количеству.
+    У игрока может быть несколько ставок; len() — количество игроков со ставками.
+
+    Окно ставок по умолчанию открыто всегда; асинхронное казино закрывает его перед вращением колеса.
     """
 
-    def place_bet(self, player_name: str, bet_type: str, amount: int) -> None:
-        """Устанавливает ставку игрока: тип ('чётное' или 'нечётное') и размер."""
-        if player_name in self:
-            return
-        self[player_name] = {'type': bet_type, 'amount': amount}
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_open = True
+
+    def open_window(self) -> None:
+        """Открывает приём ставок."""
+        self.is_open = True
+
+    def close_window(self) -> None:
+        """Закрывает приём ставок: новые ставки отклоняются до следующего открытия."""
+        self.is_open = False
+
+    def place_bet(self, player_id: int, bet_type: str, amount: int) -> bool:
+        """
+        Добавляет ставку игрока: имя из книги ставок (roulette.BET_BOOK) и положительный размер.
+        Неизвестное имя или неположительный размер — ValueError, книга ставок при этом не меняется.
+
+        :return: True, если ставка принята (окно ставок открыто).
+        """
+        bet = make_bet(bet_type, amount)
+        if not self.is_open:
+            return False
+        player_bets = self.data.get(player_id)
+        if player_bets is None:
+            self.data[player_id] = [bet]
+        else:
+            player_bets.append(bet)
+        return True
+
+    def stake(self, player_id: int) -> int:
+        """Сумма всех открытых ставок игрока."""
+        return sum(bet.amount for bet in self.data.get(player_id, ()))
 
-    def remove_bet(self, player_name: str) -> None:
+    def remove_bet(self, player_id: int) -> None:
         """
-        Удаляет ставку игрока по имени, если она существует.
+        Удаляет все ставки игрока по идентификатору, если они существуют.
 
-        :param player_name: Имя игрока, чью ставку нужно удалить.
+        :param player_id: Идентификатор игрока, чьи ставки нужно удалить.
         """
-        if player_name in self:
-            del self[player_name]
+        if player_id in self:
+            del self[player_id]
 
     def clear_bets(self) -> None:
         """Очищает все ставки."""
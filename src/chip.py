@@ -1,4 +1,9 @@
+from functools import lru_cache
+
+
 class Chip:
+    __slots__ = ("color", "value")
+
     def __init__(self, color: str, value: int):
         self.color = color
         self.value = value
@@ -12,7 +17,7 @@ class Chip:
         return False
 
     def __hash__(self) -> int:
-        return hash(self.value)
+        return hash((self.color, self.value))
 
     def __add__(self, other):
         if isinstance(other, Chip):
@@ -50,3 +55,156 @@ class ChipCollection:
 
     def __repr__(self) -> str:
         return f"ChipCollection({self._chips})"
+
+
+@lru_cache(maxsize=None)
+def change_table(values: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+    """
+    Строит таблицу минимального размена для сумм меньше (старший - 1) * второй + старший.
+
+    :param values: Номиналы по убыванию, младший равен 1.
+    :return: Для каждой суммы — количество фишек каждого номинала (в порядке values).
+    """
+    limit = (values[0] - 1) * (values[1] if len(values) > 1 else 0) + values[0]
+    # best[x] — минимальное число фишек для суммы x, last[x] — номинал последней фишки в таком наборе
+    best = [0] * limit
+    last = [0] * limit
+    for amount in range(1, limit):
+        best[amount] = amount + 1
+        for index, value in enumerate(values):
+            if value <= amount and best[amount - value] + 1 < best[amount]:
+                best[amount] = best[amount - value] + 1
+                last[amount] = index
+    table = [(0,) * len(values)]
+    for amount in range(1, limit):
+        counts = list(table[amount - values[last[amount]]])
+        counts[last[amount]] += 1
+        table.append(tuple(counts))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def sparse_change_table(values: tuple[int, ...]) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """Та же таблица размена, но для каждой суммы только ненулевые пары (индекс номинала, количество)."""
+    return tuple(tuple((index, count) for index, count in enumerate(counts) if count)
+                 for counts in change_table(values))
+
+
+class ChipRack:
+    """
+    Номиналы фишек казино, размен сумм на фишки и касса с запасом фишек по номиналам.
+
+    Минимальный набор фишек для суммы берётся из заранее построенной таблицы за O(1).
+    В минимальном наборе младших фишек меньше, чем номинал старшей (иначе часть из них
+    можно заменить старшими), поэтому они стоят меньше (старший - 1) * второй номинал.
+    Для сумм за пределами таблицы сначала отсчитывается нужное число старших фишек,
+    а остаток ищется в таблице.
+
+    Наборы фишек — списки количеств по номиналам (от старшего к младшему), которые
+    изменяются на месте: расчёты не создают объектов Chip. Касса (tray) может уходить
+    в минус по номиналу: значит, фишек этого номинала выдано больше, чем получено.
+    """
+
+    def __init__(self, chips: ChipCollection):
+        denominations: dict[int, str] = {}
+        for chip in sorted(chips, key=lambda c: c.value, reverse=True):
+            denominations.setdefault(chip.value, chip.color)
+        if not denominations or min(denominations) != 1:
+            raise ValueError("Для размена нужна фишка номиналом 1")
+        self.values = tuple(denominations)
+        self.colors = tuple(denominations.values())
+        self.tray = [0] * len(self.values)
+        self._table = change_table(self.values)
+        self._sparse = sparse_change_table(self.values)
+        self._top = self.values[0]
+        self._limit = len(self._table)
+        self._indices = range(len(self.values))
+
+    def __repr__(self):
+        return f"ChipRack({dict(zip(self.colors, self.tray))})"
+
+    def _split(self, amount: int) -> tuple[int, int]:
+        """Делит сумму на число старших фишек сверх таблицы и остаток, который есть в таблице."""
+        if amount < 0:
+            raise ValueError(f"Сумма не может быть отрицательной: {amount}")
+        if amount < self._limit:
+            return 0, amount
+        top_chips = (amount - self._limit) // self._top + 1
+        return top_chips, amount - top_chips * self._top
+
+    def _add(self, counts: list[int], amount: int, sign: int) -> None:
+        """Добавляет к counts минимальный набор фишек на сумму amount, умноженный на sign."""
+        top_chips, amount = self._split(amount)
+        counts[0] += sign * top_chips
+        for index, count in self._sparse[amount]:
+            counts[index] += sign * count
+
+    def change(self, amount: int) -> list[int]:
+        """
+        Возвращает минимальный набор фишек на сумму.
+
+        :param amount: Неотрицательная сумма.
+        :return: Количество фишек каждого номинала (в порядке values).
+        """
+        counts = [0] * len(self.values)
+        self._add(counts, amount, 1)
+        return counts
+
+    def chip_count(self, amount: int) -> int:
+        """Минимальное количество фишек, которыми можно выдать сумму."""
+        return sum(self.change(amount))
+
+    def value(self, counts: list[int]) -> int:
+        """Стоимость набора фишек."""
+        return sum(count * value for count, value in zip(counts, self.values))
+
+    def deposit(self, amount: int) -> None:
+        """Касса получает фишки на сумму amount (например, проигранную ставку)."""
+        self._add(self.tray, amount, 1)
+
+    def withdraw(self, amount: int) -> None:
+        """Касса выдаёт фишки на сумму amount (выигрыш, покупка фишек новым игроком)."""
+        self._add(self.tray, amount, -1)
+
+    def cash_in(self, holding: list[int]) -> None:
+        """Касса принимает набор фишек как есть (например, фишки игрока, который уходит из казино)."""
+        tray = self.tray
+        for index in self._indices:
+            tray[index] += holding[index]
+
+    def settle(self, holding: list[int], old: int, new: int) -> None:
+        """
+        Приводит фишки игрока в соответствие с новым балансом.
+
+        Полученная сумма добавляется к фишкам игрока минимальным набором. Когда игрок
+        платит, касса меняет все его фишки на минимальный набор на остаток и на сумму
+        платежа, которую игрок отдаёт; для кассы такой размен не меняет стоимость запаса.
+
+        :param holding: Фишки игрока, изменяются на месте.
+        :param old: Прежний баланс (стоимость holding).
+        :param new: Новый баланс (неотрицательный).
+        """
+        if new < 0:
+            raise ValueError(f"Баланс не может быть отрицательным: {new}")
+        limit = self._limit
+        if new >= old:
+            amount = new - old
+            if amount >= limit:
+                self._add(holding, amount, 1)
+                return
+            for index, count in self._sparse[amount]:
+                holding[index] += count
+            return
+        paid = old - new
+        kept_top = 0
+        if new >= limit or paid >= limit:
+            kept_top, new = self._split(new)
+            paid_top, paid = self._split(paid)
+            self.tray[0] -= kept_top + paid_top
+        tray = self.tray
+        kept_counts = self._table[new]
+        paid_counts = self._table[paid]
+        for index in self._indices:
+            tray[index] += holding[index] - kept_counts[index] - paid_counts[index]
+        holding[:] = kept_counts
+        holding[0] += kept_top
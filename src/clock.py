@@ -0,0 +1,101 @@
+import math
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """
+    Базовые часы симуляции.
+
+    Хранят симулированное время (в секундах с начала симуляции) и решают,
+    сколько реального времени нужно ждать на каждую паузу казино.
+    """
+
+    def __init__(self):
+        self._now = 0.0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(now={self._now:.1f})"
+
+    def now(self) -> float:
+        """
+        Возвращает текущее симулированное время.
+
+        :return: Количество симулированных секунд с начала симуляции.
+        """
+        return self._now
+
+    def reset(self, now: float = 0.0) -> None:
+        """
+        Переводит часы на указанное симулированное время (например, при восстановлении из снимка).
+
+        :param now: Симулированное время в секундах.
+        """
+        self._now = now
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Продвигает симулированное время на указанное количество секунд.
+
+        :param seconds: Длительность паузы в симулированных секундах.
+        """
+        self._now += seconds
+        self._wait(seconds)
+
+    @abstractmethod
+    def _wait(self, seconds: float) -> None:
+        """
+        Ждёт реальное время, соответствующее паузе; подклассы решают, сколько именно.
+
+        :param seconds: Длительность паузы в симулированных секундах.
+        """
+
+
+class RealTimeClock(Clock):
+    """Часы для демонстраций: каждая пауза занимает столько же реального времени."""
+
+    def _wait(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Виртуальные часы для пакетных прогонов: время идёт, но никто не спит."""
+
+    def _wait(self, seconds: float) -> None:
+        pass
+
+
+class ScaledClock(Clock):
+    """Ускоренные часы: пауза в N симулированных секунд длится N / factor реальных."""
+
+    def __init__(self, factor: float):
+        super().__init__()
+        if not math.isfinite(factor) or factor <= 0:
+            raise ValueError(f"Коэффициент ускорения должен быть положительным конечным числом: {factor}")
+        self.factor = factor
+
+    def __repr__(self):
+        return f"ScaledClock(factor={self.factor}, now={self._now:.1f})"
+
+    def _wait(self, seconds: float) -> None:
+        time.sleep(seconds / self.factor)
+
+
+def make_clock(pace: str) -> Clock:
+    """
+    Создаёт часы по строковому описанию темпа симуляции.
+
+    :param pace: 'real' — реальное время, 'virtual' — без пауз,
+                 '100x' (или просто '100') — ускорение в 100 раз.
+    :return: Объект часов.
+    """
+    pace = pace.strip().lower()
+    if pace == "real":
+        return RealTimeClock()
+    if pace == "virtual":
+        return VirtualClock()
+    try:
+        factor = float(pace.removesuffix("x"))
+    except ValueError:
+        raise ValueError(f"Неизвестный темп симуляции: {pace!r}") from None
+    return ScaledClock(factor)
@@ -1,4 +1,15 @@
+import contextlib
+import copy
+import locale
 import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+OVERFLOW_POLICIES = ("drop", "block")
+LOG_MODES = ("sync", "async")
+
 
 class InfoOnlyFilter(logging.Filter):
     def filter(self, record):
@@ -8,6 +19,196 @@ class NotInfoFilter(logging.Filter):
     def filter(self, record):
         return record.levelno != logging.INFO
 
+class SimTimeFilter(logging.Filter):
+    """Подставляет симулированное время в запись (или прочерк, если его нет)."""
+    def filter(self, record):
+        sim_time = getattr(record, "sim_time", None)
+        record.sim_clock = f"{sim_time:.1f}s" if sim_time is not None else "-"
+        return True
+
+
+class BatchingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Файловый обработчик, который копит отформатированные записи и дописывает их в файл пачкой одним write.
+
+    Пачка сбрасывается, когда в ней набирается batch_size байт (в кодировке файла), когда с первой записи
+    пачки прошло flush_interval секунд, а также при flush() и close(). Срок пачки отсчитывает таймер, поэтому
+    записи тихого логгера попадают в файл вовремя, а не ждут следующей записи или закрытия.
+    Ротация по maxBytes проверяется для пачки целиком.
+    """
+
+    def __init__(self, filename, mode="a", maxBytes=0, backupCount=0, encoding=None, delay=False, errors=None,
+                 batch_size: int = 64 * 1024, flush_interval: float = 1.0):
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay, errors)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Кодировка, в которой считаются байты пачки (как у файла; 'locale' — кодировка по умолчанию)
+        self._encoding = self.encoding if self.encoding not in (None, "locale") else locale.getpreferredencoding(False)
+        self._batch: list[str] = []
+        self._pending = 0
+        self._started = 0.0
+        self._timer: threading.Timer | None = None
+
+    def emit(self, record):
+        try:
+            message = self.format(record) + self.terminator
+            size = len(message.encode(self._encoding, self.errors or "strict"))
+        except Exception:
+            self.handleError(record)
+            return
+        if not self._batch:
+            self._started = time.monotonic()
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        self._batch.append(message)
+        self._pending += size
+        if self._pending >= self.batch_size or time.monotonic() - self._started >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._batch:
+                data = "".join(self._batch)
+                size = self._pending
+                self._batch.clear()
+                self._pending = 0
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0:
+                    self.stream.seek(0, 2)
+                    if self.stream.tell() and self.stream.tell() + size >= self.maxBytes:
+                        self.doRollover()
+                self.stream.write(data)
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Кладёт записи в ограниченную очередь, а обработчики выполняет фоновый поток (AsyncLogging).
+
+    Если очередь заполнена, политика 'drop' отбрасывает запись и увеличивает счётчик dropped,
+    а политика 'block' ждёт, пока фоновый поток освободит место.
+    """
+
+    def __init__(self, queue_size: int = 10_000, policy: str = "drop"):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения очереди логов: {policy!r}")
+        if queue_size < 1:
+            raise ValueError(f"Размер очереди логов должен быть положительным: {queue_size}")
+        super().__init__(queue.Queue(queue_size))
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Сообщение собирается сразу: аргументы (например, словарь весов событий) к моменту записи могут измениться.
+        # Форматирование строки лога (время, уровень, цвет) остаётся фоновому потоку.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener, который дожидается места для сигнала остановки в заполненной ограниченной очереди."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging:
+    """
+    Асинхронный режим логирования: обработчики логгера переезжают в фоновый поток.
+
+    Поток симуляции только кладёт запись в ограниченную очередь (BoundedQueueHandler) и никогда не ждёт
+    терминал или диск; при политике 'block' он ждёт лишь освобождения места в заполненной очереди.
+    stop() дописывает очередь, возвращает обработчики на место и сообщает в лог, сколько записей отброшено.
+
+    Использование: with AsyncLogging(queue_size=10_000, policy="drop"): run_simulation(...)
+    """
+
+    def __init__(self, queue_size: int = 10_000, policy: str = "drop", logger: logging.Logger | None = None):
+        self.logger = logger if logger is not None else logging.getLogger()
+        self.queue_handler = BoundedQueueHandler(queue_size, policy)
+        self.handlers: list[logging.Handler] = []
+        self.listener: logging.handlers.QueueListener | None = None
+
+    @property
+    def dropped(self) -> int:
+        """Сколько записей отброшено из-за переполнения очереди."""
+        return self.queue_handler.dropped
+
+    def start(self) -> None:
+        """Переносит текущие обработчики логгера в фоновый поток."""
+        if self.listener is not None:
+            return
+        self.handlers = list(self.logger.handlers)
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = _DrainingQueueListener(self.queue_handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Дописывает очередь и возвращает обработчики логгеру."""
+        if self.listener is None:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+            handler.flush()
+        if self.dropped:
+            self.logger.warning("Очередь логов переполнялась, отброшено записей: %d", self.dropped)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def logging_mode(mode: str = "sync", queue_size: int = 10_000, policy: str = "drop"):
+    """
+    Возвращает контекст режима логирования для прогона.
+
+    :param mode: 'sync' — обработчики работают в потоке симуляции, 'async' — в фоновом потоке.
+    :param queue_size: Размер очереди записей в режиме 'async'.
+    :param policy: Что делать при заполненной очереди: 'drop' (отбросить запись) или 'block' (ждать).
+    :return: AsyncLogging или пустой контекст.
+    """
+    if mode not in LOG_MODES:
+        raise ValueError(f"Неизвестный режим логирования: {mode!r}")
+    if policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"Неизвестная политика переполнения очереди логов: {policy!r}")
+    if mode == "sync":
+        return contextlib.nullcontext()
+    return AsyncLogging(queue_size, policy)
+
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -19,14 +220,17 @@ LOGGING_CONFIG = {
         "not_info": {
             "()": NotInfoFilter,
         },
+        "sim_time": {
+            "()": SimTimeFilter,
+        },
     },
     "formatters": {
         "standard": {
-            "format": "[%(asctime)s] %(levelname)s: %(message)s",
+            "format": "[%(asctime)s] [%(sim_clock)s] %(levelname)s: %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
         "console_format": {
-            "format": "%(message)s\x1b[0m",
+            "format": "[%(sim_clock)s] %(message)s\x1b[0m",
         }
     },
     "handlers": {
@@ -34,18 +238,19 @@ LOGGING_CONFIG = {
             "class": "logging.StreamHandler",
             "formatter": "console_format",
             "level": "INFO",
-            "filters": ["info_only"],
+            "filters": ["info_only", "sim_time"],
         },
         "file": {
-            "class": "logging.handlers.RotatingFileHandler",
+            "()": BatchingFileHandler,
             "formatter": "standard",
             "mode": "a",
             "filename": "sim.log",
             "maxBytes": 5 * 1024 * 1024,  # 5 MB before rotating
             "backupCount": 5,
             "level": "DEBUG",
-            "filters": ["not_info"],
+            "filters": ["not_info", "sim_time"],
             "encoding": "utf-8",
+            "delay": True,  # sim.log открывается при первой записи
         },
     },
     "loggers": {
@@ -55,4 +260,27 @@ LOGGING_CONFIG = {
             "propagate": False,
         }
     },
-}
\ No newline at end of file
+}
+
+
+_configured = False
+
+
+def configure_logging(config: dict | None = None) -> None:
+    """
+    Настраивает colorama и обработчики логов по LOGGING_CONFIG; повторные вызовы ничего не делают.
+
+    Вызывается командами, которые действительно пишут логи: импорт модулей симуляции ничего не настраивает,
+    а headless-прогоны не открывают sim.log.
+
+    :param config: Конфигурация для logging.config.dictConfig (по умолчанию LOGGING_CONFIG).
+    """
+    global _configured
+    if _configured:
+        return
+    import logging.config
+    from colorama import init
+
+    init(autoreset=True)
+    logging.config.dictConfig(LOGGING_CONFIG if config is None else config)
+    _configured = True
@@ -1 +1,5 @@
-ENTITIES_MAX_COUNT = 12
\ No newline at end of file
+ENTITIES_MAX_COUNT = 12
+
+# Длительность пауз в симулированных секундах
+STEP_DURATION = 1.5
+SPIN_DURATION = 1.0
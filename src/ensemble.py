@@ -0,0 +1,189 @@
+import math
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, NamedTuple
+
+from casino import Casino
+from chip import ChipCollection
+from clock import VirtualClock
+from events import Event, EventKind, LoggingSink
+from params import CasinoParams, DEFAULT_PARAMS
+from rng import make_rng
+
+Z_95 = 1.959964
+
+
+class ReplicaSummary(NamedTuple):
+    """Итоги одного независимого прогона казино."""
+    index: int
+    seed: int
+    steps: int
+    final_balances: list[int]
+    event_counts: dict[str, int]
+    total_staked: int
+    total_paid: int
+    mean_lifetime: float
+
+    @property
+    def house_edge(self) -> float:
+        """Доля поставленных денег, оставшаяся у казино."""
+        if not self.total_staked:
+            return 0.0
+        return (self.total_staked - self.total_paid) / self.total_staked
+
+    @property
+    def ruined(self) -> bool:
+        """Разорены ли все оставшиеся игроки (или игроков не осталось)."""
+        return not any(self.final_balances)
+
+    @property
+    def kills(self) -> int:
+        """Количество убийств, совершённых психопатами."""
+        return self.event_counts.get(EventKind.KILL.name, 0)
+
+
+class MetricEstimate(NamedTuple):
+    """Среднее значение метрики по ансамблю и 95% доверительный интервал."""
+    mean: float
+    low: float
+    high: float
+
+
+class SummarySink:
+    """Приёмник событий, который копит статистику одного прогона."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.total_staked = 0
+        self.total_paid = 0
+        self.joined: dict[str, int] = {}
+        self.lifetimes: list[int] = []
+
+    def __call__(self, event: Event) -> None:
+        kind = event.kind
+        self.counts[kind] += 1
+        if kind == EventKind.BET:
+            self.total_staked += event.amount
+        elif kind == EventKind.PAYOUT:
+            self.total_paid += event.value
+        elif kind == EventKind.JOIN and event.tag in LoggingSink.PLAYER_CLASSES:
+            self.joined[event.actor] = event.step
+        elif kind == EventKind.KILL:
+            self._died(event.target, event.step)
+        elif kind == EventKind.SUICIDE:
+            self._died(event.actor, event.step)
+
+    def _died(self, name: str, step: int) -> None:
+        joined = self.joined.pop(name, None)
+        if joined is not None:
+            self.lifetimes.append(step - joined)
+
+    def mean_lifetime(self, steps: int) -> float:
+        """
+        Среднее число шагов, которое игрок провёл в казино.
+
+        :param steps: Длина прогона, до которой доживают оставшиеся игроки.
+        """
+        lifetimes = self.lifetimes + [steps - joined for joined in self.joined.values()]
+        return sum(lifetimes) / len(lifetimes) if lifetimes else 0.0
+
+
+def replica_seeds(base_seed: int, replicas: int) -> list[int]:
+    """
+    Детерминированно выводит сиды реплик из базового сида.
+
+    Сид реплики зависит только от base_seed и её номера, но не от числа процессов.
+    """
+    rng = random.Random(base_seed)
+    return [rng.getrandbits(63) for _ in range(replicas)]
+
+
+def run_replica(index: int, seed: int, steps: int, rng_kind: str = "stdlib",
+                params: CasinoParams = DEFAULT_PARAMS) -> ReplicaSummary:
+    """
+    Выполняет один headless-прогон казино в виртуальном времени.
+
+    :param index: Номер реплики в ансамбле.
+    :param seed: Сид реплики.
+    :param steps: Количество шагов.
+    :param rng_kind: Тип генератора случайных чисел ('stdlib' или 'numpy').
+    :param params: Параметры казино.
+    :return: Итоги прогона.
+    """
+    casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True, rng=make_rng(seed, rng_kind),
+                    params=params)
+    sink = SummarySink()
+    casino.attach_sink(sink)
+    for _ in range(steps):
+        casino.perform_step()
+    return ReplicaSummary(
+        index=index,
+        seed=seed,
+        steps=steps,
+        final_balances=[p.balance for p in casino.players],
+        event_counts={kind.name: count for kind, count in sink.counts.items()},
+        total_staked=sink.total_staked,
+        total_paid=sink.total_paid,
+        mean_lifetime=sink.mean_lifetime(steps),
+    )
+
+
+def run_ensemble(replicas: int, steps: int, base_seed: int = 0, workers: int | None = None,
+                 rng_kind: str = "stdlib", params: CasinoParams = DEFAULT_PARAMS) -> Iterator[ReplicaSummary]:
+    """
+    Раскидывает независимые реплики казино по пулу процессов.
+
+    Итоги возвращаются по мере готовности (не обязательно по порядку номеров).
+
+    :param replicas: Количество реплик.
+    :param steps: Количество шагов в каждой реплике.
+    :param base_seed: Базовый сид, из которого выводятся сиды реплик.
+    :param workers: Число процессов; 1 — выполнять в текущем процессе, None — по числу ядер.
+    :param rng_kind: Тип генератора случайных чисел в репликах.
+    :param params: Параметры казино во всех репликах.
+    """
+    seeds = replica_seeds(base_seed, replicas)
+    if workers == 1:
+        for index, seed in enumerate(seeds):
+            yield run_replica(index, seed, steps, rng_kind, params)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_replica, index, seed, steps, rng_kind, params)
+                   for index, seed in enumerate(seeds)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def estimate(values: list[float]) -> MetricEstimate:
+    """
+    Считает среднее и 95% доверительный интервал (нормальное приближение).
+
+    :param values: Значения метрики по репликам.
+    """
+    n = len(values)
+    if n == 0:
+        return MetricEstimate(math.nan, math.nan, math.nan)
+    mean = sum(values) / n
+    if n == 1:
+        return MetricEstimate(mean, mean, mean)
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    half_width = Z_95 * math.sqrt(variance / n)
+    return MetricEstimate(mean, mean - half_width, mean + half_width)
+
+
+def aggregate(summaries: list[ReplicaSummary]) -> dict[str, MetricEstimate]:
+    """
+    Сводит итоги реплик в оценки ключевых метрик.
+
+    :param summaries: Итоги реплик.
+    :return: Словарь метрика -> оценка с доверительным интервалом.
+    """
+    return {
+        "house_edge": estimate([s.house_edge for s in summaries]),
+        "ruin_probability": estimate([float(s.ruined) for s in summaries]),
+        "kills": estimate([float(s.kills) for s in summaries]),
+        "final_total_balance": estimate([float(sum(s.final_balances)) for s in summaries]),
+        "mean_lifetime": estimate([s.mean_lifetime for s in summaries]),
+    }
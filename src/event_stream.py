@@ -0,0 +1,162 @@
+import mmap
+import os
+import struct
+
+from events import Event, EventKind
+
+MAGIC = b"CSEV\x01\x00\x00\x00"
+# step, time, kind, actor, target, tag, amount, value, balance
+RECORD = struct.Struct("<QdBiiiqqq")
+FIELDS = Event._fields
+STRING_FIELDS = ("actor", "target", "tag")
+
+
+def names_path(path: str) -> str:
+    """Путь к файлу-словарю строк, который лежит рядом с потоком событий."""
+    return path + ".names"
+
+
+class EventStreamWriter:
+    """
+    Приёмник событий, который дописывает их в бинарный файл записями фиксированной длины.
+
+    Строки (имена, типы ставок, классы) хранятся один раз в файле-словаре `<path>.names`,
+    а в записи попадает только их номер. Файл открывается на дозапись, так что несколько
+    запусков можно складывать в один поток.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        self.path = path
+        self._strings: dict[str, int] = {"": 0}
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path} не является потоком событий казино")
+            for name in _read_names(path)[1:]:
+                self._strings[name] = len(self._strings)
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._names = open(names_path(path), "a", encoding="utf-8")
+        if new_file:
+            self._file.write(MAGIC)
+            self._names.truncate(0)
+            self._names.write("\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __call__(self, event: Event) -> None:
+        self._file.write(RECORD.pack(
+            event.step, event.time, event.kind,
+            self._intern(event.actor), self._intern(event.target), self._intern(event.tag),
+            event.amount, event.value, event.balance
+        ))
+
+    def _intern(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+            self._names.write(value + "\n")
+        return index
+
+    def flush(self) -> None:
+        """Сбрасывает буферы на диск."""
+        self._names.flush()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Сбрасывает буферы и закрывает файлы."""
+        if not self._file.closed:
+            self.flush()
+            self._names.close()
+            self._file.close()
+
+
+class EventStreamReader:
+    """
+    Читатель бинарного потока событий поверх memory-mapped файла.
+
+    Поддерживает индексацию, итерацию и чтение отдельных колонок без создания Event.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._strings = _read_names(path)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(MAGIC):
+            self._file.close()
+            raise ValueError(f"{path} не является потоком событий казино")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} не является потоком событий казино")
+        self._count = (size - len(MAGIC)) // RECORD.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Event:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("event index out of range")
+        return self._decode(RECORD.unpack_from(self._mmap, len(MAGIC) + index * RECORD.size))
+
+    def __iter__(self):
+        for row in self._rows():
+            yield self._decode(row)
+
+    def _rows(self):
+        end = len(MAGIC) + self._count * RECORD.size
+        return RECORD.iter_unpack(memoryview(self._mmap)[len(MAGIC):end])
+
+    def _decode(self, row: tuple) -> Event:
+        strings = self._strings
+        step, time, kind, actor, target, tag, amount, value, balance = row
+        return Event(step, time, EventKind(kind), strings[actor], strings[target], strings[tag],
+                     amount, value, balance)
+
+    def column(self, field: str) -> list:
+        """
+        Возвращает значения одного поля для всех событий.
+
+        :param field: Имя поля Event (например, 'amount' или 'actor').
+        :return: Список значений в порядке записи.
+        """
+        index = FIELDS.index(field)
+        values = [row[index] for row in self._rows()]
+        if field in STRING_FIELDS:
+            strings = self._strings
+            return [strings[v] for v in values]
+        if field == "kind":
+            return [EventKind(v) for v in values]
+        return values
+
+    def of_kind(self, kind: EventKind) -> list[Event]:
+        """
+        Возвращает все события указанного типа.
+
+        :param kind: Тип события.
+        """
+        return [self._decode(row) for row in self._rows() if row[2] == kind]
+
+    def close(self) -> None:
+        """Освобождает отображение файла в память."""
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+
+def _read_names(path: str) -> list[str]:
+    with open(names_path(path), encoding="utf-8") as f:
+        return f.read().split("\n")[:-1]
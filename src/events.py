@@ -0,0 +1,108 @@
+import logging
+from enum import IntEnum
+from typing import Callable, NamedTuple
+
+from colorama import Fore
+
+
+class EventKind(IntEnum):
+    """Типы событий, которые публикует казино."""
+    BET = 1
+    SPIN = 2
+    PAYOUT = 3
+    STEAL = 4
+    HONK = 5
+    GIFT = 6
+    JOIN = 7
+    KILL = 8
+    SUICIDE = 9
+
+
+class Event(NamedTuple):
+    """
+    Структурированная запись о событии казино.
+
+    Значение полей зависит от типа события:
+      BET     — actor: игрок, tag: тип ставки, amount: ставка, balance: баланс после ставки;
+      SPIN    — tag: выигрышный цвет, amount: выпавшее число;
+      PAYOUT  — actor: игрок, tag: тип ставки, amount: ставка, value: выплата, balance: новый баланс;
+      STEAL   — actor: гусь, target: игрок, amount: украдено, balance: новый баланс игрока;
+      HONK    — actor: гусь, amount: громкость, value: потеря каждого игрока;
+      GIFT    — actor: гусь, amount: подарок каждому игроку;
+      JOIN    — actor: имя, tag: класс сущности, amount: громкость гуся, balance: баланс игрока;
+      KILL    — actor: убийца, target: жертва, amount: отобранные деньги, balance: баланс убийцы;
+      SUICIDE — actor: игрок, balance: баланс на момент ухода.
+    """
+    step: int
+    time: float
+    kind: EventKind
+    actor: str = ""
+    target: str = ""
+    tag: str = ""
+    amount: int = 0
+    value: int = 0
+    balance: int = 0
+
+
+EventSink = Callable[[Event], None]
+
+
+class LoggingSink:
+    """Приёмник событий, который печатает их цветным текстом через logging."""
+
+    PLAYER_CLASSES = ("Player", "PsychoPlayer")
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger if logger is not None else logging.getLogger()
+
+    def __call__(self, event: Event) -> None:
+        log = self.logger.info
+        extra = {"sim_time": event.time}
+        kind = event.kind
+        if kind == EventKind.BET:
+            log(Fore.BLUE + "🎰 Игрок %s сделал ставку: %d на %s. Баланс после ставки: %d",
+                event.actor, event.amount, event.tag, event.balance, extra=extra)
+        elif kind == EventKind.SPIN:
+            log(Fore.LIGHTYELLOW_EX + "🎡 Колёсико вращается...", extra=extra)
+            log(Fore.LIGHTYELLOW_EX + "🎲 Выпало: %d (%s)", event.amount, event.tag, extra=extra)
+        elif kind == EventKind.PAYOUT:
+            won = event.value > 0
+            log((Fore.GREEN if won else Fore.RED) + "💰 Игрок %s поставил %d на %s и %s. Новый баланс: %d",
+                event.actor, event.amount, event.tag, "ВЫИГРАЛ" if won else "ПРОИГРАЛ", event.balance,
+                extra=extra)
+        elif kind == EventKind.STEAL:
+            log(Fore.MAGENTA + "🦢 Гусь %s украл у игрока %s %d грязных бумажек! Новый баланс игрока: %d",
+                event.actor, event.target, event.amount, event.balance, extra=extra)
+        elif kind == EventKind.HONK:
+            log(Fore.MAGENTA + "🦢 Гусь %s жёстко орёт! " + Fore.LIGHTYELLOW_EX + "Га! " * event.amount,
+                event.actor, extra=extra)
+            log(Fore.MAGENTA + "🦢 Крик гуся напугал игроков! Все потеряли по %s денег.",
+                event.value, extra=extra)
+        elif kind == EventKind.GIFT:
+            log(Fore.MAGENTA + "🦢 Гусь %s раздаёт челяди деньги! Все игроки получают по %d",
+                event.actor, event.amount, extra=extra)
+        elif kind == EventKind.JOIN:
+            if event.tag in self.PLAYER_CLASSES:
+                log(Fore.CYAN + "➕ В казик пришёл новый игрок: %s с валютой в количестве %d",
+                    event.actor, event.balance, extra=extra)
+            else:
+                log(Fore.CYAN + "➕ В казик залетел новый гусь по имени %s", event.actor, extra=extra)
+        elif kind == EventKind.KILL:
+            log(Fore.RED + "❌ Игрок %s психанул и убил игрока %s. Игрок %s покидает казино! Новый баланс убийцы: %d",
+                event.actor, event.target, event.target, event.balance, extra=extra)
+        elif kind == EventKind.SUICIDE:
+            log(Fore.RED + "❌ Игрок %s больше так не может. Игрок %s покидает этот мир!",
+                event.actor, event.actor, extra=extra)
+
+
+class ListSink:
+    """Приёмник событий, который просто складывает их в список (удобно для тестов и анализа)."""
+
+    def __init__(self):
+        self.events: list[Event] = []
+
+    def __call__(self, event: Event) -> None:
+        self.events.append(event)
+
+    def __len__(self):
+        return len(self.events)
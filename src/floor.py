@@ -0,0 +1,458 @@
+import multiprocessing
+import os
+import random
+import traceback
+from collections import Counter
+from typing import Callable, NamedTuple
+
+from casino import Casino
+from chip import ChipCollection
+from clock import VirtualClock
+from constants import ENTITIES_MAX_COUNT
+from ensemble import SummarySink, replica_seeds
+from events import EventKind
+from goose import Goose, HonkGoose, RichGoose
+from names import NamePool
+from player import Player, PsychoPlayer
+from rng import make_rng
+
+SYNC_MODES = ("barrier", "async")
+ENTITY_CLASSES = {cls.__name__: cls for cls in (Player, PsychoPlayer, Goose, HonkGoose, RichGoose)}
+
+
+class Migrant(NamedTuple):
+    """Сущность, которая переходит за другой стол. Передаётся между процессами как кортеж."""
+    origin: int
+    class_name: str
+    name: str
+    balance: int = 0
+    psycho: float = 0.0
+    honk_volume: int = 0
+
+    @property
+    def is_player(self) -> bool:
+        return issubclass(ENTITY_CLASSES[self.class_name], Player)
+
+
+class TableSummary(NamedTuple):
+    """Итоги одного стола этажа."""
+    table: int
+    seed: int
+    steps: int
+    sim_time: float
+    players: int
+    geese: int
+    total_balance: int
+    event_counts: dict[str, int]
+    migrated_in: int
+    migrated_out: int
+
+
+def claim_name(pool: NamePool, migrant: Migrant, in_use: Callable[[str], bool]) -> str:
+    """
+    Выбирает имя пришедшей сущности за новым столом и помечает его занятым в пуле стола.
+
+    :param pool: Пул свободных имён стола.
+    :param migrant: Пришедшая сущность.
+    :param in_use: Проверка, занято ли имя за столом.
+    :return: Имя, которого нет среди занятых за столом.
+    """
+    name = migrant.name
+    if in_use(name):
+        name = f"{migrant.name} (стол {migrant.origin})"
+        suffix = 1
+        while in_use(name):
+            suffix += 1
+            name = f"{migrant.name} (стол {migrant.origin}, {suffix})"
+    if name in pool:
+        pool.remove(name)
+    return name
+
+
+class Table:
+    """
+    Один стол этажа: headless-казино со своими часами, генератором и статистикой.
+
+    После каждого шага с вероятностью migration_rate один случайный игрок или гусь
+    встаёт из-за стола; его состояние возвращается как Migrant.
+    """
+
+    def __init__(self, table_id: int, seed: int, migration_rate: float = 0.0, rng_kind: str = "stdlib",
+                 max_entities: int = ENTITIES_MAX_COUNT):
+        self.table_id = table_id
+        self.seed = seed
+        self.migration_rate = migration_rate
+        self.casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True,
+                             rng=make_rng(seed, rng_kind), max_entities=max_entities)
+        self.sink = SummarySink()
+        self.casino.attach_sink(self.sink)
+        self.migrated_in = 0
+        self.migrated_out = 0
+
+    def __repr__(self):
+        return f"Table({self.table_id}, population={self.population})"
+
+    @property
+    def population(self) -> int:
+        return len(self.casino.players) + len(self.casino.geese)
+
+    def step(self) -> Migrant | None:
+        """
+        Выполняет шаг казино и, возможно, отпускает одну сущность за другой стол.
+
+        :return: Ушедшая сущность или None.
+        """
+        casino = self.casino
+        casino.perform_step()
+        if self.migration_rate and self.population and casino.rng.random() < self.migration_rate:
+            return self.release(casino.rng.randint(0, self.population - 1))
+        return None
+
+    def release(self, index: int) -> Migrant:
+        """
+        Убирает сущность из-за стола. Открытые ставки уходящего игрока возвращаются ему.
+
+        :param index: Номер сущности: сначала игроки, затем гуси.
+        :return: Состояние ушедшей сущности.
+        """
+        casino = self.casino
+        self.migrated_out += 1
+        if index < len(casino.players):
+            player = casino.players[index]
+            stake = casino.bets.stake(player.id)
+            if stake:
+                player.balance += stake
+                if casino.chip_rack is not None:
+                    casino.chip_rack.withdraw(stake)
+            casino.remove_player(player)
+            return Migrant(self.table_id, type(player).__name__, player.name, player.balance,
+                           getattr(player, "psycho", 0.0))
+        goose = casino.geese[index - len(casino.players)]
+        casino.remove_goose(goose)
+        return Migrant(self.table_id, type(goose).__name__, goose.name, honk_volume=goose.honk_volume)
+
+    def admit(self, migrant: Migrant) -> bool:
+        """
+        Сажает пришедшую сущность за стол, если за ним есть место (не больше casino.max_entities).
+
+        Имя пришедшего забирается из пула свободных имён стола. Если за столом уже сидит тёзка,
+        пришедший получает имя с номером стола, откуда он пришёл: «Иван (стол 3)».
+
+        :param migrant: Состояние сущности, ушедшей с другого стола.
+        :return: True, если сущность села за стол; False, если стол полон.
+        """
+        casino = self.casino
+        if self.population >= casino.max_entities:
+            return False
+        entity_class = ENTITY_CLASSES[migrant.class_name]
+        self.migrated_in += 1
+        if migrant.is_player:
+            name = claim_name(casino.player_names, migrant, casino.player_name_in_use)
+            player = entity_class(name, migrant.balance)
+            if isinstance(player, PsychoPlayer):
+                player.psycho = migrant.psycho
+            casino.add_player(player)
+            if casino.sinks:
+                casino.emit(EventKind.JOIN, actor=player.name, tag=migrant.class_name, balance=player.balance)
+        else:
+            name = claim_name(casino.goose_names, migrant, casino.goose_name_in_use)
+            casino.add_goose(entity_class(name, migrant.honk_volume))
+        return True
+
+    def summary(self) -> TableSummary:
+        casino = self.casino
+        return TableSummary(
+            table=self.table_id,
+            seed=self.seed,
+            steps=casino.step_count,
+            sim_time=casino.clock.now(),
+            players=len(casino.players),
+            geese=len(casino.geese),
+            total_balance=casino.total_balance(),
+            event_counts={kind.name: count for kind, count in self.sink.counts.items()},
+            migrated_in=self.migrated_in,
+            migrated_out=self.migrated_out,
+        )
+
+
+class TableShard:
+    """
+    Группа столов, которую обслуживает один рабочий процесс.
+
+    Все команды приходят сообщениями-кортежами; handle возвращает ответ для менеджера
+    этажа, поэтому шард можно проверять и без отдельного процесса.
+    """
+
+    def __init__(self, tables: list[Table]):
+        self.tables = {table.table_id: table for table in tables}
+
+    def populations(self) -> dict[int, int]:
+        return {table_id: table.population for table_id, table in self.tables.items()}
+
+    def admit(self, admits: dict[int, list[Migrant]]) -> list[Migrant]:
+        """
+        Сажает пришедших за столы шарда.
+
+        :return: Сущности, которым не хватило места; менеджер этажа пересаживает их снова.
+        """
+        bounced = []
+        for table_id, migrants in admits.items():
+            table = self.tables[table_id]
+            for migrant in migrants:
+                if not table.admit(migrant):
+                    bounced.append(migrant)
+        return bounced
+
+    def run_steps(self, steps: int) -> list[Migrant]:
+        """
+        Выполняет по steps шагов на каждом столе шарда.
+
+        :return: Сущности, ушедшие со столов, в порядке номеров столов.
+        """
+        migrants = []
+        for table in self.tables.values():
+            for _ in range(steps):
+                migrant = table.step()
+                if migrant is not None:
+                    migrants.append(migrant)
+        return migrants
+
+    def handle(self, message: tuple) -> tuple | None:
+        """
+        Обрабатывает команду менеджера этажа.
+
+        :param message: ('epoch', steps, admits), ('admit', admits) или ('summary',).
+        :return: Ответ менеджеру. На 'epoch' и 'admit' в ответе есть сущности, которых надо пересадить
+            (ушедшие и не поместившиеся), и численность столов.
+        """
+        command = message[0]
+        if command == "epoch":
+            _, steps, admits = message
+            bounced = self.admit(admits)
+            return "epoch", bounced + self.run_steps(steps), self.populations()
+        if command == "admit":
+            return "admitted", self.admit(message[1]), self.populations()
+        if command == "summary":
+            return "summary", [table.summary() for table in self.tables.values()]
+        raise ValueError(f"Неизвестная команда шарда: {command!r}")
+
+
+def _shard_worker(worker: int, specs: list[tuple], inbox, outbox) -> None:
+    try:
+        _serve_shard(worker, TableShard([Table(*spec) for spec in specs]), inbox, outbox)
+    except Exception:
+        outbox.put((worker, ("error", traceback.format_exc(), {})))
+
+
+def _serve_shard(worker: int, shard: TableShard, inbox, outbox) -> None:
+    while True:
+        message = inbox.get()
+        if message[0] == "stop":
+            return
+        if message[0] == "run":
+            # Асинхронный режим: столы шарда идут по своим часам, не дожидаясь остальных
+            for _ in range(message[1]):
+                while not inbox.empty():
+                    outbox.put((worker, shard.handle(inbox.get())))
+                migrants = shard.run_steps(1)
+                if migrants:
+                    outbox.put((worker, ("migrate", migrants, shard.populations())))
+            outbox.put((worker, ("done", [], shard.populations())))
+            continue
+        reply = shard.handle(message)
+        if reply is not None:
+            outbox.put((worker, reply))
+
+
+class Floor:
+    """
+    Менеджер игрового этажа: много столов, распределённых по рабочим процессам.
+
+    Столы общаются с менеджером только сообщениями. Ушедшие со стола сущности менеджер
+    пересаживает за случайный другой стол, где есть место, а если его нет — обратно за свой стол.
+    Стол, который уже заполнился, возвращает пришедшего менеджеру, и тот пересаживает его снова;
+    если места нет нигде, сущность уходит с этажа (turned_away). Режимы синхронизации:
+      - 'barrier' — все столы делают по sync_steps шагов и ждут друг друга; результат
+        воспроизводим по сиду и не зависит от числа процессов;
+      - 'async' — каждый процесс гоняет свои столы по их собственным часам, миграции
+        доставляются по мере поступления (порядок зависит от планировщика ОС).
+    """
+
+    def __init__(self, tables: int, base_seed: int = 0, workers: int | None = None, sync: str = "barrier",
+                 sync_steps: int = 1, migration_rate: float = 0.01, rng_kind: str = "stdlib",
+                 max_entities: int = ENTITIES_MAX_COUNT):
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Неизвестный режим синхронизации: {sync!r}")
+        if tables < 1 or sync_steps < 1 or max_entities < 1:
+            raise ValueError("Количество столов, sync_steps и max_entities должны быть положительными")
+        self.tables = tables
+        self.sync = sync
+        self.sync_steps = sync_steps
+        self.workers = max(1, min(workers or os.cpu_count() or 1, tables))
+        self.rng = random.Random(base_seed)
+        self.seeds = replica_seeds(base_seed, tables)
+        self.migration_rate = migration_rate if tables > 1 else 0.0
+        self.rng_kind = rng_kind
+        self.max_entities = max_entities
+        self.populations = {table_id: 0 for table_id in range(tables)}
+        self.turned_away = 0
+        self._inboxes = []
+        self._outbox = None
+        self._processes = []
+
+    def __repr__(self):
+        return f"Floor(tables={self.tables}, workers={self.workers}, sync={self.sync!r})"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def worker_of(self, table_id: int) -> int:
+        """Номер процесса, который обслуживает стол."""
+        return table_id % self.workers
+
+    def start(self) -> None:
+        """Запускает рабочие процессы и создаёт в них столы."""
+        if self._processes:
+            return
+        self._outbox = multiprocessing.Queue()
+        for worker in range(self.workers):
+            specs = [(table_id, self.seeds[table_id], self.migration_rate, self.rng_kind, self.max_entities)
+                     for table_id in range(worker, self.tables, self.workers)]
+            inbox = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_shard_worker, args=(worker, specs, inbox, self._outbox),
+                                              daemon=True)
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+    def stop(self) -> None:
+        """Останавливает рабочие процессы."""
+        for inbox in self._inboxes:
+            inbox.put(("stop",))
+        for process in self._processes:
+            process.join()
+        self._inboxes, self._processes = [], []
+
+    def run(self, steps: int) -> list[TableSummary]:
+        """
+        Делает steps шагов на каждом столе и собирает итоги.
+
+        :param steps: Количество шагов на стол.
+        :return: Итоги столов в порядке номеров.
+        """
+        self.start()
+        if self.sync == "barrier":
+            self._run_barrier(steps)
+        else:
+            self._run_async(steps)
+        return self.summaries()
+
+    def summaries(self) -> list[TableSummary]:
+        """Собирает итоги всех столов."""
+        replies = self._broadcast(("summary",))
+        return sorted((s for reply in replies for s in reply[1]), key=lambda s: s.table)
+
+    def route(self, migrants: list[Migrant]) -> dict[int, dict[int, list[Migrant]]]:
+        """
+        Выбирает столы для ушедших сущностей.
+
+        Новый стол выбирается среди остальных столов с местом; если мест нет, сущность возвращается
+        за свой стол, а если полон и он — уходит с этажа. Численность столов приходит от шардов уже
+        после ухода сущностей, поэтому уход здесь не вычитается.
+
+        :return: Словарь процесс -> (стол -> пришедшие сущности).
+        """
+        admits: dict[int, dict[int, list[Migrant]]] = {}
+        for migrant in migrants:
+            free = [t for t, count in self.populations.items() if t != migrant.origin and count < self.max_entities]
+            if free:
+                table_id = self.rng.choice(free)
+            elif self.populations[migrant.origin] < self.max_entities:
+                table_id = migrant.origin
+            else:
+                self.turned_away += 1
+                continue
+            self.populations[table_id] += 1
+            admits.setdefault(self.worker_of(table_id), {}).setdefault(table_id, []).append(migrant)
+        return admits
+
+    def _receive(self) -> tuple[int, tuple]:
+        worker, reply = self._outbox.get()
+        if reply[0] == "error":
+            raise RuntimeError(f"Процесс {worker} этажа упал:\n{reply[1]}")
+        return worker, reply
+
+    def _broadcast(self, message: tuple) -> list[tuple]:
+        for inbox in self._inboxes:
+            inbox.put(message)
+        replies = [None] * self.workers
+        for _ in range(self.workers):
+            worker, reply = self._receive()
+            replies[worker] = reply
+        return replies
+
+    def _run_barrier(self, steps: int) -> None:
+        admits: dict[int, dict[int, list[Migrant]]] = {}
+        done = 0
+        while done < steps:
+            epoch = min(self.sync_steps, steps - done)
+            for worker, inbox in enumerate(self._inboxes):
+                inbox.put(("epoch", epoch, admits.get(worker, {})))
+            replies = [self._receive() for _ in range(self.workers)]
+            migrants = []
+            for _, (_, outgoing, populations) in sorted(replies, key=lambda r: r[0]):
+                self.populations.update(populations)
+                migrants.extend(outgoing)
+            migrants.sort(key=lambda m: m.origin)
+            admits = self.route(migrants)
+            done += epoch
+        pending = self._deliver(admits)
+        while pending:
+            # Последние пересадки: ждём ответов, не поместившихся пересаживаем снова
+            _, (_, bounced, populations) = self._receive()
+            self.populations.update(populations)
+            pending += self._deliver(self.route(bounced)) - 1
+
+    def _run_async(self, steps: int) -> None:
+        for inbox in self._inboxes:
+            inbox.put(("run", steps))
+        running = self.workers
+        pending = 0
+        while running or pending:
+            worker, (command, migrants, populations) = self._receive()
+            self.populations.update(populations)
+            if command == "done":
+                running -= 1
+            elif command == "admitted":
+                pending -= 1
+            pending += self._deliver(self.route(migrants))
+
+    def _deliver(self, admits: dict[int, dict[int, list[Migrant]]]) -> int:
+        """Отправляет пересадки шардам; возвращает число отправленных сообщений (на каждое придёт ответ)."""
+        for worker, tables in admits.items():
+            self._inboxes[worker].put(("admit", tables))
+        return len(admits)
+
+
+def floor_totals(summaries: list[TableSummary]) -> dict[str, int]:
+    """
+    Сводит итоги столов в итоги этажа.
+
+    :param summaries: Итоги столов.
+    :return: Словарь показатель -> значение.
+    """
+    events = Counter()
+    for summary in summaries:
+        events.update(summary.event_counts)
+    return {
+        "tables": len(summaries),
+        "players": sum(s.players for s in summaries),
+        "geese": sum(s.geese for s in summaries),
+        "total_balance": sum(s.total_balance for s in summaries),
+        "migrations": sum(s.migrated_out for s in summaries),
+        "kills": events.get(EventKind.KILL.name, 0),
+    }
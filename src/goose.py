@@ -1,30 +1,37 @@
 import logging
 import random
-from colorama import init, Fore
-
-init(autoreset=True)
+from collections import Counter
+from colorama import Fore
 
 
 class Goose:
-    def __init__(self, name: str, honk_volume: int = 1):
+    __slots__ = ("name", "honk_volume", "rng")
+
+    def __init__(self, name: str, honk_volume: int = 1, rng=None):
         self.name = name
         self.honk_volume = honk_volume
+        # Без своего генератора гусь пользуется глобальным модулем random
+        self.rng = rng if rng is not None else random
 
     def __repr__(self):
         return f"Goose(name={self.name}, honk_volume={self.honk_volume})"
 
 
 class RichGoose(Goose):
+    __slots__ = ()
+
     def spend(self):
         """
         Генерирует случайную сумму денег, которую гусь может потратить.
 
         :return: Случайное целое число от 1 до 100.
         """
-        return random.randint(1, 100)
+        return self.rng.randint(1, 100)
 
 
 class HonkGoose(Goose):
+    __slots__ = ()
+
     def __call__(self):
         """
         Вызывает гуся, который издаёт звук "Га!" с громкостью, равной его параметру honk_volume.
@@ -38,14 +45,18 @@ class HonkGoose(Goose):
 class GooseCollection:
     def __init__(self):
         self._geese = []
+        self._class_counts: Counter = Counter()
 
     def __getitem__(self, index):
         return self._geese[index]
 
     def __setitem__(self, index, value):
+        self._class_counts[type(self._geese[index])] -= 1
+        self._class_counts[type(value)] += 1
         self._geese[index] = value
 
     def __delitem__(self, index):
+        self._class_counts[type(self._geese[index])] -= 1
         del self._geese[index]
 
     def __len__(self):
@@ -56,6 +67,20 @@ class GooseCollection:
 
     def append(self, goose: Goose) -> None:
         self._geese.append(goose)
+        self._class_counts[type(goose)] += 1
+
+    def remove(self, goose: Goose) -> None:
+        self._geese.remove(goose)
+        self._class_counts[type(goose)] -= 1
 
     def clear(self) -> None:
-        self._geese.clear()
\ No newline at end of file
+        self._geese.clear()
+        self._class_counts.clear()
+
+    def count_of(self, cls: type) -> int:
+        """
+        Возвращает количество гусей указанного класса (включая подклассы) без прохода по стае.
+
+        :param cls: Класс гуся, например HonkGoose.
+        """
+        return sum(count for goose_class, count in self._class_counts.items() if issubclass(goose_class, cls))
\ No newline at end of file
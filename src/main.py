@@ -1,17 +1,403 @@
+import time
+
 import typer
-import simulation
+from clock import VirtualClock, make_clock
+from chip import ChipCollection
+from constants import ENTITIES_MAX_COUNT
 
+# Модули симуляции импортируются внутри команд: короткие вызовы CLI (--help, ошибки параметров)
+# и процессы-исполнители, которые импортируют этот файл, не платят за казино, asyncio и логирование.
 app = typer.Typer()
 
+def make_logging_mode(log_mode: str, log_queue: int, log_overflow: str, headless: bool):
+    """
+    Создаёт контекст режима логирования, переводя ошибки параметров в ошибки CLI.
+
+    Логирование настраивается здесь, до входа в контекст: асинхронный режим переносит в фоновый поток
+    уже установленные обработчики, а симуляция настроила бы их только после входа.
+    """
+    from config import configure_logging, logging_mode
+    if log_queue < 1:
+        raise typer.BadParameter("Размер очереди логов должен быть положительным", param_hint="--log-queue")
+    try:
+        mode = logging_mode(log_mode, log_queue, log_overflow)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--log-mode / --log-overflow")
+    if not headless:
+        configure_logging()
+    return mode
+
+
+def make_metrics_address(metrics_port: int | None, metrics_socket: str | None):
+    """Адрес живых метрик из опций CLI: порт на localhost, путь Unix-сокета или None."""
+    if metrics_port is not None and metrics_socket is not None:
+        raise typer.BadParameter("Задайте либо --metrics-port, либо --metrics-socket", param_hint="--metrics-port")
+    if metrics_socket is not None:
+        typer.echo(f"Метрики: unix:{metrics_socket} (/metrics, /metrics.json)")
+        return metrics_socket
+    if metrics_port is not None:
+        if not 0 < metrics_port < 65536:
+            raise typer.BadParameter(f"Недопустимый порт: {metrics_port}", param_hint="--metrics-port")
+        typer.echo(f"Метрики: http://127.0.0.1:{metrics_port}/metrics")
+        return "127.0.0.1", metrics_port
+    return None
+
+
 @app.command()
-def run_simulation(steps: int = 20, seed: int | None = None):
+def run_simulation(steps: int = 20, seed: int | None = None, pace: str = "real", headless: bool = False,
+                   events: str | None = None, rng: str = "stdlib", checkpoint: str | None = None,
+                   checkpoint_every: int = 1000, max_entities: int = ENTITIES_MAX_COUNT, profile: bool = False,
+                   log_mode: str = "async", log_queue: int = 10_000, log_overflow: str = "drop",
+                   record: str | None = None, keyframe_every: int = 10_000, metrics_port: int | None = None,
+                   metrics_socket: str | None = None):
     """
     Команда для запуска симуляции.
 
     :param steps: Количество шагов симуляции (по умолчанию 20).
     :param seed: Сид для генератора случайных чисел (по умолчанию None).
+    :param pace: Темп симуляции: 'real', 'virtual' или ускорение вида '100x' (по умолчанию 'real').
+    :param headless: Запуск без логирования событий (по умолчанию False).
+    :param events: Файл, в который пишется бинарный поток событий (по умолчанию не пишется).
+    :param rng: Генератор случайных чисел: 'stdlib' или 'numpy' (по умолчанию 'stdlib').
+    :param checkpoint: Файл снимка состояния, из которого прогон можно продолжить командой resume.
+    :param checkpoint_every: Через сколько шагов сохранять снимок (по умолчанию 1000).
+    :param max_entities: Максимальное количество игроков и гусей в казино (по умолчанию 12).
+    :param profile: Замерить время событий шага и вывести таблицу после прогона.
+    :param log_mode: 'async' — запись логов в фоновом потоке, 'sync' — в потоке симуляции (по умолчанию 'async').
+    :param log_queue: Размер очереди записей лога в режиме 'async' (по умолчанию 10000).
+    :param log_overflow: При заполненной очереди 'drop' отбрасывает записи, 'block' ждёт (по умолчанию 'drop').
+    :param record: Файл записи решений, по которой команда replay восстанавливает любой шаг прогона.
+    :param keyframe_every: Через сколько шагов записи сохранять ключевой кадр (по умолчанию 10000).
+    :param metrics_port: Порт на 127.0.0.1, по которому публикуются живые метрики (по умолчанию не публикуются).
+    :param metrics_socket: Путь Unix-сокета для живых метрик вместо порта.
     """
-    simulation.run_simulation(steps, seed)
+    import simulation
+    from profiling import Profiler
+    from rng import make_rng
+
+    if max_entities < 1:
+        raise typer.BadParameter("Лимит сущностей должен быть положительным", param_hint="--max-entities")
+    if keyframe_every < 1:
+        raise typer.BadParameter("Интервал ключевых кадров должен быть положительным", param_hint="--keyframe-every")
+    try:
+        clock = make_clock(pace)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--pace")
+    try:
+        generator = make_rng(seed, rng)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--rng")
+    logs = make_logging_mode(log_mode, log_queue, log_overflow, headless)
+    metrics_address = make_metrics_address(metrics_port, metrics_socket)
+    profiler = Profiler() if profile else None
+    with logs:
+        simulation.run_simulation(steps, seed, clock=clock, headless=headless, events_path=events, rng=generator,
+                                  checkpoint_path=checkpoint, checkpoint_every=checkpoint_every,
+                                  max_entities=max_entities, profiler=profiler, record_path=record,
+                                  keyframe_every=keyframe_every, metrics_address=metrics_address)
+    if profiler is not None:
+        typer.echo(profiler.report())
+
+
+@app.command()
+def resume(snapshot: str, steps: int = 20, pace: str = "real", headless: bool | None = None,
+           events: str | None = None, checkpoint_every: int = 1000, profile: bool = False,
+           log_mode: str = "async", log_queue: int = 10_000, log_overflow: str = "drop",
+           metrics_port: int | None = None, metrics_socket: str | None = None):
+    """
+    Команда для продолжения симуляции из снимка состояния.
+
+    :param snapshot: Файл снимка, записанный run-simulation --checkpoint.
+    :param steps: Сколько ещё шагов выполнить (по умолчанию 20).
+    :param pace: Темп симуляции: 'real', 'virtual' или ускорение вида '100x' (по умолчанию 'real').
+    :param headless: Запуск без логирования событий (по умолчанию как в снимке; --no-headless включает логирование).
+    :param events: Файл, в который дописывается бинарный поток событий (по умолчанию не пишется).
+    :param checkpoint_every: Через сколько шагов обновлять снимок (по умолчанию 1000).
+    :param profile: Замерить время событий шага и вывести таблицу после прогона.
+    :param log_mode: 'async' — запись логов в фоновом потоке, 'sync' — в потоке симуляции (по умолчанию 'async').
+    :param log_queue: Размер очереди записей лога в режиме 'async' (по умолчанию 10000).
+    :param log_overflow: При заполненной очереди 'drop' отбрасывает записи, 'block' ждёт (по умолчанию 'drop').
+    :param metrics_port: Порт на 127.0.0.1, по которому публикуются живые метрики (по умолчанию не публикуются).
+    :param metrics_socket: Путь Unix-сокета для живых метрик вместо порта.
+    """
+    import simulation
+    from profiling import Profiler
+    from snapshot import load_snapshot
+
+    try:
+        clock = make_clock(pace)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--pace")
+    # Ошибкой снимка считаются только ошибки чтения снимка, а не ValueError из самого прогона
+    try:
+        casino = load_snapshot(snapshot, clock=clock, headless=headless)
+    except FileNotFoundError:
+        raise typer.BadParameter(f"Файл снимка не найден: {snapshot}", param_hint="SNAPSHOT")
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="SNAPSHOT")
+    logs = make_logging_mode(log_mode, log_queue, log_overflow, casino.headless)
+    metrics_address = make_metrics_address(metrics_port, metrics_socket)
+    profiler = Profiler() if profile else None
+    with logs:
+        simulation.run_steps(casino, steps, events, snapshot, checkpoint_every, profiler,
+                             metrics_address=metrics_address)
+    if profiler is not None:
+        typer.echo(profiler.report())
+
+
+@app.command()
+def replay(record: str, step: int, follow: int = 0):
+    """
+    Команда для восстановления состояния записанного прогона на заданном шаге без повторного розыгрыша.
+
+    :param record: Файл записи, сделанный run-simulation --record.
+    :param step: Номер шага, состояние после которого нужно показать.
+    :param follow: Сколько следующих шагов проиграть с логированием событий (по умолчанию 0).
+    """
+    from config import configure_logging
+    from replay import ReplayLog
+
+    try:
+        log = ReplayLog.load(record)
+    except FileNotFoundError:
+        raise typer.BadParameter(f"Файл записи не найден: {record}", param_hint="RECORD")
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="RECORD")
+    if not log.first_step <= step <= log.last_step - follow:
+        raise typer.BadParameter(f"В записи шаги {log.first_step}..{log.last_step}", param_hint="STEP / --follow")
+    keyframe = log.keyframe_for(step)
+    started = time.perf_counter()
+    casino = log.seek(step, headless=not follow)
+    elapsed = time.perf_counter() - started
+    typer.echo(f"Шаг {casino.step_count} (ключевой кадр {keyframe.step}, доиграно {step - keyframe.step} шагов "
+               f"за {elapsed * 1000:.1f} мс), время {casino.clock.now():.1f} с")
+    for player in casino.players:
+        psycho = f" психоз={player.psycho:.2f}" if hasattr(player, "psycho") else ""
+        typer.echo(f"  {type(player).__name__:<13}{player.name:<20}баланс={player.balance}{psycho}")
+    for goose in casino.geese:
+        typer.echo(f"  {type(goose).__name__:<13}{goose.name:<20}громкость={goose.honk_volume}")
+    if follow:
+        configure_logging()
+        for _ in range(follow):
+            casino.perform_step()
+
+
+@app.command()
+def run_ensemble(replicas: int = 100, steps: int = 1000, seed: int = 0, workers: int | None = None,
+                 quiet: bool = False, rng: str = "stdlib", param: list[str] | None = None):
+    """
+    Команда для запуска ансамбля независимых симуляций (Монте-Карло) в пуле процессов.
+
+    :param replicas: Количество реплик (по умолчанию 100).
+    :param steps: Количество шагов в каждой реплике (по умолчанию 1000).
+    :param seed: Базовый сид, из которого выводятся сиды реплик (по умолчанию 0).
+    :param workers: Количество процессов (по умолчанию по числу ядер).
+    :param quiet: Не печатать итоги отдельных реплик.
+    :param rng: Генератор случайных чисел в репликах: 'stdlib' или 'numpy' (по умолчанию 'stdlib').
+    :param param: Параметр казино 'имя=значение'; можно повторять (например --param suicide_chance=0.2).
+    """
+    import ensemble
+    from params import DEFAULT_PARAMS, coerce
+
+    if rng not in ("stdlib", "numpy"):
+        raise typer.BadParameter(f"Неизвестный тип генератора: {rng!r}", param_hint="--rng")
+    changes, params = {}, DEFAULT_PARAMS
+    for text in param or []:
+        name, sep, value = text.partition("=")
+        name = name.strip().replace("-", "_")
+        try:
+            if not sep or not value:
+                raise ValueError(f"Ожидалось имя=значение, получено {text!r}")
+            changes[name] = coerce(name, value)
+            params = DEFAULT_PARAMS._replace(**changes)
+            params.check()
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--param")
+    summaries = []
+    for summary in ensemble.run_ensemble(replicas, steps, seed, workers, rng, params):
+        summaries.append(summary)
+        if not quiet:
+            typer.echo(f"#{summary.index:<5} seed={summary.seed:<20} players={len(summary.final_balances):<3} "
+                       f"total={sum(summary.final_balances):<7} edge={summary.house_edge:+.3f} "
+                       f"kills={summary.kills}")
+    typer.echo(f"Реплик: {len(summaries)}, шагов в каждой: {steps}")
+    for name, (mean, low, high) in ensemble.aggregate(summaries).items():
+        typer.echo(f"{name:<22}{mean:>12.4f}   95% ДИ [{low:.4f}, {high:.4f}]")
+
+
+@app.command()
+def run_floor(tables: int = 8, steps: int = 1000, seed: int = 0, workers: int | None = None,
+              sync: str = "barrier", sync_steps: int = 1, migration: float = 0.01, quiet: bool = False,
+              rng: str = "stdlib", max_entities: int = ENTITIES_MAX_COUNT):
+    """
+    Команда для запуска игрового этажа: много столов в нескольких процессах с переходами между столами.
+
+    :param tables: Количество столов (по умолчанию 8).
+    :param steps: Количество шагов на каждом столе (по умолчанию 1000).
+    :param seed: Базовый сид, из которого выводятся сиды столов (по умолчанию 0).
+    :param workers: Количество процессов (по умолчанию по числу ядер).
+    :param sync: Синхронизация столов: 'barrier' или 'async' (по умолчанию 'barrier').
+    :param sync_steps: Шагов между барьерами в режиме 'barrier' (по умолчанию 1).
+    :param migration: Вероятность, что после шага кто-то уйдёт за другой стол (по умолчанию 0.01).
+    :param quiet: Не печатать итоги отдельных столов.
+    :param rng: Генератор случайных чисел столов: 'stdlib' или 'numpy' (по умолчанию 'stdlib').
+    :param max_entities: Максимальное количество игроков и гусей за одним столом (по умолчанию 12).
+    """
+    import floor
+
+    if rng not in ("stdlib", "numpy"):
+        raise typer.BadParameter(f"Неизвестный тип генератора: {rng!r}", param_hint="--rng")
+    try:
+        casino_floor = floor.Floor(tables, seed, workers, sync, sync_steps, migration, rng, max_entities)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    with casino_floor:
+        summaries = casino_floor.run(steps)
+    if not quiet:
+        for summary in summaries:
+            typer.echo(f"стол {summary.table:<4} players={summary.players:<3} geese={summary.geese:<3} "
+                       f"total={summary.total_balance:<7} in={summary.migrated_in:<4} out={summary.migrated_out}")
+    for name, value in floor.floor_totals(summaries).items():
+        typer.echo(f"{name:<16}{value:>10}")
+    typer.echo(f"{'turned_away':<16}{casino_floor.turned_away:>10}")
+
+
+@app.command()
+def run_agents(duration: float = 600.0, scale: float = 100.0, seed: int | None = None, population: int = 0,
+               max_entities: int = ENTITIES_MAX_COUNT, arrival_rate: float = 0.2, think_time: float = 10.0,
+               spin_interval: float = 30.0, betting_window: float = 25.0, headless: bool = False):
+    """
+    Команда для запуска асинхронного казино, где каждый игрок и гусь — отдельный агент на asyncio.
+
+    :param duration: Длительность в симулированных секундах (по умолчанию 600).
+    :param scale: Во сколько раз симулированное время быстрее реального (по умолчанию 100).
+    :param seed: Сид для генератора случайных чисел (по умолчанию None).
+    :param population: Сколько сущностей посадить за стол до старта (по умолчанию 0).
+    :param max_entities: Максимальное количество игроков и гусей (по умолчанию 12).
+    :param arrival_rate: Среднее число новых сущностей в симулированную секунду (по умолчанию 0.2).
+    :param think_time: Среднее время между действиями игрока в секундах (по умолчанию 10).
+    :param spin_interval: Интервал между вращениями колеса в секундах (по умолчанию 30).
+    :param betting_window: Сколько секунд после вращения принимаются ставки (по умолчанию 25).
+    :param headless: Запуск без логирования событий (по умолчанию False).
+    """
+    import asyncio
+    import agents
+    from config import configure_logging
+
+    if population > max_entities:
+        raise typer.BadParameter("Население больше лимита сущностей", param_hint="--population")
+    try:
+        casino = agents.AgentCasino(ChipCollection(), seed, headless=headless, max_entities=max_entities,
+                                    time_scale=scale, spin_interval=spin_interval, betting_window=betting_window,
+                                    think_time=think_time, arrival_rate=arrival_rate)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    if not headless:
+        configure_logging()
+    for _ in range(population):
+        casino.add_random_entity()
+    started = time.perf_counter()
+    asyncio.run(casino.run(duration))
+    elapsed = time.perf_counter() - started
+    latency = casino.latency
+    typer.echo(f"Агентов: {len(casino.players)} игроков, {len(casino.geese)} гусей; вращений: {casino.spins}")
+    typer.echo(f"Действий: {casino.step_count} за {elapsed:.2f} с ({casino.step_count / elapsed:,.0f} в секунду)")
+    typer.echo(f"Задержка пробуждения, мс: p50={latency.percentile(50) * 1e3:.2f} "
+               f"p95={latency.percentile(95) * 1e3:.2f} p99={latency.percentile(99) * 1e3:.2f} "
+               f"max={latency.max() * 1e3:.2f}")
+
+
+@app.command()
+def analyze(balance: int = 100, steps: int = 100, population: int = 0, warmup: int = 0, seed: int | None = None,
+            max_balance: int | None = None, max_entities: int = ENTITIES_MAX_COUNT):
+    """
+    Команда для точного расчёта будущего баланса игрока цепью Маркова, без выборки случайных исходов.
+
+    :param balance: Начальный баланс отслеживаемого игрока (по умолчанию 100).
+    :param steps: Через сколько шагов оценить баланс (по умолчанию 100).
+    :param population: Сколько случайных сущностей посадить в казино до расчёта (по умолчанию 0).
+    :param warmup: Сколько шагов симуляции выполнить перед расчётом (по умолчанию 0).
+    :param seed: Сид для генератора случайных чисел (по умолчанию None).
+    :param max_balance: Верхняя граница баланса в модели (по умолчанию max(2000, 10 × balance)).
+    :param max_entities: Максимальное количество игроков и гусей (по умолчанию 12).
+    """
+    from casino import Casino
+    from player import Player
+
+    try:
+        import analytic
+    except ImportError:
+        raise typer.BadParameter("Для расчёта нужен numpy: pip install -e .[fast]")
+    if population >= max_entities:
+        raise typer.BadParameter("Население не оставляет места отслеживаемому игроку", param_hint="--population")
+    casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True, max_entities=max_entities)
+    for _ in range(population):
+        casino.add_random_entity()
+    for _ in range(warmup):
+        casino.perform_step()
+    player = Player("Наблюдаемый", balance)
+    casino.add_player(player)
+    try:
+        model = analytic.BalanceModel(casino, player, max_balance)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--max-balance")
+    forecast = model.forecast(steps)
+    typer.echo(f"Казино: {len(casino.players) - 1} других игроков, {len(casino.geese)} гусей; "
+               f"состояний модели: {model.max_balance + 2}")
+    typer.echo(f"Средний баланс через {steps} шагов: {forecast.mean_balance:.2f} (старт {balance})")
+    typer.echo(f"Вероятность разорения: {forecast.ruin_probability:.4f}")
+    typer.echo(f"Вероятность гибели от психопата: {forecast.killed_probability:.4f}")
+    typer.echo(f"Вероятность выйти за max_balance: {forecast.overflow_probability:.4f}")
+    typer.echo(f"Ожидаемый доход казино с открытых ставок: {analytic.expected_house_take(casino):.2f}")
+
+
+@app.command()
+def sweep(grid: list[str] | None = None, random: list[str] | None = None, samples: int = 20, replicas: int = 10,
+          steps: int = 1000, seed: int = 0, workers: int | None = None, cache: str = ".sweep-cache",
+          no_cache: bool = False, rng: str = "stdlib", sort: str = "house_edge"):
+    """
+    Команда для перебора параметров казино: в каждой точке прогоняется ансамбль реплик, итоги кэшируются на диске.
+
+    :param grid: Ось полного перебора 'имя=v1,v2,...'; можно повторять (например --grid suicide_chance=0.2,0.6).
+    :param random: Ось случайного поиска 'имя=low:high' или 'имя=v1,v2,...'; можно повторять.
+    :param samples: Количество точек случайного поиска (по умолчанию 20).
+    :param replicas: Количество реплик в каждой точке (по умолчанию 10).
+    :param steps: Количество шагов в каждой реплике (по умолчанию 1000).
+    :param seed: Базовый сид реплик и случайного поиска (по умолчанию 0).
+    :param workers: Количество процессов (по умолчанию по числу ядер).
+    :param cache: Каталог кэша итогов реплик (по умолчанию .sweep-cache).
+    :param no_cache: Не читать и не записывать кэш.
+    :param rng: Генератор случайных чисел в репликах: 'stdlib' или 'numpy' (по умолчанию 'stdlib').
+    :param sort: Метрика, по возрастанию которой упорядочить точки (по умолчанию house_edge).
+    """
+    import sweep as sweeps
+    from ensemble import aggregate
+
+    if rng not in ("stdlib", "numpy"):
+        raise typer.BadParameter(f"Неизвестный тип генератора: {rng!r}", param_hint="--rng")
+    if grid and random:
+        raise typer.BadParameter("Задайте либо --grid, либо --random", param_hint="--grid")
+    if sort not in aggregate([]):
+        raise typer.BadParameter(f"Неизвестная метрика: {sort!r}", param_hint="--sort")
+    try:
+        if random:
+            space = dict(sweeps.parse_axis(text, ranges=True) for text in random)
+            points = sweeps.random_search(space, samples, seed)
+        else:
+            points = sweeps.grid(**dict(sweeps.parse_axis(text) for text in grid or []))
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--random" if random else "--grid")
+
+    store = None if no_cache else sweeps.SweepCache(cache)
+    results = sweeps.run_sweep(points, steps, replicas, seed, workers, store, rng)
+    for result in sorted(results, key=lambda r: r.metrics[sort].mean):
+        changes = " ".join(f"{name}={value}" for name, value in result.params.changes().items()) or "по умолчанию"
+        typer.echo(changes)
+        for name, (mean, low, high) in result.metrics.items():
+            typer.echo(f"  {name:<22}{mean:>12.4f}   95% ДИ [{low:.4f}, {high:.4f}]")
+    total = len(points) * replicas
+    cached = sum(result.cached for result in results)
+    typer.echo(f"Точек: {len(points)}, реплик в точке: {replicas}, взято из кэша: {cached} из {total}")
 
 
 @app.command()
@@ -0,0 +1,282 @@
+import json
+import os
+import socketserver
+import stat
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Iterator, NamedTuple
+
+from casino import Casino
+from events import Event, EventKind
+from player import PlayerCollection
+
+# Верхние границы корзин распределения уровней психоза
+PSYCHO_BUCKETS = (0.2, 0.4, 0.6, 0.8, 1.0)
+BALANCE_QUANTILES = (0.5, 0.9, 0.99)
+SECONDS_PER_HOUR = 3600.0
+
+
+class MetricsSink:
+    """
+    Приёмник событий со счётчиками по типам событий для живых метрик.
+
+    Пишет в счётчики только поток симуляции, без блокировок: в обработчике один инкремент элемента списка.
+    Поток, отдающий метрики, только читает их и может увидеть значение на одно событие старее.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (max(EventKind) + 1)
+
+    def __call__(self, event: Event) -> None:
+        self.counts[event.kind] += 1
+
+
+class Sample(NamedTuple):
+    """Показания счётчиков в момент опроса: реальное время, шаг, время симуляции и счётчики событий."""
+    wall: float
+    step: int
+    time: float
+    counts: tuple[int, ...]
+
+
+def quantile(values: list[int], q: float) -> int:
+    """
+    Квантиль отсортированного списка методом ближайшего ранга.
+
+    :param values: Отсортированные значения (не пустые).
+    :param q: Уровень от 0 до 1.
+    """
+    return values[min(len(values) - 1, max(0, int(q * len(values) + 0.5) - 1))]
+
+
+class LiveMetrics:
+    """
+    Скользящие метрики работающего казино: скорость шагов, частоты событий, состав, балансы, ставки,
+    распределение психоза и убийства в час.
+
+    Симуляция только увеличивает счётчики MetricsSink и ничего не ждёт; collect() вызывается из другого
+    потока и читает состояние казино, копируя коллекции целиком (копирование значений словаря или списка
+    не прерывается переключением потоков), так что сортировка балансов и гистограммы считаются вне потока
+    симуляции. Частоты считаются по разности с самым старым опросом в пределах окна window реальных секунд.
+    """
+
+    def __init__(self, casino: Casino, window: float = 60.0):
+        if not isinstance(casino.players, PlayerCollection):
+            raise TypeError(f"Живые метрики поддерживают только Casino, а не {type(casino).__name__}")
+        if window <= 0:
+            raise ValueError(f"Окно метрик должно быть положительным: {window}")
+        self.casino = casino
+        self.window = window
+        self.sink = MetricsSink()
+        self._samples: deque[Sample] = deque([self._sample()])
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"LiveMetrics(step={self.casino.step_count}, window={self.window})"
+
+    def attach(self) -> None:
+        """Подключает счётчики к казино."""
+        self.casino.attach_sink(self.sink)
+
+    def detach(self) -> None:
+        """Отключает счётчики от казино."""
+        self.casino.detach_sink(self.sink)
+
+    def _sample(self) -> Sample:
+        return Sample(perf_counter(), self.casino.step_count, self.casino.clock.now(), tuple(self.sink.counts))
+
+    def _rates(self, now: Sample) -> tuple[Sample, float, float]:
+        # Блокировка только между потоками опроса; симуляцию она не задерживает
+        with self._lock:
+            samples = self._samples
+            while len(samples) > 1 and now.wall - samples[1].wall >= self.window:
+                samples.popleft()
+            oldest = samples[0]
+            samples.append(now)
+        return oldest, now.wall - oldest.wall, now.time - oldest.time
+
+    def collect(self) -> dict:
+        """
+        Снимает текущие метрики.
+
+        :return: Словарь из простых значений (пригоден для JSON).
+        """
+        casino = self.casino
+        now = self._sample()
+        oldest, wall, sim_time = self._rates(now)
+        players = list(casino.players)
+        geese = list(casino.geese)
+
+        balances = sorted(player.balance for player in players)
+        levels = [player.psycho for player in players if hasattr(player, "psycho")]
+        population = Counter(type(entity).__name__ for entity in players + geese)
+        events = {kind.name: now.counts[kind] for kind in EventKind}
+        kills = now.counts[EventKind.KILL] - oldest.counts[EventKind.KILL]
+        return {
+            "steps": now.step,
+            "sim_time": now.time,
+            "steps_per_second": (now.step - oldest.step) / wall if wall > 0 else 0.0,
+            "events": events,
+            "event_rates": {kind.name: (now.counts[kind] - oldest.counts[kind]) / wall if wall > 0 else 0.0
+                            for kind in EventKind},
+            "population": dict(sorted(population.items())),
+            "balance": {
+                "players": len(balances),
+                "total": sum(balances),
+                "mean": sum(balances) / len(balances) if balances else 0.0,
+                "quantiles": {str(q): quantile(balances, q) if balances else 0 for q in BALANCE_QUANTILES},
+            },
+            "open_bets": len(casino.bets),
+            "psycho": {
+                "count": len(levels),
+                "max": max(levels, default=0.0),
+                "buckets": {str(bound): sum(1 for level in levels if level <= bound) for bound in PSYCHO_BUCKETS},
+            },
+            "kills_per_hour": kills / sim_time * SECONDS_PER_HOUR if sim_time > 0 else 0.0,
+        }
+
+
+def render_prometheus(metrics: dict) -> str:
+    """
+    Записывает метрики в текстовом формате Prometheus.
+
+    :param metrics: Результат LiveMetrics.collect().
+    """
+    lines = [
+        "# TYPE casino_steps_total counter",
+        f"casino_steps_total {metrics['steps']}",
+        "# TYPE casino_sim_time_seconds gauge",
+        f"casino_sim_time_seconds {metrics['sim_time']}",
+        "# TYPE casino_steps_per_second gauge",
+        f"casino_steps_per_second {metrics['steps_per_second']}",
+        "# TYPE casino_events_total counter",
+    ]
+    lines += [f'casino_events_total{{kind="{kind}"}} {count}' for kind, count in metrics["events"].items()]
+    lines.append("# TYPE casino_event_rate gauge")
+    lines += [f'casino_event_rate{{kind="{kind}"}} {rate}' for kind, rate in metrics["event_rates"].items()]
+    lines.append("# TYPE casino_population gauge")
+    lines += [f'casino_population{{class="{name}"}} {count}' for name, count in metrics["population"].items()]
+    balance = metrics["balance"]
+    lines += ["# TYPE casino_balance summary"]
+    lines += [f'casino_balance{{quantile="{q}"}} {value}' for q, value in balance["quantiles"].items()]
+    lines += [f"casino_balance_sum {balance['total']}",
+              f"casino_balance_count {balance['players']}",
+              "# TYPE casino_open_bets gauge",
+              f"casino_open_bets {metrics['open_bets']}"]
+    psycho = metrics["psycho"]
+    lines.append("# TYPE casino_psycho_level histogram")
+    lines += [f'casino_psycho_level_bucket{{le="{bound}"}} {count}' for bound, count in psycho["buckets"].items()]
+    lines += [f'casino_psycho_level_bucket{{le="+Inf"}} {psycho["count"]}',
+              f"casino_psycho_level_count {psycho['count']}",
+              "# TYPE casino_psycho_level_max gauge",
+              f"casino_psycho_level_max {psycho['max']}",
+              "# TYPE casino_kills_per_hour gauge",
+              f"casino_kills_per_hour {metrics['kills_per_hour']}"]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт /metrics в формате Prometheus и /metrics.json в JSON."""
+
+    def do_GET(self) -> None:
+        metrics = self.server.metrics
+        if self.path == "/metrics":
+            body, content_type = render_prometheus(metrics.collect()).encode(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(metrics.collect(), ensure_ascii=False).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # У клиентов Unix-сокета нет адреса
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """
+    HTTP-сервер живых метрик в фоновом потоке.
+
+    Слушает TCP-адрес (host, port) — порт 0 выбирается системой — или путь Unix-сокета.
+    Опросы обслуживаются в своих потоках и не останавливают симуляцию.
+    """
+
+    def __init__(self, metrics: LiveMetrics, address: tuple[str, int] | str = ("127.0.0.1", 0)):
+        self.metrics = metrics
+        self.address = address
+        self._server = None
+        self._thread = None
+
+    def __repr__(self):
+        return f"MetricsServer({self.url if self._server is not None else self.address!r})"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Адрес страницы метрик (для Unix-сокета — unix:путь)."""
+        if isinstance(self.address, str):
+            return f"unix:{self.address}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> None:
+        """Запускает сервер и подключает счётчики к казино."""
+        if self._server is not None:
+            return
+        if isinstance(self.address, str):
+            if os.path.exists(self.address) and stat.S_ISSOCK(os.stat(self.address).st_mode):
+                # Сокет, оставшийся от прошлого прогона
+                os.unlink(self.address)
+            self._server = _UnixHTTPServer(self.address, MetricsHandler)
+        else:
+            self._server = ThreadingHTTPServer(self.address, MetricsHandler)
+        self._server.metrics = self.metrics
+        self.metrics.attach()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает сервер и отключает счётчики."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self.metrics.detach()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self._server = self._thread = None
+
+
+@contextmanager
+def serve_metrics(casino: Casino, address: tuple[str, int] | str, window: float = 60.0) -> Iterator[MetricsServer]:
+    """
+    Публикует живые метрики казино, пока открыт контекст.
+
+    :param casino: Казино.
+    :param address: (host, port) или путь Unix-сокета.
+    :param window: Окно скользящих частот в реальных секундах.
+    """
+    with MetricsServer(LiveMetrics(casino, window), address) as server:
+        yield server
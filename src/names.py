@@ -0,0 +1,92 @@
+import sys
+from typing import Callable, Iterable, Iterator
+
+from rng import RandomSource
+
+PLAYER_NAMES = ("Александр", "Дмитрий", "Иван", "Сергей", "Андрей", "Владимир", "Максим", "Артем", "Николай",
+                "Павел", "Хуан", "Карлос", "Марко", "Джованни", "Джеймс", "Уильям", "Михаэль", "Томас", "Жан", "Пьер")
+GOOSE_NAMES = ("Сигма", "Крутой", "Проказник", "Воришка", "Шутник", "Гусь-Гусь", "Кряк", "Пух", "Дональд", "Гусьня",
+               "Шалун", "Ворюга", "Крикун", "Богатый", "Орёл", "Злодей", "Милый", "Хитрый", "Голодный", "Счастливчик")
+
+
+class NamePool:
+    """
+    Неисчерпаемый пул свободных имён.
+
+    Сначала выдаются базовые имена. Когда свободных не осталось, пул лениво
+    пополняется следующим поколением: «Иван 2», «Иван 3» и т.д. Выдача и возврат
+    имени стоят O(1): свободные имена лежат в списке, а их позиции — в словаре,
+    поэтому имя удаляется перестановкой с последним. Имена интернируются.
+
+    Имя может оказаться занятым в обход пула (пришедший с другого стола, восстановленный из снимка).
+    Проверка in_use владельца пула не даёт вернуть в пул такое имя ни при возврате, ни при пополнении.
+    """
+
+    def __init__(self, base_names: Iterable[str], free: Iterable[str] | None = None, generation: int = 1,
+                 in_use: Callable[[str], bool] | None = None):
+        self.base_names = tuple(base_names)
+        if not self.base_names:
+            raise ValueError("Нужно хотя бы одно базовое имя")
+        self.generation = generation
+        self.in_use = None
+        self._free: list[str] = []
+        self._positions: dict[str, int] = {}
+        for name in self.base_names if free is None else free:
+            self.release(name)
+        # Начальные свободные имена заданы явно, проверка подключается после них
+        self.in_use = in_use
+
+    def __len__(self):
+        return len(self._free)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._free)
+
+    def __getitem__(self, index):
+        return self._free[index]
+
+    def __contains__(self, name) -> bool:
+        return name in self._positions
+
+    def __repr__(self):
+        return f"NamePool(free={len(self._free)}, generation={self.generation})"
+
+    def take(self, rng: RandomSource) -> str:
+        """
+        Выдаёт случайное свободное имя и помечает его занятым.
+
+        :param rng: Генератор случайных чисел.
+        :return: Имя, которого сейчас нет среди занятых.
+        """
+        if not self._free:
+            self._grow()
+        name = rng.choice(self._free)
+        self.remove(name)
+        return name
+
+    def remove(self, name: str) -> None:
+        """
+        Помечает имя занятым.
+
+        :param name: Свободное имя.
+        """
+        position = self._positions.pop(name)
+        last = self._free.pop()
+        if last != name:
+            self._free[position] = last
+            self._positions[last] = position
+
+    def release(self, name: str) -> None:
+        """
+        Возвращает имя в пул (например, когда сущность покинула казино).
+
+        :param name: Освободившееся имя (если его всё ещё носит кто-то другой, оно остаётся занятым).
+        """
+        if name not in self._positions and not (self.in_use is not None and self.in_use(name)):
+            self._positions[name] = len(self._free)
+            self._free.append(sys.intern(name))
+
+    def _grow(self) -> None:
+        self.generation += 1
+        for name in self.base_names:
+            self.release(f"{name} {self.generation}")
@@ -0,0 +1,83 @@
+import hashlib
+import json
+from typing import NamedTuple
+
+
+class CasinoParams(NamedTuple):
+    """
+    Настраиваемые параметры поведения казино. Значения по умолчанию воспроизводят исходную симуляцию.
+
+    Веса событий (Casino.event_weights_for):
+      bet_weight_power    — степень доли игроков с открытыми ставками в весе вращения колеса;
+      goose_balance_scale — делитель среднего баланса в весе событий гусей;
+      goose_weight_power  — степень в весе событий гусей.
+    Новые игроки (Casino.add_random_entity):
+      balance_values, balance_weights — стартовые балансы и их веса;
+      player_class_weights            — веса обычного игрока и психопата.
+    Ставки (Casino.place_player_bet):
+      bet_weights — веса ставок на красное, чёрное и зеро.
+    Психопаты (Casino.kill_player, PsychoPlayer.update_psycho):
+      suicide_chance  — вероятность, что сорвавшийся психопат убивает себя, а не другого;
+      psycho_growth   — множитель роста психоза от доли проигранных денег;
+      psycho_exponent — степень, в которую возводится уровень психоза после проигрыша.
+    """
+    bet_weight_power: float = 0.5
+    goose_balance_scale: float = 300.0
+    goose_weight_power: float = 0.5
+    balance_values: tuple[int, ...] = (50, 100, 150, 200, 300, 500)
+    balance_weights: tuple[float, ...] = (0.3, 0.25, 0.15, 0.15, 0.1, 0.05)
+    player_class_weights: tuple[float, float] = (0.55, 0.45)
+    bet_weights: tuple[float, float, float] = (0.47, 0.48, 0.05)
+    suicide_chance: float = 0.4
+    psycho_growth: float = 0.02
+    psycho_exponent: float = 0.8
+
+    def check(self) -> None:
+        """Проверяет параметры; при ошибке поднимает ValueError."""
+        for name in ("bet_weight_power", "goose_balance_scale", "goose_weight_power", "psycho_exponent"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"Параметр {name} должен быть положительным: {getattr(self, name)}")
+        if len(self.balance_values) != len(self.balance_weights) or not self.balance_values:
+            raise ValueError("Количество стартовых балансов не совпадает с количеством весов")
+        if any(value <= 0 for value in self.balance_values):
+            raise ValueError(f"Стартовые балансы должны быть положительными: {self.balance_values}")
+        for name, size in (("balance_weights", len(self.balance_values)), ("player_class_weights", 2),
+                           ("bet_weights", 3)):
+            weights = getattr(self, name)
+            if len(weights) != size or any(w < 0 for w in weights) or sum(weights) <= 0:
+                raise ValueError(f"Параметр {name} должен содержать {size} неотрицательных весов "
+                                 f"с положительной суммой: {weights}")
+        if not 0.0 <= self.suicide_chance <= 1.0:
+            raise ValueError(f"Вероятность самоубийства должна быть в [0, 1]: {self.suicide_chance}")
+        if self.psycho_growth < 0:
+            raise ValueError(f"Рост психоза не может быть отрицательным: {self.psycho_growth}")
+
+    def digest(self) -> str:
+        """Устойчивый хеш значений параметров (sha256 от JSON с отсортированными ключами)."""
+        return hashlib.sha256(json.dumps(self._asdict(), sort_keys=True).encode()).hexdigest()
+
+    def changes(self, base: "CasinoParams | None" = None) -> dict:
+        """Параметры, которые отличаются от base (по умолчанию — от DEFAULT_PARAMS)."""
+        base = DEFAULT_PARAMS if base is None else base
+        return {name: value for name, value in self._asdict().items() if getattr(base, name) != value}
+
+
+DEFAULT_PARAMS = CasinoParams()
+
+
+def coerce(name: str, value):
+    """
+    Приводит значение к типу поля CasinoParams (числа из строк CLI, списки в кортежи).
+
+    :param name: Имя поля.
+    :param value: Значение, например '0.3', 250 или '0.5/0.4/0.1' для весов.
+    :return: Значение нужного типа.
+    """
+    if name not in CasinoParams._fields:
+        raise ValueError(f"Неизвестный параметр казино: {name!r}")
+    default = getattr(DEFAULT_PARAMS, name)
+    if isinstance(default, tuple):
+        items = value.split("/") if isinstance(value, str) else value
+        kind = type(default[0])
+        return tuple(kind(float(item)) if kind is int else float(item) for item in items)
+    return float(value)
@@ -1,11 +1,43 @@
+import heapq
 import logging
 import random
+from collections import Counter
+
+from chip import ChipRack
+from params import DEFAULT_PARAMS
 
 
 class Player:
+    # Без __dict__ у каждого экземпляра: на миллионе игроков это основная часть памяти
+    __slots__ = ("name", "_balance", "id", "_collection", "chips")
+
     def __init__(self, name: str, balance: int):
+        if balance < 0:
+            raise ValueError(f"Баланс не может быть отрицательным: {balance}")
         self.name = name
-        self.balance = balance
+        self._balance = balance
+        # Целочисленный идентификатор, который выдаёт PlayerCollection при добавлении
+        self.id: int | None = None
+        # Коллекция, которой игрок сообщает об изменении баланса
+        self._collection: "PlayerCollection | None" = None
+        # Фишки игрока по номиналам кассы коллекции (None, пока казино не ведёт фишки)
+        self.chips: list[int] | None = None
+
+    @property
+    def balance(self) -> int:
+        return self._balance
+
+    @balance.setter
+    def balance(self, value: int) -> None:
+        # Одно правило с фишками и без: баланс не уходит в минус, ошибка — до любых изменений
+        if value < 0:
+            raise ValueError(f"Баланс игрока {self.name} не может быть отрицательным: {value}")
+        collection = self._collection
+        if collection is not None:
+            if collection.chip_rack is not None:
+                collection.chip_rack.settle(self.chips, self._balance, value)
+            collection.total_balance += value - self._balance
+        self._balance = value
 
     def __repr__(self):
         return f"Player(name={self.name}, balance={self.balance})"
@@ -25,9 +57,21 @@ class Player:
 
 
 class PsychoPlayer(Player):
+    __slots__ = ("_psycho",)
+
     def __init__(self, name: str, balance: int):
         super().__init__(name, balance)
-        self.psycho = 0.0
+        self._psycho = 0.0
+
+    @property
+    def psycho(self) -> float:
+        return self._psycho
+
+    @psycho.setter
+    def psycho(self, value: float) -> None:
+        self._psycho = value
+        if self._collection is not None:
+            self._collection.psycho_index.update(self)
 
     def update_psycho(self, money: int) -> None:
         """
@@ -38,36 +82,191 @@ class PsychoPlayer(Player):
         if money > 0:
             self.psycho = max(0.0, self.psycho - float(money) / (self.balance + money))
         else:
-            self.psycho = min(1.0, (self.psycho + 0.02 * float(-money) / (self.balance - money)) ** 0.8)
+            # Константы роста задаёт казино через коллекцию (CasinoParams)
+            collection = self._collection if self._collection is not None else PlayerCollection
+            total = self.balance - money
+            growth = collection.psycho_growth * float(-money) / total if total else 0.0
+            self.psycho = min(1.0, (self.psycho + growth) ** collection.psycho_exponent)
         # logging.getLogger().debug("New psycho level for %s: %.2f", self.name, self.psycho)
 
 
+class PsychoIndex:
+    """
+    Индекс уровней психоза: max-куча с ленивым удалением устаревших записей.
+
+    Проверка «есть ли психопат выше порога» стоит O(1) амортизированно, обновление
+    уровня — O(log n). Сам сорвавшийся психопат (первый по порядку прихода) ищется
+    только когда максимум действительно выше порога.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int]] = []
+        self._levels: dict[int, float] = {}
+        self._players: dict[int, PsychoPlayer] = {}
+
+    def __len__(self):
+        return len(self._players)
+
+    def add(self, player: PsychoPlayer) -> None:
+        self._players[player.id] = player
+        self._push(player)
+
+    def remove(self, player: PsychoPlayer) -> None:
+        if self._players.pop(player.id, None) is not None:
+            del self._levels[player.id]
+
+    def update(self, player: PsychoPlayer) -> None:
+        if self._players.get(player.id) is player:
+            self._push(player)
+
+    def _push(self, player: PsychoPlayer) -> None:
+        self._levels[player.id] = player.psycho
+        heapq.heappush(self._heap, (-player.psycho, player.id))
+        if len(self._heap) > 2 * len(self._levels) + 16:
+            self._heap = [(-level, player_id) for player_id, level in self._levels.items()]
+            heapq.heapify(self._heap)
+
+    def max_level(self) -> float:
+        """Возвращает максимальный уровень психоза (0.0, если психопатов нет)."""
+        heap, levels = self._heap, self._levels
+        while heap:
+            level, player_id = heap[0]
+            if levels.get(player_id) == -level:
+                return -level
+            heapq.heappop(heap)
+        return 0.0
+
+    def first_above(self, threshold: float) -> "PsychoPlayer | None":
+        """
+        Возвращает первого по порядку прихода психопата с уровнем выше порога.
+
+        :param threshold: Порог психоза.
+        :return: Психопат или None.
+        """
+        if self.max_level() <= threshold:
+            return None
+        # Порядок прихода совпадает с порядком идентификаторов коллекции
+        return min((p for p in self._players.values() if p.psycho > threshold), key=lambda p: p.id)
+
+
 class PlayerCollection:
+    """
+    Коллекция игроков с индексом по имени и стабильными целочисленными идентификаторами.
+
+    Игроки хранятся в словаре id -> Player, который сохраняет порядок добавления,
+    поэтому поиск по id и имени, добавление и удаление выполняются за O(1).
+    Доступ по позиции (players[0], срезы) поддерживается, но работает за O(n).
+    """
+
+    # Константы роста психоза (PsychoPlayer.update_psycho); казино переопределяет их из CasinoParams
+    psycho_growth = DEFAULT_PARAMS.psycho_growth
+    psycho_exponent = DEFAULT_PARAMS.psycho_exponent
+
     def __init__(self):
-        self._players = []
+        self._players: dict[int, Player] = {}
+        # Имя -> идентификаторы тёзок в порядке коллекции; поиск по имени отдаёт первого, как линейный перебор
+        self._by_name: dict[str, list[int]] = {}
+        self._next_id = 0
+        # Агрегаты, которые поддерживаются при каждом изменении состава и балансов
+        self.total_balance = 0
+        self._class_counts: Counter = Counter()
+        self.psycho_index = PsychoIndex()
+        # Касса, через которую балансы игроков рассчитываются фишками (назначает казино)
+        self.chip_rack: ChipRack | None = None
 
     def __getitem__(self, index):
         if isinstance(index, str):
             return self.get_player_by_name(index)
-        return self._players[index]
+        if index == 0 and self._players:
+            return next(iter(self._players.values()))
+        return list(self._players.values())[index]
 
     def __setitem__(self, index, value):
-        self._players[index] = value
+        old = list(self._players.values())[index]
+        self._unindex_name(old)
+        self._untrack(old)
+        value.id = old.id
+        self._players[old.id] = value
+        # Новый игрок встаёт на место старого, поэтому порядок тёзок пересчитывается по коллекции
+        self._by_name[value.name] = [pid for pid, p in self._players.items() if p.name == value.name]
+        self._track(value)
 
     def __delitem__(self, index):
-        del self._players[index]
+        self.remove(list(self._players.values())[index])
 
     def __len__(self):
         return len(self._players)
 
+    def __iter__(self):
+        return iter(self._players.values())
+
     def __repr__(self):
-        return f"PlayerCollection({self._players})"
+        return f"PlayerCollection({list(self._players.values())})"
 
-    def append(self, player: Player) -> None:
-        self._players.append(player)
+    def append(self, player: Player, player_id: int | None = None) -> None:
+        if player_id is None:
+            player_id = self._next_id
+        player.id = player_id
+        self._next_id = max(self._next_id, player_id + 1)
+        self._players[player.id] = player
+        self._by_name.setdefault(player.name, []).append(player.id)
+        self._track(player)
 
     def remove(self, player: Player) -> None:
-        self._players.remove(player)
+        if self._players.get(player.id) is not player:
+            # Объект не из этой коллекции: как list.remove, ищем равного игрока
+            player = next((p for p in self._players.values() if p == player), None)
+            if player is None:
+                raise ValueError("PlayerCollection.remove(x): x not in collection")
+        del self._players[player.id]
+        self._unindex_name(player)
+        self._untrack(player)
+
+    def _track(self, player: Player) -> None:
+        if self.chip_rack is not None and player.chips is None:
+            # Новый игрок покупает фишки на весь баланс
+            player.chips = self.chip_rack.change(player.balance)
+            self.chip_rack.withdraw(player.balance)
+        player._collection = self
+        self.total_balance += player.balance
+        self._class_counts[type(player)] += 1
+        if isinstance(player, PsychoPlayer):
+            self.psycho_index.add(player)
+
+    def _untrack(self, player: Player) -> None:
+        if self.chip_rack is not None and player.chips is not None:
+            # Уходящий игрок сдаёт фишки в кассу
+            self.chip_rack.cash_in(player.chips)
+            player.chips = None
+        player._collection = None
+        self.total_balance -= player.balance
+        self._class_counts[type(player)] -= 1
+        if isinstance(player, PsychoPlayer):
+            self.psycho_index.remove(player)
+
+    def count_of(self, cls: type) -> int:
+        """
+        Возвращает количество игроков указанного класса (включая подклассы) за O(число классов).
+
+        :param cls: Класс игрока, например PsychoPlayer.
+        """
+        return sum(count for player_class, count in self._class_counts.items() if issubclass(player_class, cls))
+
+    def _unindex_name(self, player: Player) -> None:
+        ids = self._by_name.get(player.name)
+        if ids is not None and player.id in ids:
+            ids.remove(player.id)
+            if not ids:
+                del self._by_name[player.name]
+
+    def get_player_by_id(self, player_id: int) -> Player | None:
+        """
+        Возвращает игрока по идентификатору.
+
+        :param player_id: Идентификатор, выданный при добавлении.
+        :return: Объект Player или None, если игрок не найден.
+        """
+        return self._players.get(player_id)
 
     def get_player_by_name(self, name: str) -> Player | None:
         """
@@ -76,7 +275,7 @@ class PlayerCollection:
         :param name: Имя игрока для поиска.
         :return: Объект Player или None, если игрок не найден.
         """
-        for player in self._players:
-            if player.name == name:
-                return player
-        return None
+        ids = self._by_name.get(name)
+        if not ids:
+            return None
+        return self._players[ids[0]]
@@ -0,0 +1,160 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator
+
+from casino import Casino
+from events import LoggingSink
+
+# Границы корзин гистограммы: до 1 мкс, до 2 мкс, до 4 мкс, ... (степени двойки)
+HISTOGRAM_BUCKETS = 32
+STEP_METHODS = {"perform_step": "step", "evualuate_weights": "weights", "find_killer": "psycho_check",
+                "kill_player": "psycho_kill"}
+
+
+class EventProfile:
+    """Количество вызовов, суммарное время и гистограмма задержек одного типа событий."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def __repr__(self):
+        return f"EventProfile({self.name!r}, count={self.count}, total={self.total:.6f}s)"
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[min(HISTOGRAM_BUCKETS - 1, int(seconds * 1e6).bit_length())] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Оценивает q-й процентиль задержки по гистограмме (верхняя граница корзины, не больше максимума).
+
+        :param q: Процентиль от 0 до 100.
+        :return: Задержка в секундах.
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return min(self.max, (1 << bucket) / 1e6)
+        return self.max
+
+
+class Profiler:
+    """
+    Необязательный слой замеров для казино.
+
+    attach подменяет методы и обработчики событий конкретного экземпляра казино
+    обёртками с таймером, detach возвращает исходные. Пока профилировщик не подключён,
+    код шага не меняется и не платит за замеры ничего.
+
+    Замеряются: шаг целиком ('step'), каждое событие шага (ключи Casino.events),
+    проверка и срыв психопата ('psycho_check', 'psycho_kill'), расчёт весов ('weights')
+    и приёмники событий: логирование ('logging') и остальные ('sink:<класс>').
+    Время события включает время приёмников, вызванных внутри него.
+    """
+
+    def __init__(self):
+        self.profiles: dict[str, EventProfile] = {}
+
+    def __repr__(self):
+        return f"Profiler({list(self.profiles)})"
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Добавляет замер.
+
+        :param name: Тип события.
+        :param seconds: Длительность в секундах.
+        """
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = EventProfile(name)
+        profile.add(seconds)
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """
+        Оборачивает функцию так, чтобы каждый вызов записывался под именем name.
+
+        :param name: Тип события.
+        :param func: Исходная функция.
+        """
+        record = self.record
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - start)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def attach(self, casino: Casino) -> None:
+        """
+        Подключает замеры к казино. Приёмники, подключённые позже, не замеряются.
+
+        :param casino: Казино.
+        """
+        for method, name in STEP_METHODS.items():
+            setattr(casino, method, self.timed(name, getattr(casino, method)))
+        for event, handler in casino.events.items():
+            casino.events[event] = self.timed(event, handler)
+        casino.sinks[:] = [self.timed("logging" if isinstance(sink, LoggingSink) else f"sink:{type(sink).__name__}",
+                                      sink)
+                           for sink in casino.sinks]
+
+    def detach(self, casino: Casino) -> None:
+        """
+        Отключает замеры, возвращая казино исходные методы.
+
+        :param casino: Казино.
+        """
+        for method in STEP_METHODS:
+            casino.__dict__.pop(method, None)
+        for event, handler in casino.events.items():
+            casino.events[event] = getattr(handler, "__wrapped__", handler)
+        casino.sinks[:] = [getattr(sink, "__wrapped__", sink) for sink in casino.sinks]
+
+    def report(self) -> str:
+        """
+        Возвращает таблицу замеров, отсортированную по суммарному времени.
+
+        :return: Текст таблицы (время в микросекундах).
+        """
+        lines = [f"{'событие':<22}{'вызовов':>10}{'всего, мс':>12}{'среднее':>10}{'p50':>9}{'p99':>9}{'max':>10}"]
+        for profile in sorted(self.profiles.values(), key=lambda p: p.total, reverse=True):
+            lines.append(f"{profile.name:<22}{profile.count:>10}{profile.total * 1e3:>12.2f}"
+                         f"{profile.mean * 1e6:>10.1f}{profile.percentile(50) * 1e6:>9.1f}"
+                         f"{profile.percentile(99) * 1e6:>9.1f}{profile.max * 1e6:>10.1f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(casino: Casino, profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """
+    Замеряет казино внутри блока with.
+
+    :param casino: Казино.
+    :param profiler: Профилировщик, в который копить замеры (по умолчанию новый).
+    """
+    profiler = profiler if profiler is not None else Profiler()
+    profiler.attach(casino)
+    try:
+        yield profiler
+    finally:
+        profiler.detach(casino)
@@ -0,0 +1,293 @@
+import os
+import pickle
+import zlib
+from array import array
+from bisect import bisect_right
+from typing import Any, NamedTuple, Sequence
+
+from casino import Casino
+from clock import Clock
+from events import LoggingSink
+from snapshot import capture, restore
+
+MAGIC = b"CSRP\x01\x00\x00\x00"
+
+
+class DecisionRecorder:
+    """
+    Генератор для казино, который берёт значения у настоящего генератора и записывает каждое решение.
+
+    Решения хранятся в двух потоках: равномерные числа random() (проверка срыва психопата, выбор события,
+    выборки из распределений) и целые — суммы randint (ставки, кражи, номер на колесе) и номера
+    выбранных элементов choice/choices (игроки, гуси, имена). Выбор делается через source.choice(range(n)),
+    поэтому генератор расходуется так же, как без записи, и прогон не меняется.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.floats = array("d")
+        self.ints = array("q")
+
+    def __repr__(self):
+        return f"DecisionRecorder({self.source!r}, floats={len(self.floats)}, ints={len(self.ints)})"
+
+    def random(self) -> float:
+        value = self.source.random()
+        self.floats.append(value)
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        value = self.source.randint(a, b)
+        self.ints.append(value)
+        return value
+
+    def choice(self, seq: Sequence) -> Any:
+        index = self.source.choice(range(len(seq)))
+        self.ints.append(index)
+        return seq[index]
+
+    def choices(self, population: Sequence, weights: Sequence[float] | None = None, *, k: int = 1) -> list:
+        indices = self.source.choices(range(len(population)), weights, k=k)
+        self.ints.extend(indices)
+        return [population[i] for i in indices]
+
+    def getstate(self):
+        return self.source.getstate()
+
+    def setstate(self, state) -> None:
+        self.source.setstate(state)
+
+    def position(self) -> tuple[int, int]:
+        """Сколько решений каждого потока записано: (равномерные числа, целые)."""
+        return len(self.floats), len(self.ints)
+
+
+class DecisionReplayer:
+    """
+    Генератор, который ничего не разыгрывает, а выдаёт записанные решения по порядку.
+
+    Если решение не подходит к вызову (сумма вне отрезка, номер вне последовательности) или решения
+    закончились, значит код казино или исходное состояние разошлись с записью, и поднимается RuntimeError.
+
+    Если задан source — настоящий генератор в состоянии на момент float_pos/int_pos, — выданные решения
+    запоминаются как вызовы, и getstate() доигрывает их на source так же, как это сделал DecisionRecorder.
+    Тогда казино на повторе можно сохранить в снимок: в нём окажется состояние генератора исходного прогона.
+    """
+
+    def __init__(self, floats: Sequence[float], ints: Sequence[int], float_pos: int = 0, int_pos: int = 0,
+                 source=None):
+        self.floats = floats
+        self.ints = ints
+        self.float_pos = float_pos
+        self.int_pos = int_pos
+        self.source = source
+        self._calls: list[tuple] = []
+
+    def __repr__(self):
+        return f"DecisionReplayer(float_pos={self.float_pos}, int_pos={self.int_pos})"
+
+    def random(self) -> float:
+        if self.float_pos >= len(self.floats):
+            raise RuntimeError("Записанные решения закончились: повтор зашёл дальше записи")
+        value = self.floats[self.float_pos]
+        self.float_pos += 1
+        self._calls.append(("random",))
+        return value
+
+    def _int(self, low: int, high: int) -> int:
+        if self.int_pos >= len(self.ints):
+            raise RuntimeError("Записанные решения закончились: повтор зашёл дальше записи")
+        value = self.ints[self.int_pos]
+        if not low <= value <= high:
+            raise RuntimeError(f"Повтор разошёлся с записью: решение {value} вне [{low}, {high}] "
+                               f"(целое решение №{self.int_pos})")
+        self.int_pos += 1
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        value = self._int(a, b)
+        self._calls.append(("randint", a, b))
+        return value
+
+    def choice(self, seq: Sequence) -> Any:
+        value = seq[self._int(0, len(seq) - 1)]
+        self._calls.append(("choice", len(seq)))
+        return value
+
+    def choices(self, population: Sequence, weights: Sequence[float] | None = None, *, k: int = 1) -> list:
+        values = [population[self._int(0, len(population) - 1)] for _ in range(k)]
+        self._calls.append(("choices", len(population), None if weights is None else list(weights), k))
+        return values
+
+    def getstate(self):
+        """Состояние source после всех выданных решений; без source поднимает TypeError."""
+        if self.source is None:
+            raise TypeError("У DecisionReplayer без source нет состояния генератора")
+        source = self.source
+        for call in self._calls:
+            if call[0] == "random":
+                source.random()
+            elif call[0] == "randint":
+                source.randint(call[1], call[2])
+            elif call[0] == "choice":
+                source.choice(range(call[1]))
+            else:
+                source.choices(range(call[1]), call[2], k=call[3])
+        self._calls.clear()
+        return source.getstate()
+
+
+class Keyframe(NamedTuple):
+    """Полное состояние казино на шаге step и позиции потоков решений на этот момент."""
+    step: int
+    float_pos: int
+    int_pos: int
+    state: dict
+
+
+def use_rng(casino: Casino, rng) -> None:
+    """Переключает казино и всех его гусей на другой генератор."""
+    casino.rng = rng
+    for goose in casino.geese:
+        goose.rng = rng
+
+
+class ReplayRecorder:
+    """
+    Записывает прогон казино для повтора: ключевой кадр в начале, решения каждого шага и ключевые
+    кадры каждые keyframe_every шагов. Вызывайте step() после каждого perform_step().
+
+    Запись сохраняется в path при close() (или выходе из with), если путь задан.
+    """
+
+    def __init__(self, casino: Casino, path: str | None = None, keyframe_every: int = 10_000):
+        if keyframe_every < 1:
+            raise ValueError(f"Интервал ключевых кадров должен быть положительным: {keyframe_every}")
+        self.casino = casino
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.decisions = DecisionRecorder(casino.rng)
+        self.keyframes: list[Keyframe] = []
+        use_rng(casino, self.decisions)
+        self.keyframe()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def step(self) -> None:
+        """Вызывается после каждого шага; добавляет ключевой кадр, когда подошёл интервал."""
+        if self.casino.step_count % self.keyframe_every == 0:
+            self.keyframe()
+
+    def keyframe(self) -> None:
+        """Добавляет ключевой кадр текущего состояния."""
+        if self.keyframes and self.keyframes[-1].step == self.casino.step_count:
+            return
+        self.keyframes.append(Keyframe(self.casino.step_count, *self.decisions.position(), capture(self.casino)))
+
+    def log(self) -> "ReplayLog":
+        """Запись на текущий момент."""
+        return ReplayLog(self.keyframes, self.decisions.floats, self.decisions.ints, self.casino.step_count)
+
+    def close(self) -> None:
+        """Сохраняет запись, если задан путь, и возвращает казино его генератор."""
+        if self.casino.rng is self.decisions:
+            use_rng(self.casino, self.decisions.source)
+        if self.path is not None:
+            self.log().save(self.path)
+            self.path = None
+
+
+class ReplayLog:
+    """
+    Запись прогона: ключевые кадры и потоки решений. Восстанавливает состояние на любом записанном шаге.
+
+    seek(step) загружает ближайший ключевой кадр не позже step и доигрывает оставшиеся шаги
+    записанными решениями, ничего не разыгрывая заново.
+    """
+
+    def __init__(self, keyframes: list[Keyframe], floats: Sequence[float], ints: Sequence[int], last_step: int):
+        if not keyframes:
+            raise ValueError("В записи нет ни одного ключевого кадра")
+        self.keyframes = keyframes
+        self.floats = floats
+        self.ints = ints
+        self.last_step = last_step
+        self._steps = [keyframe.step for keyframe in keyframes]
+
+    def __repr__(self):
+        return (f"ReplayLog(steps={self.first_step}..{self.last_step}, keyframes={len(self.keyframes)}, "
+                f"decisions={len(self.floats) + len(self.ints)})")
+
+    @property
+    def first_step(self) -> int:
+        """Шаг, с которого начата запись."""
+        return self._steps[0]
+
+    def keyframe_for(self, step: int) -> Keyframe:
+        """Последний ключевой кадр не позже step."""
+        if not self.first_step <= step <= self.last_step:
+            raise ValueError(f"Шаг {step} вне записи ({self.first_step}..{self.last_step})")
+        return self.keyframes[bisect_right(self._steps, step) - 1]
+
+    def seek(self, step: int, clock: Clock | None = None, headless: bool = True) -> Casino:
+        """
+        Восстанавливает казино на шаге step.
+
+        Генератор восстановленного казино — DecisionReplayer, поэтому дальше его можно шагать
+        (например, с подключённым ListSink) до конца записи. Казино можно сохранить в снимок
+        (capture, save_snapshot): в снимок попадёт настоящий генератор исходного прогона на этом шаге.
+
+        :param step: Номер шага (casino.step_count).
+        :param clock: Часы восстановленного казино (по умолчанию виртуальные).
+        :param headless: Режим без логирования (по умолчанию без логов).
+        :return: Казино на шаге step.
+        """
+        keyframe = self.keyframe_for(step)
+        casino = restore(keyframe.state, clock=clock, headless=True)
+        use_rng(casino, DecisionReplayer(self.floats, self.ints, keyframe.float_pos, keyframe.int_pos, casino.rng))
+        for _ in range(step - keyframe.step):
+            casino.perform_step()
+        if not headless:
+            # Логи включаются только после перемотки
+            casino.headless = False
+            casino.attach_sink(LoggingSink())
+        return casino
+
+    def save(self, path: str) -> None:
+        """
+        Записывает запись в файл атомарно. Целые решения сжимаются zlib (это в основном маленькие номера).
+
+        :param path: Путь к файлу.
+        """
+        data = {
+            "keyframes": [tuple(keyframe) for keyframe in self.keyframes],
+            "floats": array("d", self.floats).tobytes(),
+            "ints": zlib.compress(array("q", self.ints).tobytes()),
+            "last_step": self.last_step,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayLog":
+        """
+        Читает запись из файла. Загружайте только записи, которым доверяете.
+
+        :param path: Путь к файлу.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} не является записью прогона казино")
+            data = pickle.load(f)
+        floats = array("d")
+        floats.frombytes(data["floats"])
+        ints = array("q")
+        ints.frombytes(zlib.decompress(data["ints"]))
+        return cls([Keyframe(*keyframe) for keyframe in data["keyframes"]], floats, ints, data["last_step"])
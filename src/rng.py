@@ -0,0 +1,112 @@
+import random
+from bisect import bisect
+from itertools import accumulate
+from typing import Any, Protocol, Sequence
+
+
+class RandomSource(Protocol):
+    """
+    Интерфейс генератора случайных чисел, которым пользуются казино и гуси.
+
+    Ему удовлетворяют random.Random, сам модуль random и NumpyRandom.
+    """
+
+    def random(self) -> float: ...
+
+    def randint(self, a: int, b: int) -> int: ...
+
+    def choice(self, seq: Sequence) -> Any: ...
+
+    def choices(self, population: Sequence, weights: Sequence[float] | None = None, *, k: int = 1) -> list: ...
+
+
+class NumpyRandom:
+    """
+    Генератор поверх numpy.random.Generator с интерфейсом random.Random.
+
+    Одиночные значения выдаются из заранее сгенерированного блока, поэтому вызов
+    не платит накладные расходы NumPy на каждое число. Для пакетных режимов есть
+    методы random_batch и integers_batch, которые возвращают массивы целиком.
+    """
+
+    def __init__(self, seed: int | None = None, block_size: int = 4096):
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("Для NumpyRandom нужен пакет numpy (pip install numpy)") from e
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        self._block: list[float] = []
+        self._pos = 0
+
+    def __repr__(self):
+        return f"NumpyRandom({type(self.generator.bit_generator).__name__})"
+
+    def random(self) -> float:
+        if self._pos >= len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            self._pos = 0
+        value = self._block[self._pos]
+        self._pos += 1
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence) -> Any:
+        if not len(seq):
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population: Sequence, weights: Sequence[float] | None = None, *, k: int = 1) -> list:
+        n = len(population)
+        if weights is None:
+            return [population[int(self.random() * n)] for _ in range(k)]
+        cum_weights = list(accumulate(weights))
+        if len(cum_weights) != n:
+            raise ValueError("The number of weights does not match the population")
+        total = cum_weights[-1] + 0.0
+        if total <= 0.0:
+            raise ValueError("Total of weights must be greater than zero")
+        hi = n - 1
+        return [population[bisect(cum_weights, self.random() * total, 0, hi)] for _ in range(k)]
+
+    def random_batch(self, k: int):
+        """
+        Возвращает массив из k равномерных чисел на [0, 1).
+
+        :param k: Размер пакета.
+        """
+        return self.generator.random(k)
+
+    def integers_batch(self, a: int, b: int, k: int):
+        """
+        Возвращает массив из k целых чисел на отрезке [a, b].
+
+        :param k: Размер пакета.
+        """
+        return self.generator.integers(a, b + 1, size=k)
+
+    def getstate(self) -> tuple:
+        return self.generator.bit_generator.state, list(self._block), self._pos
+
+    def setstate(self, state: tuple) -> None:
+        bit_state, block, pos = state
+        self.generator.bit_generator.state = bit_state
+        self._block = list(block)
+        self._pos = pos
+
+
+def make_rng(seed: int | None = None, kind: str = "stdlib") -> RandomSource:
+    """
+    Создаёт собственный генератор случайных чисел для казино.
+
+    :param seed: Сид генератора (None — случайный).
+    :param kind: 'stdlib' — random.Random, 'numpy' — NumpyRandom.
+    :return: Генератор с интерфейсом RandomSource.
+    """
+    if kind == "stdlib":
+        return random.Random(seed)
+    if kind == "numpy":
+        return NumpyRandom(seed)
+    raise ValueError(f"Неизвестный тип генератора: {kind!r}")
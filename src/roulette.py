@@ -0,0 +1,79 @@
+from typing import NamedTuple
+
+POCKETS = 37
+RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+# Цвет каждой лунки колеса: 0 — зеро, остальные красные или чёрные
+POCKET_COLORS = tuple('зеро' if n == 0 else 'красное' if n in RED_NUMBERS else 'чёрное' for n in range(POCKETS))
+
+
+class BetSpec(NamedTuple):
+    """Вид ставки европейской рулетки: имя, выигрышные числа и выплата на единицу ставки (вместе со ставкой)."""
+    name: str
+    numbers: frozenset[int]
+    payout: int
+
+
+class Bet(NamedTuple):
+    """Сделанная ставка: имя из BET_BOOK, размер и столбец таблицы выплат."""
+    type: str
+    amount: int
+    column: int
+
+
+def _spec(name: str, numbers) -> BetSpec:
+    numbers = frozenset(numbers)
+    # На европейском колесе выплата вместе со ставкой равна 36 / количество чисел (стрейт 35:1, сплит 17:1, ...)
+    return BetSpec(name, numbers, 36 // len(numbers))
+
+
+def build_bet_book() -> tuple[BetSpec, ...]:
+    """
+    Перечисляет все ставки европейской рулетки.
+
+    Стрейты идут первыми, поэтому столбец стрейта совпадает с числом (ставка на 0 называется 'зеро').
+    Раскладка стола — 12 рядов по 3 числа: 1 2 3 / 4 5 6 / ... / 34 35 36.
+
+    :return: Виды ставок в порядке столбцов таблицы выплат.
+    """
+    book = [_spec('зеро', {0})]
+    book += [_spec(f'стрейт {n}', {n}) for n in range(1, POCKETS)]
+    book += [_spec(f'сплит 0-{n}', {0, n}) for n in (1, 2, 3)]
+    book += [_spec(f'сплит {n}-{n + 1}', {n, n + 1}) for n in range(1, 36) if n % 3 != 0]
+    book += [_spec(f'сплит {n}-{n + 3}', {n, n + 3}) for n in range(1, 34)]
+    book += [_spec(f'стрит {n}-{n + 2}', range(n, n + 3)) for n in range(1, 37, 3)]
+    book += [_spec(f'каре {n}-{n + 4}', {n, n + 1, n + 3, n + 4}) for n in range(1, 33) if n % 3 != 0]
+    book += [_spec(f'дюжина {d}', range(12 * d - 11, 12 * d + 1)) for d in (1, 2, 3)]
+    book += [_spec(f'колонна {c}', range(c, 37, 3)) for c in (1, 2, 3)]
+    book += [
+        _spec('красное', RED_NUMBERS),
+        _spec('чёрное', set(range(1, POCKETS)) - RED_NUMBERS),
+        _spec('нечет', range(1, POCKETS, 2)),
+        _spec('чёт', range(2, POCKETS, 2)),
+        _spec('малые', range(1, 19)),
+        _spec('большие', range(19, POCKETS)),
+    ]
+    return tuple(book)
+
+
+BET_BOOK = build_bet_book()
+BET_INDEX = {spec.name: column for column, spec in enumerate(BET_BOOK)}
+BET_INDEX['стрейт 0'] = BET_INDEX['зеро']
+# PAYOUT_TABLE[число][столбец] — сколько получает игрок на единицу ставки, если выпало число (0 — проигрыш)
+PAYOUT_TABLE = tuple(tuple(spec.payout if pocket in spec.numbers else 0 for spec in BET_BOOK)
+                     for pocket in range(POCKETS))
+
+
+def make_bet(bet_type: str, amount: int) -> Bet:
+    """
+    Создаёт ставку, проверяя её имя.
+
+    :param bet_type: Имя ставки, например 'красное', 'стрейт 17', 'сплит 1-2', 'дюжина 3'.
+    :param amount: Размер ставки (положительный).
+    :return: Ставка со столбцом таблицы выплат.
+    """
+    column = BET_INDEX.get(bet_type)
+    if column is None:
+        raise ValueError(f"Неизвестная ставка: {bet_type!r}")
+    if amount <= 0:
+        raise ValueError(f"Размер ставки должен быть положительным: {amount}")
+    return Bet(BET_BOOK[column].name, amount, column)
@@ -0,0 +1,175 @@
+from bisect import bisect
+from itertools import accumulate
+from typing import Any, Sequence
+
+from rng import RandomSource
+
+
+def _uniforms(rng: RandomSource, k: int):
+    """Возвращает k равномерных чисел: пакетом, если генератор это умеет."""
+    random_batch = getattr(rng, "random_batch", None)
+    if random_batch is not None:
+        return random_batch(k)
+    return [rng.random() for _ in range(k)]
+
+
+class AliasSampler:
+    """
+    Выборка из неизменного дискретного распределения методом псевдонимов (алгоритм Воуза).
+
+    Таблицы строятся один раз, после чего каждый выбор стоит O(1) и расходует
+    ровно одно равномерное число генератора.
+    """
+
+    def __init__(self, population: Sequence, weights: Sequence[float]):
+        n = len(population)
+        if n == 0 or len(weights) != n:
+            raise ValueError("The number of weights does not match the population")
+        total = float(sum(weights))
+        if total <= 0.0:
+            raise ValueError("Total of weights must be greater than zero")
+        self.population = tuple(population)
+        self.weights = tuple(weights)
+
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Остатки из-за погрешности округления выбираются всегда сами по себе
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self):
+        return len(self.population)
+
+    def __repr__(self):
+        return f"AliasSampler({dict(zip(self.population, self.weights))})"
+
+    def draw_index(self, rng: RandomSource) -> int:
+        """
+        Выбирает номер элемента совокупности.
+
+        :param rng: Генератор случайных чисел.
+        """
+        u = rng.random() * len(self._prob)
+        i = int(u)
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def draw(self, rng: RandomSource) -> Any:
+        """
+        Выбирает элемент совокупности.
+
+        :param rng: Генератор случайных чисел.
+        """
+        return self.population[self.draw_index(rng)]
+
+    def draw_indices(self, rng: RandomSource, k: int):
+        """
+        Выбирает сразу k номеров элементов.
+
+        Если генератор умеет выдавать числа пакетом (NumpyRandom), выбор выполняется
+        векторно и возвращается массив NumPy, иначе — список.
+
+        :param rng: Генератор случайных чисел.
+        :param k: Размер выборки.
+        """
+        u = _uniforms(rng, k)
+        if isinstance(u, list):
+            prob, alias, n = self._prob, self._alias, len(self._prob)
+            indices = []
+            for value in u:
+                scaled = value * n
+                i = int(scaled)
+                indices.append(i if scaled - i < prob[i] else alias[i])
+            return indices
+        import numpy as np
+        scaled = u * len(self._prob)
+        i = scaled.astype(np.intp)
+        return np.where(scaled - i < np.asarray(self._prob)[i], i, np.asarray(self._alias)[i])
+
+    def draw_batch(self, rng: RandomSource, k: int) -> list:
+        """
+        Выбирает сразу k элементов совокупности.
+
+        :param rng: Генератор случайных чисел.
+        :param k: Размер выборки.
+        """
+        population = self.population
+        return [population[i] for i in self.draw_indices(rng, k)]
+
+
+class CumulativeSampler:
+    """
+    Выборка из распределения с изменяемыми весами.
+
+    Накопленные веса кешируются и пересчитываются только тогда, когда какой-то вес
+    действительно изменился. Выбор совпадает с random.Random.choices по результату
+    и расходу генератора, поэтому замена не меняет воспроизводимость по сиду.
+    """
+
+    def __init__(self, weights: dict[Any, float]):
+        self.weights = dict(weights)
+        self._population = list(self.weights)
+        self._cum_weights: list[float] | None = None
+
+    def __repr__(self):
+        return f"CumulativeSampler({self.weights})"
+
+    def set_weight(self, key: Any, weight: float) -> None:
+        """
+        Устанавливает вес элемента; кеш сбрасывается только при изменении значения.
+
+        :param key: Элемент совокупности.
+        :param weight: Новый вес.
+        """
+        if self.weights.get(key) != weight:
+            if key not in self.weights:
+                self._population.append(key)
+            self.weights[key] = weight
+            self._cum_weights = None
+
+    def _cumulative(self) -> list[float]:
+        if self._cum_weights is None:
+            cum_weights = list(accumulate(self.weights[key] for key in self._population))
+            if cum_weights[-1] + 0.0 <= 0.0:
+                raise ValueError("Total of weights must be greater than zero")
+            self._cum_weights = cum_weights
+        return self._cum_weights
+
+    def total(self) -> float:
+        """Сумма весов; 0, если выбирать не из чего."""
+        if self._cum_weights is None:
+            return sum(self.weights.values())
+        return self._cum_weights[-1]
+
+    def draw(self, rng: RandomSource) -> Any:
+        """
+        Выбирает элемент пропорционально текущим весам.
+
+        :param rng: Генератор случайных чисел.
+        """
+        cum_weights = self._cumulative()
+        return self._population[bisect(cum_weights, rng.random() * cum_weights[-1], 0, len(cum_weights) - 1)]
+
+    def draw_batch(self, rng: RandomSource, k: int) -> list:
+        """
+        Выбирает сразу k элементов при текущих весах.
+
+        :param rng: Генератор случайных чисел.
+        :param k: Размер выборки.
+        """
+        cum_weights = self._cumulative()
+        total, hi, population = cum_weights[-1], len(cum_weights) - 1, self._population
+        u = _uniforms(rng, k)
+        if isinstance(u, list):
+            return [population[bisect(cum_weights, value * total, 0, hi)] for value in u]
+        import numpy as np
+        indices = np.minimum(np.searchsorted(cum_weights, u * total, side="right"), hi)
+        return [population[i] for i in indices]
@@ -1,17 +1,40 @@
-import logging.config
-from config import LOGGING_CONFIG
+import logging
+from contextlib import ExitStack
+from config import configure_logging
 from casino import Casino
 from chip import ChipCollection, Chip
+from clock import Clock
+from constants import ENTITIES_MAX_COUNT
+from event_stream import EventStreamWriter
+from rng import RandomSource
+from profiling import Profiler, profile
+from replay import ReplayRecorder
+from snapshot import Checkpointer
 
-logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
-def run_simulation(steps: int = 20, seed: int | None = None):
+def run_simulation(steps: int = 20, seed: int | None = None, clock: Clock | None = None,
+                   headless: bool = False, events_path: str | None = None,
+                   rng: RandomSource | None = None, checkpoint_path: str | None = None,
+                   checkpoint_every: int = 1000, max_entities: int = ENTITIES_MAX_COUNT,
+                   profiler: Profiler | None = None, record_path: str | None = None,
+                   keyframe_every: int = 10_000, metrics_address: tuple[str, int] | str | None = None):
     """
     Функция для запуска симуляции с заданным количеством шагов и необязательным сидом для генератора случайных чисел.
 
     :param steps: Количество шагов симуляции (по умолчанию 20)
     :param seed: Сид для генератора случайных чисел (по умолчанию None)
+    :param clock: Часы, задающие темп симуляции (по умолчанию реальное время)
+    :param headless: Режим без логирования: события публикуются только в подключённые приёмники
+    :param events_path: Файл для бинарного потока событий (по умолчанию не пишется)
+    :param rng: Генератор случайных чисел казино (по умолчанию random.Random(seed))
+    :param checkpoint_path: Файл снимка состояния казино (по умолчанию снимки не пишутся)
+    :param checkpoint_every: Через сколько шагов сохранять снимок (по умолчанию 1000)
+    :param max_entities: Максимальное количество игроков и гусей в казино
+    :param profiler: Профилировщик, в который пишутся замеры шагов (по умолчанию замеров нет)
+    :param record_path: Файл записи решений для повтора (по умолчанию не пишется)
+    :param keyframe_every: Через сколько шагов записи добавлять ключевой кадр (по умолчанию 10000)
+    :param metrics_address: (host, port) или путь Unix-сокета для живых метрик (по умолчанию не публикуются)
     :return: Данная функция ничего не возвращает
     """
 
@@ -21,6 +44,53 @@ def run_simulation(steps: int = 20, seed: int | None = None):
     chips.append(Chip("Зелёный", 25))
     chips.append(Chip("Чёрный", 100))
 
-    casino = Casino(chips, seed)
-    for step in range(steps):
-        casino.perform_step()
\ No newline at end of file
+    if not headless:
+        configure_logging()
+    casino = Casino(chips, seed, clock=clock, headless=headless, rng=rng, max_entities=max_entities)
+    run_steps(casino, steps, events_path, checkpoint_path, checkpoint_every, profiler, record_path, keyframe_every,
+              metrics_address)
+
+
+def run_steps(casino: Casino, steps: int, events_path: str | None = None,
+              checkpoint_path: str | None = None, checkpoint_every: int = 1000,
+              profiler: Profiler | None = None, record_path: str | None = None,
+              keyframe_every: int = 10_000, metrics_address: tuple[str, int] | str | None = None) -> None:
+    """
+    Выполняет шаги казино, при необходимости записывая поток событий, снимки и решения для повтора.
+
+    :param casino: Казино
+    :param steps: Количество шагов
+    :param events_path: Файл для бинарного потока событий
+    :param checkpoint_path: Файл снимка состояния
+    :param checkpoint_every: Через сколько шагов сохранять снимок
+    :param profiler: Профилировщик, в который пишутся замеры шагов
+    :param record_path: Файл записи решений для повтора
+    :param keyframe_every: Через сколько шагов записи добавлять ключевой кадр
+    :param metrics_address: (host, port) или путь Unix-сокета для живых метрик
+    """
+    with ExitStack() as stack:
+        if metrics_address is not None:
+            # HTTP-сервер импортируется только когда метрики действительно нужны
+            from metrics import serve_metrics
+            stack.enter_context(serve_metrics(casino, metrics_address))
+        if events_path is not None:
+            casino.attach_sink(stack.enter_context(EventStreamWriter(events_path)))
+        if profiler is not None:
+            stack.enter_context(profile(casino, profiler))
+        hooks = []
+        if record_path is not None:
+            hooks.append(stack.enter_context(ReplayRecorder(casino, record_path, keyframe_every)).step)
+        if checkpoint_path is not None:
+            checkpointer = stack.enter_context(Checkpointer(casino, checkpoint_path, checkpoint_every))
+            hooks.append(checkpointer.step)
+        if not hooks:
+            for step in range(steps):
+                casino.perform_step()
+            return
+        for step in range(steps):
+            casino.perform_step()
+            for hook in hooks:
+                hook()
+        if checkpoint_path is not None and casino.step_count % checkpoint_every:
+            # Финальный снимок, чтобы завершённый прогон можно было продолжить
+            checkpointer.save()
@@ -0,0 +1,217 @@
+import os
+import pickle
+import random
+
+from casino import Casino
+from chip import Chip, ChipCollection
+from clock import Clock, VirtualClock
+from params import CasinoParams
+from names import NamePool, PLAYER_NAMES, GOOSE_NAMES
+from goose import Goose, HonkGoose, RichGoose
+from player import Player, PsychoPlayer, PlayerCollection
+from rng import NumpyRandom, make_rng
+
+MAGIC = b"CSNP\x01\x00\x00\x00"
+PLAYER_CLASSES = {cls.__name__: cls for cls in (Player, PsychoPlayer)}
+GOOSE_CLASSES = {cls.__name__: cls for cls in (Goose, HonkGoose, RichGoose)}
+
+
+def rng_kind(rng) -> str:
+    """Тип генератора для make_rng: 'stdlib' или 'numpy'."""
+    source = getattr(rng, "source", None)
+    if source is not None:
+        # Обёртки записи и повтора решений (replay.DecisionRecorder, DecisionReplayer) сохраняют
+        # состояние своего настоящего генератора
+        return rng_kind(source)
+    if isinstance(rng, random.Random):
+        return "stdlib"
+    if isinstance(rng, NumpyRandom):
+        return "numpy"
+    raise TypeError(f"Состояние генератора {type(rng).__name__} нельзя сохранить в снимок")
+
+
+def restore_params(values: dict) -> CasinoParams:
+    """Параметры казино из снимка; в снимках без параметров — значения по умолчанию."""
+    return CasinoParams(**{name: tuple(value) if isinstance(value, list) else value
+                           for name, value in values.items()})
+
+
+def capture(casino: Casino) -> dict:
+    """
+    Собирает полное состояние казино в словарь из простых значений.
+
+    Игроки сохраняются по колонкам (имена, балансы, психоз, ...), что заметно
+    быстрее и компактнее, чем объект на каждого игрока.
+
+    :param casino: Казино (VectorCasino не поддерживается).
+    :return: Состояние, пригодное для restore.
+    """
+    if not isinstance(casino.players, PlayerCollection):
+        raise TypeError(f"Снимок поддерживает только Casino, а не {type(casino).__name__}")
+    players = list(casino.players)
+    return {
+        "step_count": casino.step_count,
+        "time": casino.clock.now(),
+        "headless": casino.headless,
+        "max_entities": casino.max_entities,
+        "params": casino.params._asdict(),
+        "rng": (rng_kind(casino.rng), casino.rng.getstate()),
+        "chips": [(chip.color, chip.value) for chip in casino.chips],
+        "chip_tray": list(casino.chip_rack.tray) if casino.chip_rack is not None else None,
+        "players": {
+            "id": [p.id for p in players],
+            "class": [type(p).__name__ for p in players],
+            "name": [p.name for p in players],
+            "balance": [p.balance for p in players],
+            "psycho": [getattr(p, "psycho", 0.0) for p in players],
+            "chips": [None if p.chips is None else list(p.chips) for p in players],
+            "next_id": casino.players._next_id,
+        },
+        "geese": [(type(g).__name__, g.name, g.honk_volume) for g in casino.geese],
+        "bets": [(player_id, bet.type, bet.amount) for player_id, player_bets in casino.bets.items()
+                 for bet in player_bets],
+        "bets_open": casino.bets.is_open,
+        "player_names": (list(casino.player_names), casino.player_names.generation),
+        "goose_names": (list(casino.goose_names), casino.goose_names.generation),
+        "event_weights": dict(casino.event_weights),
+    }
+
+
+def restore(state: dict, clock: Clock | None = None, headless: bool | None = None) -> Casino:
+    """
+    Восстанавливает казино из состояния, собранного capture.
+
+    Продолжение восстановленного казино совпадает с продолжением исходного шаг в шаг.
+    Подключённые вручную приёмники событий в снимок не попадают.
+
+    :param state: Состояние казино.
+    :param clock: Часы восстановленного казино (по умолчанию виртуальные); время переводится на момент снимка.
+    :param headless: Режим без логирования (по умолчанию как в снимке).
+    :return: Новое казино.
+    """
+    kind, rng_state = state["rng"]
+    rng = make_rng(None, kind)
+    rng.setstate(rng_state)
+    clock = clock if clock is not None else VirtualClock()
+    clock.reset(state["time"])
+    chips = ChipCollection([Chip(color, value) for color, value in state["chips"]])
+    casino = Casino(chips, clock=clock, headless=state["headless"] if headless is None else headless, rng=rng,
+                    max_entities=state["max_entities"], params=restore_params(state.get("params", {})))
+    casino.step_count = state["step_count"]
+
+    columns = state["players"]
+    for player_id, class_name, name, balance, psycho, holding in zip(
+            columns["id"], columns["class"], columns["name"], columns["balance"], columns["psycho"],
+            columns["chips"]):
+        player = PLAYER_CLASSES[class_name](name, balance)
+        if isinstance(player, PsychoPlayer):
+            player.psycho = psycho
+        # Игрок с фишками из снимка не покупает их заново
+        player.chips = None if holding is None else list(holding)
+        casino.players.append(player, player_id)
+    casino.players._next_id = columns["next_id"]
+    if casino.chip_rack is not None:
+        casino.chip_rack.tray[:] = state["chip_tray"]
+    for class_name, name, honk_volume in state["geese"]:
+        casino.add_goose(GOOSE_CLASSES[class_name](name, honk_volume))
+    for player_id, bet_type, amount in state["bets"]:
+        casino.bets.place_bet(player_id, bet_type, amount)
+    casino.bets.is_open = state["bets_open"]
+
+    free, generation = state["player_names"]
+    casino.player_names = NamePool(PLAYER_NAMES, free, generation, in_use=casino.player_name_in_use)
+    free, generation = state["goose_names"]
+    casino.goose_names = NamePool(GOOSE_NAMES, free, generation, in_use=casino.goose_name_in_use)
+    for event, weight in state["event_weights"].items():
+        casino.event_sampler.set_weight(event, weight)
+    return casino
+
+
+def save_snapshot(casino: Casino, path: str) -> None:
+    """
+    Записывает снимок казино в файл атомарно: сначала во временный файл, затем переименованием.
+
+    :param casino: Казино.
+    :param path: Путь к файлу снимка.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        pickle.dump(capture(casino), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, clock: Clock | None = None, headless: bool | None = None) -> Casino:
+    """
+    Восстанавливает казино из файла снимка. Загружайте только снимки, которым доверяете.
+
+    :param path: Путь к файлу снимка.
+    :param clock: Часы восстановленного казино.
+    :param headless: Режим без логирования (по умолчанию как в снимке).
+    :return: Восстановленное казино.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} не является снимком казино")
+        state = pickle.load(f)
+    return restore(state, clock=clock, headless=headless)
+
+
+class Checkpointer:
+    """
+    Периодически сохраняет снимок казино каждые every шагов.
+
+    В фоновом режиме (по умолчанию там, где есть os.fork) снимок пишет дочерний процесс:
+    он получает копию памяти казино по принципу copy-on-write, поэтому цикл шагов
+    не ждёт сериализации даже на очень больших казино. Следующий снимок начинается
+    только после завершения предыдущего.
+    """
+
+    def __init__(self, casino: Casino, path: str, every: int = 1000, background: bool | None = None):
+        if every < 1:
+            raise ValueError(f"Интервал снимков должен быть положительным: {every}")
+        self.casino = casino
+        self.path = path
+        self.every = every
+        self.background = hasattr(os, "fork") if background is None else background
+        self._child: int | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def step(self) -> None:
+        """Вызывается после каждого шага; сохраняет снимок, когда подошёл интервал."""
+        if self.casino.step_count % self.every == 0:
+            self.save()
+
+    def save(self) -> None:
+        """Сохраняет снимок текущего состояния."""
+        if not self.background:
+            save_snapshot(self.casino, self.path)
+            return
+        self.wait()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                save_snapshot(self.casino, self.path)
+                code = 0
+            finally:
+                os._exit(code)
+        self._child = pid
+
+    def wait(self) -> None:
+        """Дожидается фоновой записи предыдущего снимка."""
+        if self._child is None:
+            return
+        _, status = os.waitpid(self._child, 0)
+        self._child = None
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise RuntimeError(f"Не удалось записать снимок {self.path}")
+
+    def close(self) -> None:
+        """Дожидается незавершённой записи снимка."""
+        self.wait()
@@ -0,0 +1,201 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, NamedTuple
+
+from ensemble import MetricEstimate, ReplicaSummary, aggregate, replica_seeds, run_replica
+from params import CasinoParams, DEFAULT_PARAMS, coerce
+
+# Увеличивайте при изменениях движка, которые меняют итоги прогонов: старые записи кэша перестанут совпадать
+CACHE_VERSION = 1
+
+
+class Uniform(NamedTuple):
+    """Равномерное распределение значения параметра на отрезке [low, high] для случайного поиска."""
+    low: float
+    high: float
+
+
+class SweepResult(NamedTuple):
+    """Итоги одной точки перебора: параметры, итоги реплик и оценки метрик."""
+    params: CasinoParams
+    summaries: list[ReplicaSummary]
+    metrics: dict[str, MetricEstimate]
+    cached: int
+
+
+def parse_axis(text: str, ranges: bool = False) -> tuple[str, list | Uniform]:
+    """
+    Разбирает ось перебора из командной строки.
+
+    :param text: 'имя=v1,v2,...' (наборы весов — через '/', например 'bet_weights=0.47/0.48/0.05,0.4/0.4/0.2')
+        или, если ranges, 'имя=low:high' для равномерного распределения.
+    :param ranges: Разрешить отрезок low:high.
+    :return: Имя параметра и список значений или Uniform.
+    """
+    name, sep, values = text.partition("=")
+    name = name.strip().replace("-", "_")
+    if not sep or not values:
+        raise ValueError(f"Ожидалось имя=значения, получено {text!r}")
+    if ranges and ":" in values:
+        low, _, high = values.partition(":")
+        low, high = coerce(name, low), coerce(name, high)
+        if isinstance(low, tuple):
+            raise ValueError(f"Параметр {name} — набор значений, для него задайте список вариантов")
+        if low > high:
+            raise ValueError(f"Пустой отрезок для {name}: {values}")
+        return name, Uniform(low, high)
+    return name, [coerce(name, value) for value in values.split(",")]
+
+
+def grid(base: CasinoParams = DEFAULT_PARAMS, **axes: Iterable) -> list[CasinoParams]:
+    """
+    Полный перебор: все сочетания значений по осям.
+
+    :param base: Параметры, от которых отсчитываются изменения.
+    :param axes: Имя параметра -> значения, например suicide_chance=[0.2, 0.4, 0.6].
+    :return: Точки перебора в порядке itertools.product.
+    """
+    for name in axes:
+        if name not in CasinoParams._fields:
+            raise ValueError(f"Неизвестный параметр казино: {name!r}")
+    names = list(axes)
+    points = [base._replace(**dict(zip(names, values))) for values in itertools.product(*axes.values())]
+    for point in points:
+        point.check()
+    return points
+
+
+def random_search(space: dict, samples: int, seed: int = 0, base: CasinoParams = DEFAULT_PARAMS) -> list[CasinoParams]:
+    """
+    Случайный поиск: samples точек, в каждой параметры выбираются независимо.
+
+    :param space: Имя параметра -> Uniform(low, high) для числового параметра или список вариантов.
+    :param samples: Количество точек.
+    :param seed: Сид выбора точек.
+    :param base: Значения параметров, которых нет в space.
+    :return: Точки перебора.
+    """
+    for name, values in space.items():
+        if name not in CasinoParams._fields:
+            raise ValueError(f"Неизвестный параметр казино: {name!r}")
+        if isinstance(values, Uniform) and isinstance(getattr(base, name), tuple):
+            raise ValueError(f"Параметр {name} — набор значений, для него задайте список вариантов")
+    rng = random.Random(seed)
+    points = []
+    for _ in range(samples):
+        changes = {name: rng.uniform(*values) if isinstance(values, Uniform) else rng.choice(values)
+                   for name, values in space.items()}
+        point = base._replace(**changes)
+        point.check()
+        points.append(point)
+    return points
+
+
+class SweepCache:
+    """
+    Кэш итогов реплик на диске: один JSON-файл на сочетание параметров, сида, длины прогона и генератора.
+
+    Файлы раскладываются по подкаталогам по первым двум символам ключа и записываются атомарно,
+    поэтому прерванный перебор можно перезапустить: готовые реплики возьмутся из кэша.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"SweepCache({self.directory!r}, hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def key(params: CasinoParams, seed: int, steps: int, rng_kind: str) -> str:
+        """Ключ реплики: sha256 от параметров, сида, количества шагов, генератора и версии кэша."""
+        payload = {"version": CACHE_VERSION, "params": params._asdict(), "seed": seed, "steps": steps,
+                   "rng": rng_kind}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> ReplicaSummary | None:
+        """Итоги реплики из кэша или None, если их нет (повреждённая запись считается отсутствующей)."""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                summary = ReplicaSummary(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return summary
+
+    def put(self, key: str, summary: ReplicaSummary) -> None:
+        """Сохраняет итоги реплики."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(summary._asdict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def run_sweep(points: list[CasinoParams], steps: int, replicas: int = 10, base_seed: int = 0,
+              workers: int | None = None, cache: SweepCache | None = None,
+              rng_kind: str = "stdlib") -> list[SweepResult]:
+    """
+    Прогоняет ансамбль реплик в каждой точке перебора.
+
+    Во всех точках используются одни и те же сиды реплик (общие случайные числа), поэтому разница
+    метрик между точками меньше зашумлена. Реплики, которые уже есть в кэше, не пересчитываются;
+    остальные раскидываются по пулу процессов и сохраняются в кэш по мере готовности.
+
+    :param points: Параметры казино в точках перебора.
+    :param steps: Количество шагов в каждой реплике.
+    :param replicas: Количество реплик в точке.
+    :param base_seed: Базовый сид, из которого выводятся сиды реплик.
+    :param workers: Число процессов; 1 — выполнять в текущем процессе, None — по числу ядер.
+    :param cache: Кэш итогов (по умолчанию без кэша).
+    :param rng_kind: Тип генератора случайных чисел в репликах.
+    :return: Итоги точек в порядке points.
+    """
+    seeds = replica_seeds(base_seed, replicas)
+    done: dict[tuple[CasinoParams, int], ReplicaSummary] = {}
+    cached: dict[tuple[CasinoParams, int], bool] = {}
+    missing = []
+    for params in points:
+        for index, seed in enumerate(seeds):
+            task = (params, index)
+            if task in cached:
+                continue
+            summary = cache.get(cache.key(params, seed, steps, rng_kind)) if cache is not None else None
+            cached[task] = summary is not None
+            if summary is not None:
+                done[task] = summary._replace(index=index)
+            else:
+                missing.append(task)
+
+    def finish(task, summary: ReplicaSummary) -> None:
+        done[task] = summary
+        if cache is not None:
+            params, index = task
+            cache.put(cache.key(params, seeds[index], steps, rng_kind), summary)
+
+    if workers == 1:
+        for params, index in missing:
+            finish((params, index), run_replica(index, seeds[index], steps, rng_kind, params))
+    elif missing:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_replica, index, seeds[index], steps, rng_kind, params): (params, index)
+                       for params, index in missing}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+
+    results = []
+    for params in points:
+        summaries = [done[params, index] for index in range(replicas)]
+        results.append(SweepResult(params, summaries, aggregate(summaries),
+                                   sum(cached[params, index] for index in range(replicas))))
+    return results
@@ -0,0 +1,363 @@
+import numpy as np
+
+from casino import BET_SAMPLER, Casino
+from params import CasinoParams, DEFAULT_PARAMS
+from chip import ChipCollection
+from clock import Clock
+from constants import ENTITIES_MAX_COUNT, SPIN_DURATION
+from events import EventKind
+from player import Player, PsychoPlayer, PlayerCollection
+from goose import HonkGoose, RichGoose
+from rng import RandomSource
+from roulette import BET_BOOK, BET_INDEX, PAYOUT_TABLE, POCKET_COLORS
+
+BET_TYPES = BET_SAMPLER.population
+# Столбец таблицы выплат для каждого исхода BET_SAMPLER
+BET_COLUMNS = tuple(BET_INDEX[bet_type] for bet_type in BET_TYPES)
+PAYOUT_MATRIX = np.array(PAYOUT_TABLE, dtype=np.int64)
+NO_BET = -1
+
+
+class PlayerArrays:
+    """
+    Хранилище игроков в виде структуры массивов (struct-of-arrays).
+
+    Каждое поле игрока — отдельный массив NumPy: баланс, уровень психоза, признак
+    психопата, ставка (столбец таблицы выплат) и её размер. Порядок строк совпадает с порядком
+    прихода игроков. У каждого игрока не больше одной ставки.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.names: list[str] = []
+        self._size = 0
+        self._balance = np.zeros(capacity, dtype=np.int64)
+        self._psycho = np.zeros(capacity, dtype=np.float64)
+        self._is_psycho = np.zeros(capacity, dtype=bool)
+        self._bet_type = np.full(capacity, NO_BET, dtype=np.int16)
+        self._bet_amount = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return f"PlayerArrays(size={self._size})"
+
+    @property
+    def balance(self) -> np.ndarray:
+        return self._balance[:self._size]
+
+    @property
+    def psycho(self) -> np.ndarray:
+        return self._psycho[:self._size]
+
+    @property
+    def is_psycho(self) -> np.ndarray:
+        return self._is_psycho[:self._size]
+
+    @property
+    def bet_type(self) -> np.ndarray:
+        return self._bet_type[:self._size]
+
+    @property
+    def bet_amount(self) -> np.ndarray:
+        return self._bet_amount[:self._size]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._balance)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for field, fill in (("_balance", 0), ("_psycho", 0.0), ("_is_psycho", False),
+                            ("_bet_type", NO_BET), ("_bet_amount", 0)):
+            old = getattr(self, field)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, field, new)
+
+    def append(self, name: str, balance: int, is_psycho: bool = False, psycho: float = 0.0) -> int:
+        """
+        Добавляет игрока в конец хранилища.
+
+        :return: Индекс нового игрока.
+        """
+        index = self._size
+        self._reserve(index + 1)
+        self.names.append(name)
+        self._balance[index] = balance
+        self._psycho[index] = psycho
+        self._is_psycho[index] = is_psycho
+        self._bet_type[index] = NO_BET
+        self._bet_amount[index] = 0
+        self._size += 1
+        return index
+
+    def extend(self, names: list[str], balances, is_psycho) -> None:
+        """
+        Добавляет сразу много игроков.
+
+        :param names: Имена игроков.
+        :param balances: Начальные балансы.
+        :param is_psycho: Признаки психопатов.
+        """
+        start, count = self._size, len(names)
+        self._reserve(start + count)
+        end = start + count
+        self.names.extend(names)
+        self._balance[start:end] = balances
+        self._psycho[start:end] = 0.0
+        self._is_psycho[start:end] = is_psycho
+        self._bet_type[start:end] = NO_BET
+        self._bet_amount[start:end] = 0
+        self._size = end
+
+    def delete(self, index: int) -> None:
+        """
+        Удаляет игрока, сохраняя порядок остальных.
+
+        :param index: Индекс удаляемого игрока.
+        """
+        end = self._size
+        del self.names[index]
+        for array in (self._balance, self._psycho, self._is_psycho, self._bet_type, self._bet_amount):
+            array[index:end - 1] = array[index + 1:end]
+        self._size -= 1
+
+    def to_players(self) -> PlayerCollection:
+        """
+        Собирает обычные объекты Player/PsychoPlayer с текущим состоянием.
+
+        :return: Коллекция игроков.
+        """
+        players = PlayerCollection()
+        for i, name in enumerate(self.names):
+            if self._is_psycho[i]:
+                player = PsychoPlayer(name, int(self._balance[i]))
+                player.psycho = float(self._psycho[i])
+            else:
+                player = Player(name, int(self._balance[i]))
+            players.append(player)
+        return players
+
+
+def psycho_gain(store: PlayerArrays, index, money) -> None:
+    """Векторный аналог PsychoPlayer.update_psycho(money) для выигрыша (money > 0)."""
+    store.psycho[index] = np.maximum(0.0, store.psycho[index] - money / (store.balance[index] + money))
+
+
+def psycho_loss(store: PlayerArrays, index, loss, params: CasinoParams = DEFAULT_PARAMS) -> None:
+    """Векторный аналог PsychoPlayer.update_psycho(-loss) для проигрыша."""
+    total = store.balance[index] + loss
+    growth = np.divide(params.psycho_growth * loss, total, out=np.zeros(np.shape(total)), where=total != 0)
+    store.psycho[index] = np.minimum(1.0, (store.psycho[index] + growth) ** params.psycho_exponent)
+
+
+class VectorCasino(Casino):
+    """
+    Казино, в котором состояние игроков хранится в массивах NumPy (PlayerArrays).
+
+    Раздача подарков, крик гуся, расчёт ставок после вращения колеса и обновление
+    психоза выполняются одной векторной операцией на всех игроков. Генератор
+    случайных чисел расходуется в том же порядке, что и в Casino, поэтому при
+    одинаковом сиде оба движка приходят к одинаковому состоянию.
+
+    Ставки — только случайные ставки шага (красное, чёрное, зеро), не больше одной на игрока;
+    place_bet и place_player_bet с книгой ставок и несколькими ставками поддерживает только Casino.
+    """
+
+    def __init__(self, chips: ChipCollection, seed: int | None = None, clock: Clock | None = None,
+                 headless: bool = False, rng: RandomSource | None = None, capacity: int = 16,
+                 max_entities: int = ENTITIES_MAX_COUNT, params: CasinoParams = DEFAULT_PARAMS):
+        super().__init__(chips, seed, clock=clock, headless=headless, rng=rng, max_entities=max_entities,
+                         params=params)
+        self.players = PlayerArrays(capacity)
+        # Векторный движок ведёт балансы числами, без фишек
+        self.chip_rack = None
+        # Ставки хранятся в self.players.bet_type / bet_amount
+        self.bets = None
+
+    def add_player(self, player: Player) -> None:
+        """
+        Добавляет игрока в казино.
+
+        :param player: Объект игрока; в казино сохраняется только его состояние.
+        """
+        self.players.append(player.name, player.balance, isinstance(player, PsychoPlayer),
+                            getattr(player, "psycho", 0.0))
+
+    def add_players(self, names: list[str], balances, is_psycho) -> None:
+        """
+        Пакетно добавляет игроков (для больших столов).
+
+        :param names: Имена игроков.
+        :param balances: Начальные балансы.
+        :param is_psycho: Признаки психопатов.
+        """
+        self.players.extend(names, balances, is_psycho)
+
+    def remove_player(self, player: Player) -> None:
+        """
+        Удаляет игрока по имени (имена игроков за столом уникальны); его ставка пропадает.
+
+        :param player: Объект игрока с именем игрока из хранилища.
+        """
+        try:
+            index = self.players.names.index(player.name)
+        except ValueError:
+            raise ValueError(f"Игрока {player.name} нет в казино") from None
+        self.remove_player_at(index)
+
+    def remove_player_at(self, index: int) -> None:
+        """
+        Удаляет игрока по индексу; его ставка пропадает, имя возвращается в пул.
+
+        :param index: Индекс игрока в хранилище.
+        """
+        name = self.players.names[index]
+        self.players.delete(index)
+        self.player_names.release(name)
+
+    def player_name_in_use(self, name: str) -> bool:
+        """Сидит ли в казино игрок с таким именем."""
+        return name in self.players.names
+
+    def place_player_bet(self, player: Player) -> None:
+        """Не поддерживается: случайные ставки делает make_random_bet по индексам хранилища."""
+        raise TypeError("VectorCasino не принимает ставки объектов Player: ставки делает make_random_bet")
+
+    def place_bet(self, player: Player, bet_type: str, amount: int) -> bool:
+        """
+        Не поддерживается: в векторном движке у игрока одна ставка на красное, чёрное или зеро
+        (столбец в PlayerArrays.bet_type), произвольные и несколько ставок из книги ставок есть только в Casino.
+        """
+        raise TypeError("VectorCasino не поддерживает ставки из книги ставок и несколько ставок на игрока; "
+                        "используйте Casino")
+
+    def total_balance(self) -> int:
+        return int(self.players.balance.sum())
+
+    def open_bets_count(self) -> int:
+        return int(np.count_nonzero(self.players.bet_type != NO_BET))
+
+    def psycho_count(self) -> int:
+        return int(np.count_nonzero(self.players.is_psycho))
+
+    def find_killer(self, psycho_chance: float) -> int | None:
+        players = self.players
+        candidates = np.flatnonzero(players.is_psycho & (players.psycho > psycho_chance))
+        return int(candidates[0]) if len(candidates) else None
+
+    def make_random_bet(self) -> None:
+        players = self.players
+        available = np.flatnonzero((players.bet_type == NO_BET) & (players.balance > 0))
+        if not len(available):
+            return
+        index = int(self.rng.choice(available))
+        bet_index = self.bet_sampler.draw_index(self.rng)
+        bet_type = BET_TYPES[bet_index]
+        balance = int(players.balance[index])
+        amount = self.rng.randint(balance // 4 + 1, balance)
+
+        players.bet_type[index] = BET_COLUMNS[bet_index]
+        players.bet_amount[index] = amount
+        players.balance[index] = balance - amount
+        if self.sinks:
+            self.emit(EventKind.BET, actor=players.names[index], tag=bet_type, amount=amount,
+                      balance=balance - amount)
+
+    def spin_wheel(self) -> None:
+        self.clock.sleep(SPIN_DURATION)
+
+        number = self.rng.randint(0, 36)
+        if self.sinks:
+            self.emit(EventKind.SPIN, tag=POCKET_COLORS[number], amount=number)
+
+        players = self.players
+        has_bet = players.bet_type != NO_BET
+        amount = players.bet_amount
+        # Одна выборка из строки таблицы выплат на все ставки сразу
+        payout = np.where(has_bet, PAYOUT_MATRIX[number, np.maximum(players.bet_type, 0)], 0) * amount
+        won = payout > 0
+        lost = has_bet & ~won
+        players.balance[won] += payout[won]
+        psycho_won = won & players.is_psycho
+        psycho_gain(players, psycho_won, payout[psycho_won] - amount[psycho_won])
+        psycho_lost = lost & players.is_psycho
+        psycho_loss(players, psycho_lost, amount[psycho_lost], self.params)
+
+        if self.sinks:
+            for index in np.flatnonzero(has_bet):
+                self.emit(EventKind.PAYOUT, actor=players.names[index], tag=BET_BOOK[players.bet_type[index]].name,
+                          amount=int(amount[index]), value=int(payout[index]),
+                          balance=int(players.balance[index]))
+        players.bet_type[:] = NO_BET
+        players.bet_amount[:] = 0
+
+    def goose_steal(self) -> None:
+        players = self.players
+        if len(self.geese) == 0 or len(players) == 0:
+            return
+        available = np.flatnonzero(players.balance > 0)
+        if not len(available):
+            return
+        goose = self.rng.choice(self.geese)
+        index = int(self.rng.choice(available))
+        balance = int(players.balance[index])
+        if balance // 2 > 1: steal_amount = self.rng.randint(1, balance // 2)
+        else: steal_amount = 1
+
+        players.balance[index] = balance - steal_amount
+        if players.is_psycho[index]:
+            psycho_loss(players, [index], steal_amount, self.params)
+        if self.sinks:
+            self.emit(EventKind.STEAL, actor=goose.name, target=players.names[index], amount=steal_amount,
+                      balance=balance - steal_amount)
+
+    def goose_action(self) -> None:
+        players = self.players
+        if len(self.geese) == 0:
+            return
+        goose = self.rng.choice(self.geese)
+        if isinstance(goose, HonkGoose):
+            loss = int(goose.honk_volume) * 2
+            scared = players.balance > loss
+            players.balance[scared] -= loss
+            psycho_loss(players, scared & players.is_psycho, loss, self.params)
+            if self.sinks:
+                self.emit(EventKind.HONK, actor=goose.name, amount=loss // 2, value=loss)
+        if isinstance(goose, RichGoose):
+            money = goose.spend()
+            players.balance[:] += money
+            psycho_gain(players, players.is_psycho, money)
+            if self.sinks:
+                self.emit(EventKind.GIFT, actor=goose.name, amount=money)
+
+    def kill_player(self, killer: int) -> None:
+        """
+        Психопат с индексом killer убивает случайного игрока или себя.
+
+        :param killer: Индекс психопата в хранилище.
+        """
+        players = self.players
+        killer_name = players.names[killer]
+        if len(players) == 1 or self.rng.random() < self.params.suicide_chance:
+            balance = int(players.balance[killer])
+            self.remove_player_at(killer)
+            if self.sinks:
+                self.emit(EventKind.SUICIDE, actor=killer_name, balance=balance)
+        else:
+            others = [i for i in range(len(players)) if i != killer]
+            victim = self.rng.choice(others)
+            victim_name = players.names[victim]
+            money = int(players.balance[victim])
+            players.balance[killer] += money
+            if players.is_psycho[killer]:
+                if money > 0:
+                    psycho_gain(players, [killer], money)
+                else:
+                    psycho_loss(players, [killer], 0, self.params)
+            self.remove_player_at(victim)
+            if self.sinks:
+                killer = killer - 1 if victim < killer else killer
+                self.emit(EventKind.KILL, actor=killer_name, target=victim_name, amount=money,
+                          balance=int(players.balance[killer]))
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.chip import ChipCollection
+from src.events import EventKind, ListSink
+from src.agents import AgentCasino, LatencyStats, LoopClock
+# Классы из тех же модулей, что импортирует движок, иначе не сработает isinstance
+from goose import HonkGoose, RichGoose
+from player import Player, PsychoPlayer
+
+
+def make_casino(**kwargs):
+    options = dict(seed=7, time_scale=20000, max_entities=200, arrival_rate=1.0)
+    options.update(kwargs)
+    return AgentCasino(ChipCollection(), **options)
+
+
+def test_agent_casino_runs_concurrent_agents():
+    casino = make_casino()
+    sink = ListSink()
+    casino.attach_sink(sink)
+    casino.add_player(Player("Alice", 500))
+    casino.add_goose(HonkGoose("Крикун", 2))
+    asyncio.run(casino.run(3000))
+
+    kinds = {event.kind for event in sink.events}
+    assert {EventKind.JOIN, EventKind.BET, EventKind.SPIN} <= kinds
+    assert 0 < casino.spins <= 100
+    assert 20 < len(casino.players) + len(casino.geese) <= 200
+    assert len(casino.latency) > 0
+    assert casino.clock.now() >= 3000
+    steps = [event.step for event in sink.events]
+    assert steps == sorted(steps)
+
+
+def test_bets_only_inside_betting_window():
+    casino = make_casino(arrival_rate=0.0, spin_interval=30.0, betting_window=10.0)
+    window_states = []
+    casino.attach_sink(lambda event: event.kind == EventKind.BET and window_states.append(casino.bets.is_open))
+    for i in range(30):
+        casino.add_player(Player(f"Игрок {i}", 1000))
+    original_spin = casino.spin_wheel
+
+    def spin_checked():
+        # Колесо крутится только при закрытом окне ставок
+        assert not casino.bets.is_open
+        original_spin()
+
+    casino.spin_wheel = spin_checked
+    asyncio.run(casino.run(600))
+    assert window_states and all(window_states)
+    assert casino.spins > 0
+
+
+def test_psycho_agent_can_snap():
+    casino = make_casino(arrival_rate=0.0)
+    psycho = PsychoPlayer("Psycho", 100)
+    casino.add_player(psycho)
+    casino.add_player(Player("Victim", 100))
+    casino.add_goose(RichGoose("Богатый", 1))
+    psycho.psycho = 1.0
+    asyncio.run(casino.run(200))
+    assert len(casino.players) < 2
+
+
+def test_agent_errors_are_raised():
+    casino = make_casino(arrival_rate=0.0)
+    casino.add_player(Player("Alice", 100))
+
+    def broken(player):
+        raise RuntimeError("boom")
+
+    casino.place_player_bet = broken
+    with pytest.raises(RuntimeError):
+        asyncio.run(casino.run(500))
+
+
+def test_agent_casino_validates_schedule():
+    with pytest.raises(ValueError):
+        make_casino(betting_window=40.0, spin_interval=30.0)
+    with pytest.raises(ValueError):
+        LoopClock(0)
+
+
+def test_loop_clock_keeps_time_between_runs():
+    clock = LoopClock(scale=10)
+    assert clock.now() == 0.0
+
+    async def tick():
+        clock.start(asyncio.get_running_loop())
+        await asyncio.sleep(0.01)
+        clock.stop()
+
+    asyncio.run(tick())
+    first = clock.now()
+    assert first >= 0.1
+    asyncio.run(tick())
+    assert clock.now() >= first + 0.1
+    assert "LoopClock" in repr(clock)
+
+
+def test_latency_stats():
+    stats = LatencyStats()
+    assert stats.percentile(99) == 0.0 and stats.mean() == 0.0
+    for value in range(1, 101):
+        stats.add(value / 1000)
+    assert stats.percentile(50) == 0.05
+    assert stats.percentile(99) == 0.099
+    assert stats.max() == 0.1
+    assert stats.mean() == pytest.approx(0.0505)
+    assert "LatencyStats" in repr(stats)
@@ -0,0 +1,144 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analytic import (BalanceModel, StepRates, bet_amounts, bet_multipliers, bet_outcome, expected_house_take,
+                          house_edge)
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+# Классы берутся из тех же модулей, что импортирует движок, иначе не сработает isinstance
+from goose import HonkGoose, RichGoose
+from player import Player, PsychoPlayer
+
+
+@pytest.fixture
+def casino():
+    casino = Casino(ChipCollection(), seed=5, clock=VirtualClock(), headless=True)
+    casino.add_player(Player("Аня", 300))
+    casino.add_player(Player("Боря", 50))
+    casino.add_goose(HonkGoose("Крикун", 3))
+    casino.add_goose(RichGoose("Богач", 1))
+    return casino
+
+
+@pytest.fixture
+def player(casino):
+    player = Player("Наблюдаемый", 100)
+    casino.add_player(player)
+    return player
+
+
+def test_bet_multipliers():
+    multipliers = bet_multipliers()
+    assert sum(multipliers.values()) == pytest.approx(1.0)
+    assert multipliers[36] == pytest.approx(0.05 / 37)
+    assert multipliers[2] == pytest.approx(0.95 * 18 / 37)
+
+
+def test_bet_outcome_matches_enumeration():
+    balance = 40
+    outcome = bet_outcome(balance)
+    assert sum(outcome.values()) == pytest.approx(1.0)
+    amounts = bet_amounts(balance)
+    assert amounts[0] == 11 and amounts[-1] == 40
+    # Каждая ставка в среднем теряет 1/37 своего размера
+    mean = sum(result * p for result, p in outcome.items())
+    assert mean == pytest.approx(balance - sum(amounts) / len(amounts) / 37)
+    assert outcome[balance + 35 * 40] == pytest.approx(0.05 / 37 / len(amounts))
+
+
+def test_house_edge():
+    assert house_edge("красное") == pytest.approx(1 / 37)
+    assert house_edge("стрейт 17") == pytest.approx(1 / 37)
+    assert house_edge("каре 1-5") == pytest.approx(1 / 37)
+
+
+def test_expected_house_take(casino):
+    anya = casino.players.get_player_by_name("Аня")
+    casino.place_bet(anya, "красное", 37)
+    casino.place_bet(anya, "стрейт 3", 74)
+    assert expected_house_take(casino) == pytest.approx(3.0)
+
+
+def test_model_requires_ordinary_player_of_casino(casino):
+    with pytest.raises(ValueError):
+        BalanceModel(casino, Player("Чужой", 100))
+    psycho = PsychoPlayer("Псих", 100)
+    casino.add_player(psycho)
+    with pytest.raises(TypeError):
+        BalanceModel(casino, psycho)
+
+
+def test_rates_follow_casino_weights(casino, player):
+    model = BalanceModel(casino, player, max_balance=500)
+    weights = dict(casino.event_weights)
+    weights.update(casino.event_weights_for(casino.total_balance()))
+    total = sum(weights.values())
+    rates = model.rates(player.balance)
+    assert rates.bet == pytest.approx(weights["player_bet"] / total / 3)
+    assert rates.steal == pytest.approx(weights["goose_steal"] / total / 3)
+    assert rates.honks == {6: pytest.approx(weights["goose_action"] / total / 2)}
+    assert rates.gift == pytest.approx(weights["goose_action"] / total / 2)
+    assert rates.killed == 0.0
+    assert model.rates(0).bet == 0.0 and model.rates(0).steal == 0.0
+
+
+def test_step_matches_transitions(casino, player):
+    casino.add_player(PsychoPlayer("Псих", 80))
+    casino.players.get_player_by_name("Псих").psycho = 0.2
+    model = BalanceModel(casino, player, max_balance=300)
+    distribution = np.random.default_rng(1).random(model.max_balance + 2)
+    distribution /= distribution.sum()
+    expected = np.zeros_like(distribution)
+    expected[-1] = distribution[-1]
+    for balance in range(model.max_balance + 1):
+        for target, p in model.transition(balance).items():
+            expected[target] += distribution[balance] * p
+    result = model.step(distribution)
+    assert result == pytest.approx(expected, abs=1e-12)
+    assert result.sum() == pytest.approx(1.0)
+    assert result[-1] > distribution[-1]
+
+
+def test_ruin_and_forecast(casino, player):
+    model = BalanceModel(casino, player)
+    assert model.ruin_probability(0) == 0.0
+    short, long = model.ruin_probability(20), model.ruin_probability(200)
+    assert 0.0 < short < long < 1.0
+    assert model.ruin_probability(50, balance=0) == pytest.approx(1.0)
+    forecast = model.forecast(200)
+    assert forecast.steps == 200 and forecast.ruin_probability == pytest.approx(long)
+    assert forecast.killed_probability == 0.0
+    assert forecast.mean_balance > 0
+    assert model.distribution(200).sum() == pytest.approx(1.0)
+
+
+class GiftOnlyModel(BalanceModel):
+    """Цепь, которую легко посчитать вручную: каждый шаг с вероятностью 1/2 подарок от 1 до 100."""
+
+    def rates(self, balance):
+        return StepRates(0.0, 0.0, {}, 0.5, 0.0)
+
+
+def test_overflow_probability_matches_hand_computed_chain(casino, player):
+    model = GiftOnlyModel(casino, player, max_balance=100)
+    # С баланса b за один шаг выходит за 100 подарок больше 100 - b: 0.5 * b / 100
+    assert model.overflow_probability(1, balance=60) == pytest.approx(0.3)
+    assert model.overflow_probability(1, balance=0) == 0.0
+    # С нуля: первый подарок a (вероятность 0.005 каждого), затем выход с вероятностью 0.5 * a / 100
+    expected = sum(0.005 * 0.5 * a / 100 for a in range(1, 101))
+    assert expected == pytest.approx(0.12625)
+    assert model.overflow_probability(2, balance=0) == pytest.approx(expected)
+    # Масса в самом max_balance — другое: туда попадают и точные подарки до 100
+    forecast = model.forecast(2, balance=0)
+    assert forecast.overflow_probability == pytest.approx(expected)
+    assert model.distribution(2, balance=0)[100] > expected
+
+
+def test_model_bounds(casino, player):
+    with pytest.raises(ValueError):
+        BalanceModel(casino, player, max_balance=50)
+    model = BalanceModel(casino, player, max_balance=200)
+    with pytest.raises(ValueError):
+        model.initial(201)
@@ -4,7 +4,9 @@ from unittest.mock import patch, MagicMock
 from src.casino import Casino, CasinoBets
 from src.player import Player, PlayerCollection, PsychoPlayer
 from src.goose import Goose, HonkGoose, RichGoose, GooseCollection
-from src.chip import ChipCollection
+from src.chip import Chip, ChipCollection
+from src.clock import VirtualClock
+from src.events import EventKind, ListSink
 
 
 @pytest.fixture
@@ -34,22 +36,22 @@ def test_casino_init_with_seed(casino):
 
 
 def test_casino_make_random_bet(casino):
-    with patch('src.casino.random.choice') as mock_choice, patch('src.casino.random.randint') as mock_randint:
+    with patch.object(casino.rng, 'choice') as mock_choice, patch.object(casino.rng, 'randint') as mock_randint:
         mock_choice.side_effect = [casino.players[0], 'красное']
         mock_randint.return_value = 25
         casino.make_random_bet()
-        assert "TestPlayer" in casino.bets
+        assert casino.players[0].id in casino.bets
         assert casino.players[0].balance == 75
 
 
 @pytest.mark.parametrize("randint_value,expected_balance", [
-    (0, 110),  # Win zero
+    (0, 450),  # Win zero: стрейт платит 35 к 1
     (2, 90),   # Lose black
 ])
 def test_casino_spin_wheel(casino, randint_value, expected_balance):
-    casino.bets.place_bet("TestPlayer", "зеро" if randint_value == 0 else "красное", 10)
+    casino.bets.place_bet(casino.players[0].id, "зеро" if randint_value == 0 else "красное", 10)
     casino.players[0].balance -= 10
-    with patch('src.casino.random.randint', return_value=randint_value):
+    with patch.object(casino.rng, 'randint', return_value=randint_value):
         casino.spin_wheel()
     assert casino.players[0].balance == expected_balance
 
@@ -57,8 +59,22 @@ def test_casino_spin_wheel(casino, randint_value, expected_balance):
 def test_casino_perform_step_with_players(empty_casino):
     empty_casino.players.append(Player("TestPlayer", 100))
     empty_casino.geese.append(HonkGoose("TestGoose", 5))
-    with patch('src.casino.time.sleep'), patch('src.casino.random.choices', return_value=['player_bet']):
+    empty_casino.clock = VirtualClock()
+    with patch.object(empty_casino.event_sampler, 'draw', return_value='player_bet'):
         empty_casino.perform_step()
+    assert empty_casino.clock.now() == 1.5
+
+
+def test_casino_spin_wheel_advances_clock(empty_casino):
+    empty_casino.clock = VirtualClock()
+    empty_casino.spin_wheel()
+    assert empty_casino.clock.now() == 1.0
+
+
+def test_casino_log_extra_has_sim_time(empty_casino):
+    empty_casino.clock = VirtualClock()
+    empty_casino.clock.sleep(3.0)
+    assert empty_casino.log_extra() == {"sim_time": 3.0}
 
 
 def test_casino_evualuate_weights_no_players(empty_casino):
@@ -68,14 +84,14 @@ def test_casino_evualuate_weights_no_players(empty_casino):
 def test_casino_make_random_bet_low_balance(empty_casino):
     player = Player("TestPlayer", 0)
     empty_casino.add_player(player)
-    with patch('src.casino.random.choice', return_value=player), patch('src.casino.random.choices', return_value=['красное']):
+    with patch.object(empty_casino.rng, 'choice', return_value=player), patch('src.casino.BET_SAMPLER.draw', return_value='красное'):
         empty_casino.make_random_bet()
         assert player.balance == 0
 
 
 def test_casino_spin_wheel_player_none(empty_casino):
-    empty_casino.bets.place_bet("NonExistent", "зеро", 10)
-    with patch('src.casino.random.randint', return_value=0):
+    empty_casino.bets.place_bet(999, "зеро", 10)
+    with patch.object(empty_casino.rng, 'randint', return_value=0):
         empty_casino.spin_wheel()  # Should skip the None player
 
 
@@ -97,7 +113,7 @@ def test_casino_goose_action(empty_casino, goose_type):
         goose = RichGoose("TestGoose", 5)
     empty_casino.geese.append(goose)
     empty_casino.players.append(Player("TestPlayer", 100))
-    with patch('src.casino.random.choice', return_value=goose):
+    with patch.object(empty_casino.rng, 'choice', return_value=goose):
         empty_casino.goose_action()  # Should not raise error
 
 
@@ -120,11 +136,9 @@ def test_casino_add_goose(casino):
     (0.9, "Сигма", "goose"),
 ])
 def test_casino_add_random_entity(empty_casino, random_value, name, entity_type):
-    if entity_type == "player":
-        choices_side_effect = [[100], [Player]]  # First for balances, second for player_classes
-    else:
-        choices_side_effect = [[HonkGoose]]  # For goose_classes
-    with patch('src.casino.random.random', return_value=random_value), patch('src.casino.random.choice', return_value=name), patch('src.casino.random.choices', side_effect=choices_side_effect):
+    # Баланс и класс игрока выбираются таблицами псевдонимов по тому же rng.random
+    choices_side_effect = [[HonkGoose]]  # For goose_classes
+    with patch.object(empty_casino.rng, 'random', return_value=random_value), patch.object(empty_casino.rng, 'choice', return_value=name), patch.object(empty_casino.rng, 'choices', side_effect=choices_side_effect):
         initial_count = len(empty_casino.players) if entity_type == "player" else len(empty_casino.geese)
         empty_casino.add_random_entity()
         new_count = len(empty_casino.players) if entity_type == "player" else len(empty_casino.geese)
@@ -140,7 +154,7 @@ def test_casino_kill_player(empty_casino, random_value, expected_players):
     other = Player("Other", 50)
     empty_casino.add_player(psycho)
     empty_casino.add_player(other)
-    with patch('src.casino.random.random', return_value=random_value), patch('src.casino.random.choice', return_value=other):
+    with patch.object(empty_casino.rng, 'random', return_value=random_value), patch.object(empty_casino.rng, 'choice', return_value=other):
         empty_casino.kill_player(psycho)
         assert len(empty_casino.players) == expected_players
 
@@ -152,13 +166,251 @@ def test_casino_set_events_weight_debug(empty_casino):
 
 
 def test_casino_bets_place_bet(casino_bets):
-    casino_bets.place_bet("Alice", "красное", 50)
-    assert "Alice" in casino_bets
-    assert casino_bets["Alice"]["type"] == "красное"
-    assert casino_bets["Alice"]["amount"] == 50
+    casino_bets.place_bet(1, "красное", 50)
+    assert 1 in casino_bets
+    assert casino_bets[1][0].type == "красное"
+    assert casino_bets[1][0].amount == 50
+
 
+def test_casino_bets_multiple_bets_per_player(casino_bets):
+    assert casino_bets.place_bet(1, "красное", 50)
+    assert casino_bets.place_bet(1, "стрейт 0", 30)
+    assert [bet.type for bet in casino_bets[1]] == ["красное", "зеро"]
+    assert casino_bets.stake(1) == 80
+    assert casino_bets.stake(2) == 0
+    assert len(casino_bets) == 1
+    with pytest.raises(ValueError):
+        casino_bets.place_bet(1, "стрейт 37", 5)
 
-def test_casino_bets_place_bet_twice_fails(casino_bets):
-    casino_bets.place_bet("Alice", "красное", 50)
-    casino_bets.place_bet("Alice", "чёрное", 30)  # Should ignore
-    assert casino_bets["Alice"]["type"] == "красное"
+
+def test_casino_headless_has_no_sinks():
+    casino = Casino(ChipCollection(), seed=1, clock=VirtualClock(), headless=True)
+    with patch('src.casino.logger') as mock_logger:
+        for _ in range(50):
+            casino.perform_step()
+    assert casino.sinks == []
+    mock_logger.debug.assert_not_called()
+    assert casino.step_count == 50
+
+
+def test_casino_attached_sink_receives_events():
+    casino = Casino(ChipCollection(), seed=1, clock=VirtualClock(), headless=True)
+    sink = ListSink()
+    casino.attach_sink(sink)
+    for _ in range(200):
+        casino.perform_step()
+    kinds = {e.kind for e in sink.events}
+    assert EventKind.JOIN in kinds
+    assert EventKind.BET in kinds
+    casino.detach_sink(sink)
+    assert casino.sinks == []
+
+
+def test_casino_spin_wheel_emits_payout(casino):
+    sink = ListSink()
+    casino.sinks = [sink]
+    casino.bets.place_bet(casino.players[0].id, "зеро", 10)
+    with patch.object(casino.rng, 'randint', return_value=0):
+        casino.spin_wheel()
+    spin, payout = sink.events
+    assert spin.kind == EventKind.SPIN and spin.amount == 0
+    assert payout.kind == EventKind.PAYOUT and payout.value == 360 and payout.balance == 460
+
+
+def test_casino_make_random_bet_no_available_players(empty_casino):
+    empty_casino.add_player(Player("Broke", 0))
+    empty_casino.make_random_bet()
+    assert len(empty_casino.bets) == 0
+
+
+def test_casino_goose_steal_everyone_broke(empty_casino):
+    empty_casino.add_player(Player("Broke", 0))
+    empty_casino.add_goose(HonkGoose("Goose", 1))
+    empty_casino.goose_steal()
+    assert empty_casino.players[0].balance == 0
+
+
+def test_casino_remove_player_drops_bet_by_id(casino):
+    player = casino.players[0]
+    casino.bets.place_bet(player.id, "красное", 10)
+    casino.remove_player(player)
+    assert len(casino.bets) == 0
+    assert casino.players["TestPlayer"] is None
+
+
+def test_casino_aggregates_stay_consistent():
+    casino = Casino(ChipCollection(), seed=3, clock=VirtualClock(), headless=True)
+    for _ in range(2000):
+        casino.perform_step()
+        assert casino.total_balance() == sum(p.balance for p in casino.players)
+    psychos = sum(1 for p in casino.players if type(p).__name__ == "PsychoPlayer")
+    assert casino.psycho_count() == psychos
+    assert casino.geese.count_of(object) == len(casino.geese)
+
+
+def test_full_casino_of_geese_idles():
+    casino = Casino(ChipCollection(), seed=1, clock=VirtualClock(), headless=True, max_entities=3)
+    for index in range(3):
+        casino.add_goose(HonkGoose(f"Гусь {index}", 1))
+    for _ in range(10):
+        casino.perform_step()
+    assert casino.step_count == 10 and len(casino.geese) == 3 and len(casino.players) == 0
+
+
+def test_casino_without_unit_chip_keeps_plain_balances():
+    chips = ChipCollection([Chip("Красный", 5), Chip("Зелёный", 25)])
+    casino = Casino(chips, seed=3, clock=VirtualClock(), headless=True)
+    plain = Casino(ChipCollection(), seed=3, clock=VirtualClock(), headless=True)
+    assert casino.chip_rack is None
+    for _ in range(500):
+        casino.perform_step()
+        plain.perform_step()
+    assert all(player.chips is None for player in casino.players)
+    assert [p.balance for p in casino.players] == [p.balance for p in plain.players]
+
+
+def test_casino_settles_in_chips():
+    chips = ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Зелёный", 25), Chip("Чёрный", 100)])
+    casino = Casino(chips, seed=3, clock=VirtualClock(), headless=True)
+    plain = Casino(ChipCollection(), seed=3, clock=VirtualClock(), headless=True)
+    sink = ListSink()
+    casino.attach_sink(sink)
+    rack = casino.chip_rack
+    for _ in range(3000):
+        casino.perform_step()
+        plain.perform_step()
+        # Все фишки выдаёт касса: ставки, выигрыши, покупки, подарки, кражи, убийства и уходы идут через неё,
+        # поэтому минус в кассе равен стоимости фишек на руках
+        assert rack.value(rack.tray) == -sum(rack.value(p.chips) for p in casino.players)
+    for player in casino.players:
+        assert rack.value(player.chips) == player.balance
+        assert min(player.chips) >= 0
+    kinds = {event.kind for event in sink.events}
+    assert {EventKind.STEAL, EventKind.HONK, EventKind.GIFT, EventKind.KILL, EventKind.SUICIDE} <= kinds
+    # Фишки не расходуют генератор: без них казино приходит к тому же состоянию
+    assert [p.balance for p in casino.players] == [p.balance for p in plain.players]
+    assert plain.chip_rack is None
+
+
+def test_find_killer_uses_insertion_order(casino):
+    # Класс из того же модуля, что импортирует казино, иначе индекс психоза его не увидит
+    from player import PsychoPlayer as EnginePsychoPlayer
+    first, second = EnginePsychoPlayer("P1", 10), EnginePsychoPlayer("P2", 10)
+    casino.add_player(first)
+    casino.add_player(second)
+    second.psycho = 0.9
+    first.psycho = 0.6
+    assert casino.psycho_count() == 2
+    assert casino.find_killer(0.5) is first
+    assert casino.find_killer(0.7) is second
+    assert casino.find_killer(0.95) is None
+
+
+def test_set_events_weight_rebuilds_sampler_only_on_change(empty_casino):
+    sampler = empty_casino.event_sampler
+    assert sampler.draw(empty_casino.rng) == "new_entity"
+    cached = sampler._cum_weights
+    empty_casino.set_events_weight({"new_entity": 1.0, "spin_wheel": 0.0})
+    assert sampler._cum_weights is cached
+    empty_casino.set_events_weight({"new_entity": 0.0, "spin_wheel": 2.0})
+    assert empty_casino.event_weights["spin_wheel"] == 2.0
+    assert sampler.draw(empty_casino.rng) == "spin_wheel"
+
+
+def test_goose_action_without_geese(empty_casino):
+    empty_casino.add_player(Player("TestPlayer", 100))
+    empty_casino.goose_action()  # Все гуси ушли — действие пропускается
+    assert empty_casino.players[0].balance == 100
+
+
+def test_remove_goose_returns_name(casino):
+    goose = casino.geese[0]
+    casino.remove_goose(goose)
+    assert len(casino.geese) == 0
+    assert casino.geese.count_of(HonkGoose) == 0
+    assert casino.goose_names[-1] == "TestGoose"
+
+
+def test_casino_grows_past_base_name_pool():
+    casino = Casino(ChipCollection(), seed=1, clock=VirtualClock(), headless=True, max_entities=300)
+    for _ in range(3000):
+        casino.perform_step()
+    names = [p.name for p in casino.players] + [g.name for g in casino.geese]
+    assert 20 < len(names) <= 300
+    assert len(set(names)) == len(names)
+
+
+def test_casino_max_entities_is_hard_limit(empty_casino):
+    casino = Casino(ChipCollection(), seed=2, clock=VirtualClock(), headless=True, max_entities=3)
+    for _ in range(200):
+        casino.add_random_entity()
+    assert len(casino.players) + len(casino.geese) == 3
+    casino.evualuate_weights()
+    assert casino.event_weights["new_entity"] == 0.0
+    with pytest.raises(ValueError):
+        Casino(ChipCollection(), max_entities=0)
+
+
+def test_casino_bets_window():
+    bets = CasinoBets()
+    assert bets.place_bet(1, "зеро", 5)
+    bets.close_window()
+    assert not bets.place_bet(2, "красное", 5)
+    bets.open_window()
+    assert bets.place_bet(2, "красное", 5)
+    assert set(bets) == {1, 2}
+
+
+def test_casino_place_bet_settles_every_bet(empty_casino):
+    player = PsychoPlayer("Gambler", 100)
+    empty_casino.add_player(player)
+    sink = ListSink()
+    empty_casino.attach_sink(sink)
+    assert empty_casino.place_bet(player, "стрейт 17", 10)
+    assert empty_casino.place_bet(player, "сплит 17-20", 10)
+    assert empty_casino.place_bet(player, "каре 1-5", 10)
+    assert empty_casino.place_bet(player, "дюжина 1", 10)
+    assert empty_casino.place_bet(player, "колонна 2", 10)
+    assert empty_casino.place_bet(player, "нечет", 10)
+    assert not empty_casino.place_bet(player, "чёт", 100)
+    assert player.balance == 40
+    with patch.object(empty_casino.rng, 'randint', return_value=17):
+        empty_casino.spin_wheel()
+    payouts = {e.tag: e.value for e in sink.events if e.kind == EventKind.PAYOUT}
+    assert payouts == {"стрейт 17": 360, "сплит 17-20": 180, "каре 1-5": 0, "дюжина 1": 0,
+                       "колонна 2": 30, "нечет": 20}
+    assert player.balance == 40 + 590
+    assert len(empty_casino.bets) == 0
+
+
+@pytest.mark.parametrize("chips", [ChipCollection(), ChipCollection([Chip("Белый", 1), Chip("Красный", 5)])])
+@pytest.mark.parametrize("amount", [0, -5, -500])
+def test_casino_place_bet_rejects_non_positive_amount(chips, amount):
+    casino = Casino(chips, seed=1, clock=VirtualClock(), headless=True)
+    player = Player("Gambler", 100)
+    casino.add_player(player)
+    tray = list(casino.chip_rack.tray) if casino.chip_rack is not None else None
+    with pytest.raises(ValueError):
+        casino.place_bet(player, "красное", amount)
+    assert player.balance == 100
+    assert len(casino.bets) == 0
+    if tray is not None:
+        assert casino.chip_rack.tray == tray
+        assert casino.chip_rack.value(player.chips) == 100
+
+
+def test_casino_place_bet_rejects_over_balance(empty_casino):
+    player = Player("Gambler", 100)
+    empty_casino.add_player(player)
+    assert not empty_casino.place_bet(player, "красное", 101)
+    assert player.balance == 100
+    assert len(empty_casino.bets) == 0
+    assert empty_casino.place_bet(player, "красное", 100)
+    assert player.balance == 0
+
+
+def test_casino_bets_reject_non_positive_amount(casino_bets):
+    for amount in (0, -1):
+        with pytest.raises(ValueError):
+            casino_bets.place_bet(1, "красное", amount)
+    assert len(casino_bets) == 0
@@ -1,5 +1,5 @@
 import pytest
-from src.chip import Chip, ChipCollection
+from src.chip import Chip, ChipCollection, ChipRack
 
 
 def test_chip_init():
@@ -7,6 +7,12 @@ def test_chip_init():
     assert chip.value == 10
 
 
+def test_chip_has_no_instance_dict():
+    chip = Chip("red", 10)
+    assert not hasattr(chip, "__dict__")
+    assert (chip.color, chip.value) == ("red", 10)
+
+
 def test_chip_add():
     chip1 = Chip("red", 10)
     chip2 = Chip("blue", 20)
@@ -87,3 +93,85 @@ def test_chip_collection_iter():
     cc.append(chip)
     for c in cc:
         assert c == chip
+
+
+def standard_rack():
+    return ChipRack(ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Зелёный", 25), Chip("Чёрный", 100)]))
+
+
+def min_chips(values, amount):
+    best = [0] + [amount + 1] * amount
+    for x in range(1, amount + 1):
+        best[x] = min(best[x - v] + 1 for v in values if v <= x)
+    return best[amount]
+
+
+def test_chip_hash_matches_eq():
+    assert hash(Chip("red", 5)) == hash(Chip("red", 5))
+    assert len({Chip("red", 5), Chip("blue", 5), Chip("red", 5)}) == 2
+
+
+@pytest.mark.parametrize("values", [(1, 5, 25, 100), (1, 3, 4), (1, 7, 10), (1,)])
+def test_chip_rack_change_is_minimal(values):
+    rack = ChipRack(ChipCollection([Chip(str(v), v) for v in values]))
+    for amount in list(range(0, 300)) + [999, 1000, 1001, 12345]:
+        change = rack.change(amount)
+        assert rack.value(change) == amount
+        assert sum(change) == min_chips(values, amount)
+
+
+def test_chip_rack_orders_and_dedups_denominations():
+    rack = ChipRack(ChipCollection([Chip("Красный", 5), Chip("Белый", 1), Chip("Розовый", 5)]))
+    assert rack.values == (5, 1)
+    assert rack.colors == ("Красный", "Белый")
+    assert rack.change(12) == [2, 2]
+
+
+def test_chip_rack_requires_unit_chip():
+    with pytest.raises(ValueError):
+        ChipRack(ChipCollection([Chip("Красный", 5)]))
+    with pytest.raises(ValueError):
+        ChipRack(ChipCollection())
+    with pytest.raises(ValueError):
+        standard_rack().change(-1)
+
+
+def test_chip_rack_tray():
+    rack = standard_rack()
+    rack.deposit(130)
+    assert rack.tray == [1, 1, 1, 0]
+    rack.withdraw(6)
+    assert rack.tray == [1, 1, 0, -1]
+    assert rack.value(rack.tray) == 124
+    # Фишки уходящего игрока касса принимает как есть, без размена
+    rack.cash_in([0, 0, 0, 7])
+    assert rack.tray == [1, 1, 0, 6]
+
+
+def test_chip_rack_settle():
+    rack = standard_rack()
+    holding = rack.change(100)
+    rack.settle(holding, 100, 105)
+    assert holding == [1, 0, 1, 0]
+    rack.settle(holding, 105, 110)
+    assert holding == [1, 0, 2, 0]
+    # Платёж: касса меняет фишки игрока, стоимость кассы не меняется
+    rack.settle(holding, 110, 30)
+    assert holding == [0, 1, 1, 0]
+    assert rack.value(rack.tray) == 0
+
+
+def test_chip_rack_settle_large_amounts():
+    rack = standard_rack()
+    holding = rack.change(50_000)
+    rack.settle(holding, 50_000, 70_003)
+    assert holding == [700, 0, 0, 3]
+    rack.settle(holding, 70_003, 12_345)
+    assert holding == rack.change(12_345)
+    assert rack.value(rack.tray) == 0
+    with pytest.raises(ValueError):
+        rack.settle(holding, 12_345, -1)
+    holding = rack.change(5)
+    with pytest.raises(ValueError):
+        rack.settle(holding, 5, -1)
+    assert holding == rack.change(5)
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import patch
+
+from src.clock import Clock, RealTimeClock, VirtualClock, ScaledClock, make_clock
+
+
+def test_virtual_clock_advances_without_sleeping():
+    clock = VirtualClock()
+    with patch('src.clock.time.sleep') as mock_sleep:
+        clock.sleep(1.5)
+        clock.sleep(1.0)
+    assert clock.now() == 2.5
+    mock_sleep.assert_not_called()
+
+
+def test_real_time_clock_sleeps():
+    clock = RealTimeClock()
+    with patch('src.clock.time.sleep') as mock_sleep:
+        clock.sleep(1.5)
+    mock_sleep.assert_called_once_with(1.5)
+    assert clock.now() == 1.5
+
+
+def test_scaled_clock_sleeps_less():
+    clock = ScaledClock(100)
+    with patch('src.clock.time.sleep') as mock_sleep:
+        clock.sleep(1.5)
+    mock_sleep.assert_called_once_with(0.015)
+    assert clock.now() == 1.5
+
+
+def test_scaled_clock_rejects_bad_factor():
+    with pytest.raises(ValueError):
+        ScaledClock(0)
+
+
+def test_base_clock_is_abstract():
+    with pytest.raises(TypeError):
+        Clock()
+
+    class NoWait(Clock):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWait()
+
+
+@pytest.mark.parametrize("pace,clock_type", [
+    ("real", RealTimeClock),
+    ("virtual", VirtualClock),
+    ("100x", ScaledClock),
+    ("2.5", ScaledClock),
+])
+def test_make_clock(pace, clock_type):
+    assert isinstance(make_clock(pace), clock_type)
+
+
+def test_make_clock_factor():
+    assert make_clock("100x").factor == 100.0
+
+
+def test_make_clock_unknown_pace():
+    with pytest.raises(ValueError):
+        make_clock("fast")
+
+
+@pytest.mark.parametrize("pace", ["nanx", "nan", "infx", "-infx", "0x", "-5x"])
+def test_make_clock_rejects_non_finite_and_non_positive_factor(pace):
+    with pytest.raises(ValueError):
+        make_clock(pace)
+
+
+def test_clock_repr():
+    assert "VirtualClock" in repr(VirtualClock())
+    assert "factor=10" in repr(ScaledClock(10))
+
+
+def test_clock_reset():
+    clock = VirtualClock()
+    clock.sleep(2.0)
+    clock.reset(10.0)
+    assert clock.now() == 10.0
@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from src.config import AsyncLogging, BatchingFileHandler, BoundedQueueHandler, logging_mode
+
+
+class SlowHandler(logging.Handler):
+    """Обработчик, который имитирует медленный терминал или диск."""
+
+    def __init__(self, delay=0.0, gate=None):
+        super().__init__()
+        self.delay = delay
+        self.gate = gate
+        self.messages = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("test_config")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def test_batching_file_handler_writes_batches(tmp_path):
+    path = tmp_path / "sim.log"
+    handler = BatchingFileHandler(path, batch_size=100, flush_interval=60.0, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    record = logging.LogRecord("x", logging.DEBUG, __file__, 1, "запись %d", (1,), None)
+    handler.handle(record)
+    assert path.read_text(encoding="utf-8") == ""
+    for _ in range(20):
+        handler.handle(record)
+    assert path.read_text(encoding="utf-8").count("запись 1") >= 10
+    handler.close()
+    assert path.read_text(encoding="utf-8").count("запись 1") == 21
+
+
+def test_batching_file_handler_counts_bytes(tmp_path):
+    path = tmp_path / "sim.log"
+    handler = BatchingFileHandler(path, batch_size=100, flush_interval=60.0, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    # 60 символов кириллицы — 120 байт: пачка сбрасывается сразу
+    handler.handle(logging.LogRecord("x", logging.DEBUG, __file__, 1, "я" * 60, None, None))
+    assert path.read_text(encoding="utf-8") == "я" * 60 + "\n"
+    handler.close()
+
+
+def test_batching_file_handler_flushes_quiet_logger_on_timer(tmp_path):
+    path = tmp_path / "sim.log"
+    handler = BatchingFileHandler(path, batch_size=64 * 1024, flush_interval=0.05, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.handle(logging.LogRecord("x", logging.DEBUG, __file__, 1, "одна запись", None, None))
+    deadline = time.monotonic() + 5.0
+    while not path.exists() or not path.read_text(encoding="utf-8"):
+        assert time.monotonic() < deadline, "пачка не сброшена по таймеру"
+        time.sleep(0.01)
+    assert path.read_text(encoding="utf-8") == "одна запись\n"
+    handler.close()
+
+
+def test_batching_file_handler_rotates(tmp_path):
+    path = tmp_path / "sim.log"
+    handler = BatchingFileHandler(path, maxBytes=200, backupCount=2, batch_size=50, flush_interval=60.0)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(100):
+        handler.handle(logging.LogRecord("x", logging.DEBUG, __file__, 1, "строка %03d", (i,), None))
+    handler.close()
+    assert (tmp_path / "sim.log.1").exists()
+    assert path.stat().st_size < 200 + 50
+
+
+def test_queue_handler_snapshots_arguments():
+    handler = BoundedQueueHandler(10)
+    weights = {"player_bet": 1.0}
+    handler.handle(logging.LogRecord("x", logging.DEBUG, __file__, 1, "веса %s", (weights,), None))
+    weights["player_bet"] = 0.0
+    record = handler.queue.get_nowait()
+    assert record.getMessage() == "веса {'player_bet': 1.0}"
+
+
+def test_queue_handler_drops_when_full():
+    handler = BoundedQueueHandler(2, policy="drop")
+    for i in range(5):
+        handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "%d", (i,), None))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_queue_handler_validates():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(10, policy="wait")
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(0)
+    with pytest.raises(ValueError):
+        logging_mode("threads")
+    with pytest.raises(ValueError):
+        logging_mode("sync", policy="wait")
+
+
+def test_async_logging_does_not_wait_for_io(logger):
+    slow = SlowHandler(delay=0.05)
+    logger.addHandler(slow)
+    started = time.perf_counter()
+    with AsyncLogging(queue_size=100, policy="block", logger=logger) as logs:
+        assert logs.queue_handler in logger.handlers and slow not in logger.handlers
+        for i in range(10):
+            logger.info("шаг %d", i)
+        submitted = time.perf_counter() - started
+    assert submitted < 0.25
+    assert slow.messages == [f"шаг {i}" for i in range(10)]
+    assert slow in logger.handlers and logs.queue_handler not in logger.handlers
+
+
+def test_async_logging_drop_policy(logger):
+    gate = threading.Event()
+    slow = SlowHandler(gate=gate)
+    logger.addHandler(slow)
+    with AsyncLogging(queue_size=5, policy="drop", logger=logger) as logs:
+        for i in range(50):
+            logger.info("шаг %d", i)
+        gate.set()
+    # Фоновый поток успел забрать из очереди не больше одной записи до того, как она заполнилась
+    assert 5 <= len(slow.messages) - 1 <= 6
+    assert logs.dropped == 50 - (len(slow.messages) - 1)
+    assert slow.messages[-1] == f"Очередь логов переполнялась, отброшено записей: {logs.dropped}"
+
+
+def test_async_logging_block_policy_keeps_everything(logger):
+    slow = SlowHandler(delay=0.001)
+    logger.addHandler(slow)
+    with AsyncLogging(queue_size=2, policy="block", logger=logger) as logs:
+        for i in range(30):
+            logger.info("шаг %d", i)
+    assert logs.dropped == 0
+    assert len(slow.messages) == 30
+
+
+def test_logging_mode():
+    assert not isinstance(logging_mode("sync"), AsyncLogging)
+    logs = logging_mode("async", 100, "block")
+    assert isinstance(logs, AsyncLogging)
+    assert logs.queue_handler.policy == "block"
@@ -0,0 +1,80 @@
+import math
+
+from src.ensemble import (SummarySink, replica_seeds, run_replica, run_ensemble, estimate, aggregate,
+                          ReplicaSummary)
+from src.events import Event, EventKind
+from src.params import DEFAULT_PARAMS
+
+
+def test_replica_seeds_deterministic():
+    assert replica_seeds(7, 5) == replica_seeds(7, 5)
+    assert replica_seeds(7, 5)[:3] == replica_seeds(7, 3)
+    assert len(set(replica_seeds(7, 100))) == 100
+
+
+def test_run_replica_reproducible():
+    first = run_replica(0, 123, 300)
+    second = run_replica(0, 123, 300)
+    assert first == second
+    assert first.event_counts["JOIN"] > 0
+
+
+def test_run_ensemble_inline():
+    summaries = list(run_ensemble(4, 100, base_seed=1, workers=1))
+    assert [s.index for s in summaries] == [0, 1, 2, 3]
+
+
+def test_run_ensemble_process_pool_matches_inline():
+    inline = list(run_ensemble(3, 200, base_seed=5, workers=1))
+    pooled = sorted(run_ensemble(3, 200, base_seed=5, workers=2), key=lambda s: s.index)
+    assert pooled == inline
+
+
+def test_run_ensemble_passes_params_to_every_replica():
+    params = DEFAULT_PARAMS._replace(suicide_chance=1.0, player_class_weights=(0.0, 1.0))
+    expected = [run_replica(index, seed, 300, params=params) for index, seed in enumerate(replica_seeds(2, 3))]
+    assert list(run_ensemble(3, 300, base_seed=2, workers=1, params=params)) == expected
+    assert sorted(run_ensemble(3, 300, base_seed=2, workers=2, params=params), key=lambda s: s.index) == expected
+    assert list(run_ensemble(3, 300, base_seed=2, workers=1)) != expected
+
+
+def test_summary_sink_tracks_money_and_lifetimes():
+    sink = SummarySink()
+    sink(Event(1, 0.0, EventKind.JOIN, actor="Alice", tag="Player", balance=100))
+    sink(Event(2, 0.0, EventKind.JOIN, actor="Bob", tag="PsychoPlayer", balance=100))
+    sink(Event(3, 0.0, EventKind.JOIN, actor="Goose", tag="HonkGoose", amount=3))
+    sink(Event(4, 0.0, EventKind.BET, actor="Alice", amount=40))
+    sink(Event(5, 0.0, EventKind.PAYOUT, actor="Alice", amount=40, value=80))
+    sink(Event(9, 0.0, EventKind.KILL, actor="Bob", target="Alice"))
+    sink(Event(10, 0.0, EventKind.SUICIDE, actor="Bob"))
+    assert sink.total_staked == 40
+    assert sink.total_paid == 80
+    assert sink.lifetimes == [8, 8]
+    assert sink.mean_lifetime(20) == 8.0
+    assert sink.counts[EventKind.JOIN] == 3
+
+
+def test_summary_sink_empty_lifetime():
+    assert SummarySink().mean_lifetime(10) == 0.0
+
+
+def test_replica_summary_properties():
+    summary = ReplicaSummary(0, 1, 10, [0, 0], {"KILL": 2}, 100, 90, 5.0)
+    assert math.isclose(summary.house_edge, 0.1)
+    assert summary.ruined
+    assert summary.kills == 2
+    assert ReplicaSummary(0, 1, 10, [5], {}, 0, 0, 0.0).house_edge == 0.0
+
+
+def test_estimate():
+    assert math.isnan(estimate([]).mean)
+    assert estimate([3.0]) == (3.0, 3.0, 3.0)
+    mean, low, high = estimate([1.0, 2.0, 3.0, 4.0])
+    assert mean == 2.5
+    assert low < mean < high
+
+
+def test_aggregate_keys():
+    summaries = list(run_ensemble(2, 100, base_seed=3, workers=1))
+    result = aggregate(summaries)
+    assert set(result) == {"house_edge", "ruin_probability", "kills", "final_total_balance", "mean_lifetime"}
@@ -0,0 +1,83 @@
+import pytest
+
+from src.events import Event, EventKind
+from src.event_stream import EventStreamWriter, EventStreamReader, RECORD, MAGIC
+
+
+@pytest.fixture
+def events():
+    return [
+        Event(1, 0.0, EventKind.JOIN, actor="Alice", tag="Player", balance=100),
+        Event(2, 1.5, EventKind.BET, actor="Alice", tag="красное", amount=30, balance=70),
+        Event(3, 4.0, EventKind.SPIN, tag="красное", amount=1),
+        Event(3, 4.0, EventKind.PAYOUT, actor="Alice", tag="красное", amount=30, value=60, balance=130),
+        Event(4, 5.5, EventKind.KILL, actor="Bob", target="Alice", amount=130, balance=180),
+    ]
+
+
+@pytest.fixture
+def stream_path(tmp_path, events):
+    path = str(tmp_path / "events.bin")
+    with EventStreamWriter(path) as writer:
+        for event in events:
+            writer(event)
+    return path
+
+
+def test_event_stream_roundtrip(stream_path, events):
+    with EventStreamReader(stream_path) as reader:
+        assert len(reader) == len(events)
+        assert list(reader) == events
+        assert reader[1] == events[1]
+        assert reader[-1] == events[-1]
+
+
+def test_event_stream_fixed_width(stream_path, events):
+    import os
+    assert os.path.getsize(stream_path) == len(MAGIC) + RECORD.size * len(events)
+
+
+def test_event_stream_columns(stream_path):
+    with EventStreamReader(stream_path) as reader:
+        assert reader.column("amount") == [0, 30, 1, 30, 130]
+        assert reader.column("actor") == ["Alice", "Alice", "", "Alice", "Bob"]
+        assert reader.column("kind")[0] == EventKind.JOIN
+
+
+def test_event_stream_of_kind(stream_path):
+    with EventStreamReader(stream_path) as reader:
+        payouts = reader.of_kind(EventKind.PAYOUT)
+    assert len(payouts) == 1
+    assert payouts[0].value == 60
+
+
+def test_event_stream_index_out_of_range(stream_path):
+    with EventStreamReader(stream_path) as reader:
+        with pytest.raises(IndexError):
+            reader[100]
+
+
+def test_event_stream_append(stream_path, events):
+    with EventStreamWriter(stream_path) as writer:
+        writer(Event(5, 7.0, EventKind.SUICIDE, actor="Bob", balance=180))
+        writer(Event(6, 8.5, EventKind.JOIN, actor="Carol", tag="Player", balance=50))
+    with EventStreamReader(stream_path) as reader:
+        assert len(reader) == len(events) + 2
+        assert reader[-1].actor == "Carol"
+        assert reader[-2].actor == "Bob"
+
+
+@pytest.mark.parametrize("content", [b"", b"garbage!garbage!"])
+def test_event_stream_rejects_foreign_file(tmp_path, content):
+    path = tmp_path / "foreign.bin"
+    path.write_bytes(content)
+    (tmp_path / "foreign.bin.names").write_text("\n")
+    with pytest.raises(ValueError):
+        EventStreamReader(str(path))
+
+
+def test_event_stream_writer_rejects_foreign_file(tmp_path):
+    path = tmp_path / "foreign.bin"
+    path.write_bytes(b"garbage!garbage!")
+    with pytest.raises(ValueError):
+        EventStreamWriter(str(path))
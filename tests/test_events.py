@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.events import Event, EventKind, LoggingSink, ListSink
+
+
+@pytest.mark.parametrize("event,calls", [
+    (Event(1, 1.5, EventKind.BET, actor="Alice", tag="красное", amount=10, balance=90), 1),
+    (Event(1, 1.5, EventKind.SPIN, tag="зеро", amount=0), 2),
+    (Event(1, 1.5, EventKind.PAYOUT, actor="Alice", tag="зеро", amount=10, value=20, balance=110), 1),
+    (Event(1, 1.5, EventKind.PAYOUT, actor="Alice", tag="зеро", amount=10, value=0, balance=90), 1),
+    (Event(1, 1.5, EventKind.STEAL, actor="Goose", target="Alice", amount=5, balance=85), 1),
+    (Event(1, 1.5, EventKind.HONK, actor="Goose", amount=3, value=6), 2),
+    (Event(1, 1.5, EventKind.GIFT, actor="Goose", amount=7), 1),
+    (Event(1, 1.5, EventKind.JOIN, actor="Alice", tag="PsychoPlayer", balance=100), 1),
+    (Event(1, 1.5, EventKind.JOIN, actor="Goose", tag="HonkGoose", amount=3), 1),
+    (Event(1, 1.5, EventKind.KILL, actor="Alice", target="Bob", amount=50, balance=150), 1),
+    (Event(1, 1.5, EventKind.SUICIDE, actor="Alice", balance=0), 1),
+])
+def test_logging_sink_renders_every_kind(event, calls):
+    logger = MagicMock()
+    LoggingSink(logger)(event)
+    assert logger.info.call_count == calls
+    assert logger.info.call_args.kwargs["extra"] == {"sim_time": 1.5}
+
+
+def test_logging_sink_payout_result():
+    logger = MagicMock()
+    sink = LoggingSink(logger)
+    sink(Event(1, 0.0, EventKind.PAYOUT, actor="Alice", tag="зеро", amount=10, value=20, balance=110))
+    assert "ВЫИГРАЛ" in logger.info.call_args.args
+    sink(Event(1, 0.0, EventKind.PAYOUT, actor="Alice", tag="зеро", amount=10, value=0, balance=90))
+    assert "ПРОИГРАЛ" in logger.info.call_args.args
+
+
+def test_list_sink_collects_events():
+    sink = ListSink()
+    sink(Event(1, 0.0, EventKind.GIFT, actor="Goose", amount=7))
+    assert len(sink) == 1
+    assert sink.events[0].amount == 7
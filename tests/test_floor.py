@@ -0,0 +1,147 @@
+import pytest
+
+from src.floor import Floor, Migrant, Table, TableShard, floor_totals
+from src.constants import ENTITIES_MAX_COUNT
+
+
+def populated_table(table_id=0, seed=1, migration_rate=0.0):
+    table = Table(table_id, seed, migration_rate)
+    for _ in range(40):
+        table.step()
+    return table
+
+
+def test_table_release_and_admit_roundtrip():
+    source, target = populated_table(0, 1), populated_table(1, 2)
+    before = source.casino.total_balance() + target.casino.total_balance()
+    migrants = [source.release(0), source.release(source.population - 1)]
+    assert migrants[0].is_player and not migrants[1].is_player
+    for migrant in migrants:
+        target.admit(migrant)
+    assert source.casino.total_balance() + target.casino.total_balance() >= before
+    assert target.casino.players[-1].name == migrants[0].name
+    assert target.casino.geese[-1].name == migrants[1].name
+    assert source.summary().migrated_out == 2
+    assert target.summary().migrated_in == 2
+
+
+def test_table_release_refunds_open_bet():
+    table = populated_table()
+    player = table.casino.players[0]
+    table.casino.bets.place_bet(player.id, "зеро", 10)
+    player.balance -= 10
+    balance = player.balance
+    migrant = table.release(0)
+    assert migrant.balance == balance + 10
+    assert player.id not in table.casino.bets
+
+
+def test_table_admits_psycho_level():
+    table = populated_table()
+    table.admit(Migrant(5, "PsychoPlayer", "Гость", 70, psycho=0.8))
+    guest = table.casino.players[-1]
+    assert guest.psycho == 0.8
+    assert table.casino.find_killer(0.7) is not None
+
+
+def test_table_shard_handles_messages():
+    shard = TableShard([Table(0, 1, 0.5), Table(1, 2, 0.5)])
+    command, migrants, populations = shard.handle(("epoch", 30, {}))
+    assert command == "epoch"
+    assert set(populations) == {0, 1}
+    assert all(isinstance(m, Migrant) for m in migrants)
+    command, bounced, populations = shard.handle(("admit", {1: migrants}))
+    # За полный стол никто не садится: лишние возвращаются менеджеру
+    assert command == "admitted" and populations[1] <= ENTITIES_MAX_COUNT
+    admitted = len(migrants) - len(bounced)
+    command, summaries = shard.handle(("summary",))
+    assert [s.steps for s in summaries] == [30, 30]
+    assert summaries[1].migrated_in == admitted
+    with pytest.raises(ValueError):
+        shard.handle(("dance",))
+
+
+def test_floor_route_respects_capacity():
+    floor = Floor(3, workers=1)
+    floor.populations = {0: 5, 1: ENTITIES_MAX_COUNT, 2: 3}
+    admits = floor.route([Migrant(0, "Player", "A", 10), Migrant(2, "Player", "B", 10)])
+    assert admits == {0: {2: [Migrant(0, "Player", "A", 10)], 0: [Migrant(2, "Player", "B", 10)]}}
+
+
+def test_floor_route_counts_departures_once_and_turns_away_when_full():
+    floor = Floor(2, workers=1, max_entities=4)
+    # Численность уже без ушедших: место за своим столом освободилось
+    floor.populations = {0: 3, 1: 4}
+    assert floor.route([Migrant(0, "Player", "A", 10)]) == {0: {0: [Migrant(0, "Player", "A", 10)]}}
+    assert floor.populations == {0: 4, 1: 4}
+    assert floor.route([Migrant(1, "Player", "B", 10)]) == {}
+    assert floor.turned_away == 1
+
+
+def test_table_admit_bounces_when_full():
+    table = Table(0, 1, max_entities=3)
+    for index in range(3):
+        assert table.admit(Migrant(1, "Player", f"Гость {index}", 10))
+    assert not table.admit(Migrant(1, "Player", "Лишний", 10))
+    assert table.population == 3 and table.migrated_in == 3
+    shard = TableShard([table])
+    _, bounced, populations = shard.handle(("admit", {0: [Migrant(1, "HonkGoose", "Кряк", honk_volume=1)]}))
+    assert bounced == [Migrant(1, "HonkGoose", "Кряк", honk_volume=1)] and populations == {0: 3}
+
+
+@pytest.mark.parametrize("sync, sync_steps", [("barrier", 1), ("barrier", 5), ("async", 1)])
+def test_floor_populations_stay_within_max_entities(sync, sync_steps):
+    with Floor(4, base_seed=2, workers=2, sync=sync, sync_steps=sync_steps, migration_rate=0.5,
+               max_entities=4) as floor:
+        for _ in range(6):
+            summaries = floor.run(20)
+            assert all(s.players + s.geese <= 4 for s in summaries)
+            assert all(count <= 4 for count in floor.populations.values())
+    moved_in = sum(s.migrated_in for s in summaries)
+    assert sum(s.migrated_out for s in summaries) == moved_in + floor.turned_away
+
+
+def test_floor_invalid_arguments():
+    with pytest.raises(ValueError):
+        Floor(2, sync="lockstep")
+    with pytest.raises(ValueError):
+        Floor(0)
+
+
+def test_floor_barrier_is_reproducible_across_workers():
+    with Floor(4, base_seed=3, workers=1, migration_rate=0.2) as floor:
+        single = floor.run(60)
+    with Floor(4, base_seed=3, workers=2, migration_rate=0.2) as floor:
+        sharded = floor.run(60)
+    assert single == sharded
+    assert [s.table for s in sharded] == [0, 1, 2, 3]
+    assert all(s.steps == 60 and s.sim_time > 0 for s in sharded)
+    totals = floor_totals(sharded)
+    assert totals["migrations"] == sum(s.migrated_in for s in sharded) > 0
+
+
+def test_floor_async_run():
+    with Floor(3, base_seed=4, workers=2, sync="async", migration_rate=0.2) as floor:
+        summaries = floor.run(50)
+    assert [s.steps for s in summaries] == [50, 50, 50]
+    assert sum(s.migrated_out for s in summaries) == sum(s.migrated_in for s in summaries) + floor.turned_away
+
+
+def test_table_admit_claims_name_and_renames_namesake():
+    table = Table(0, 1)
+    casino = table.casino
+    host = Migrant(2, "Player", "Михаэль", 10)
+    table.admit(host)
+    assert "Михаэль" not in casino.player_names
+    table.admit(Migrant(3, "Player", "Михаэль", 20))
+    table.admit(Migrant(4, "Player", "Михаэль", 30))
+    table.admit(Migrant(3, "Player", "Михаэль", 40))
+    names = [p.name for p in casino.players]
+    assert names == ["Михаэль", "Михаэль (стол 3)", "Михаэль (стол 4)", "Михаэль (стол 3, 2)"]
+    # Уход переименованного игрока не освобождает имя, которое ещё занято
+    casino.remove_player(casino.players.get_player_by_name("Михаэль (стол 3)"))
+    assert "Михаэль" not in casino.player_names
+    table.admit(Migrant(5, "HonkGoose", "Кряк", honk_volume=2))
+    table.admit(Migrant(6, "HonkGoose", "Кряк", honk_volume=3))
+    assert [g.name for g in casino.geese] == ["Кряк", "Кряк (стол 6)"]
+    assert "Кряк" not in casino.goose_names
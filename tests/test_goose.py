@@ -69,3 +69,26 @@ def test_goose_collection_iter():
     gc.append(goose)
     for g in gc:
         assert g == goose
+
+
+def test_goose_collection_counts_classes():
+    from src.goose import RichGoose
+    gc = GooseCollection()
+    gc.append(HonkGoose("Honk", 5))
+    gc.append(RichGoose("Rich", 1))
+    assert gc.count_of(HonkGoose) == 1
+    assert gc.count_of(Goose) == 2
+    gc[0] = RichGoose("Rich2", 1)
+    assert gc.count_of(HonkGoose) == 0
+    assert gc.count_of(RichGoose) == 2
+    del gc[0]
+    assert gc.count_of(RichGoose) == 1
+    gc.clear()
+    assert gc.count_of(Goose) == 0
+
+
+def test_geese_have_no_instance_dict():
+    from src.goose import RichGoose
+    for goose in (Goose("Slim", 2), HonkGoose("Slim", 2), RichGoose("Slim", 2)):
+        assert not hasattr(goose, "__dict__")
+        assert (goose.name, goose.honk_volume) == ("Slim", 2)
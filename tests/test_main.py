@@ -0,0 +1,123 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def run_python(code: str, cwd: Path) -> str:
+    result = subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {str(SRC)!r})\n{code}"],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def test_import_main_is_lazy(tmp_path):
+    loaded = run_python(
+        "import main\n"
+        "print(sorted(m for m in ('simulation', 'casino', 'asyncio', 'logging.config', 'colorama', 'ensemble',\n"
+        "                         'floor', 'agents', 'sweep', 'metrics', 'numpy') if m in sys.modules))",
+        tmp_path)
+    assert loaded.strip() == "[]"
+    assert not (tmp_path / "sim.log").exists()
+
+
+def test_headless_run_does_not_configure_logging(tmp_path):
+    handlers = run_python(
+        "import logging\n"
+        "from clock import VirtualClock\n"
+        "from simulation import run_simulation\n"
+        "run_simulation(steps=200, seed=1, clock=VirtualClock(), headless=True)\n"
+        "print(len(logging.getLogger().handlers))",
+        tmp_path)
+    assert handlers.strip() == "0"
+    assert not (tmp_path / "sim.log").exists()
+
+
+def test_logged_run_configures_logging_once(tmp_path):
+    handlers = run_python(
+        "import logging\n"
+        "from clock import VirtualClock\n"
+        "from simulation import run_simulation\n"
+        "run_simulation(steps=50, seed=1, clock=VirtualClock())\n"
+        "run_simulation(steps=50, seed=2, clock=VirtualClock())\n"
+        "logging.shutdown()\n"
+        "print(len(logging.getLogger().handlers))",
+        tmp_path)
+    assert handlers.strip() == "2"
+    assert "New events weights" in (tmp_path / "sim.log").read_text(encoding="utf-8")
+
+
+def test_cli_async_logging_moves_handlers_to_queue(tmp_path):
+    handlers = run_python(
+        "import logging\n"
+        "import simulation\n"
+        "from main import app\n"
+        "original = simulation.run_steps\n"
+        "def run_steps(*args, **kwargs):\n"
+        "    print([type(h).__name__ for h in logging.getLogger().handlers])\n"
+        "    original(*args, **kwargs)\n"
+        "simulation.run_steps = run_steps\n"
+        "app(['run-simulation', '--steps', '20', '--seed', '1', '--pace', 'virtual'], standalone_mode=False)\n"
+        "print([type(h).__name__ for h in logging.getLogger().handlers])",
+        tmp_path)
+    during, after = handlers.strip().splitlines()[-2:]
+    assert during == "['BoundedQueueHandler']"
+    assert after == "['StreamHandler', 'BatchingFileHandler']"
+
+
+def test_cli_resume_continues_from_checkpoint(tmp_path):
+    steps = run_python(
+        "from main import app\n"
+        "from snapshot import load_snapshot\n"
+        "app(['run-simulation', '--steps', '130', '--seed', '3', '--pace', 'virtual', '--headless',\n"
+        "     '--checkpoint', 'run.snap', '--checkpoint-every', '50'], standalone_mode=False)\n"
+        "print(load_snapshot('run.snap').step_count)\n"
+        "app(['resume', 'run.snap', '--steps', '20', '--pace', 'virtual', '--checkpoint-every', '50'],\n"
+        "    standalone_mode=False)\n"
+        "print(load_snapshot('run.snap').step_count)",
+        tmp_path)
+    assert steps.split() == ["130", "150"]
+
+
+def test_cli_ensemble_applies_params(tmp_path):
+    kills = run_python(
+        "from main import app\n"
+        "for extra in ([], ['--param', 'suicide_chance=1', '--param', 'player_class_weights=0/1']):\n"
+        "    app(['run-ensemble', '--replicas', '2', '--steps', '300', '--workers', '1', '--quiet', *extra],\n"
+        "        standalone_mode=False)",
+        tmp_path)
+    default, changed = [line.split()[1] for line in kills.splitlines() if line.startswith("kills")]
+    assert float(changed) == 0.0 != float(default)
+
+
+def test_cli_resume_keeps_snapshot_headless_unless_overridden(tmp_path):
+    run_python(
+        "from main import app\n"
+        "app(['run-simulation', '--steps', '20', '--seed', '1', '--pace', 'virtual', '--headless',\n"
+        "     '--checkpoint', 'run.snap'], standalone_mode=False)\n"
+        "app(['resume', 'run.snap', '--steps', '20', '--pace', 'virtual'], standalone_mode=False)",
+        tmp_path)
+    assert not (tmp_path / "sim.log").exists()
+    run_python(
+        "from main import app\n"
+        "app(['resume', 'run.snap', '--steps', '20', '--pace', 'virtual', '--no-headless'], standalone_mode=False)",
+        tmp_path)
+    assert (tmp_path / "sim.log").exists()
+
+
+def test_cli_resume_reports_only_snapshot_errors_as_bad_parameter(tmp_path):
+    errors = run_python(
+        "import simulation\n"
+        "from main import app\n"
+        "app(['run-simulation', '--steps', '20', '--seed', '1', '--pace', 'virtual', '--headless',\n"
+        "     '--checkpoint', 'run.snap'], standalone_mode=False)\n"
+        "def run_steps(*args, **kwargs):\n"
+        "    raise ValueError('ошибка прогона')\n"
+        "simulation.run_steps = run_steps\n"
+        "for snapshot in ('missing.snap', 'run.snap'):\n"
+        "    try:\n"
+        "        app(['resume', snapshot, '--pace', 'virtual'], standalone_mode=False)\n"
+        "    except Exception as e:\n"
+        "        print(type(e).__name__)",
+        tmp_path)
+    assert errors.split() == ["BadParameter", "ValueError"]
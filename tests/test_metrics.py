@@ -0,0 +1,143 @@
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+from src.events import Event, EventKind, ListSink
+from src.metrics import LiveMetrics, MetricsServer, MetricsSink, quantile, render_prometheus, serve_metrics
+# Классы из тех же модулей, что импортирует движок
+from goose import HonkGoose
+from player import Player, PsychoPlayer
+
+
+@pytest.fixture
+def casino():
+    casino = Casino(ChipCollection(), 5, clock=VirtualClock(), headless=True)
+    for player in (Player("Игрок", 100), Player("Игрок 2", 300), PsychoPlayer("Псих", 50)):
+        casino.add_player(player)
+    casino.add_goose(HonkGoose("Гусь", 2))
+    return casino
+
+
+def test_sink_counts_events():
+    sink = MetricsSink()
+    for kind in (EventKind.BET, EventKind.BET, EventKind.KILL):
+        sink(Event(1, 0.0, kind))
+    assert sink.counts[EventKind.BET] == 2
+    assert sink.counts[EventKind.KILL] == 1
+    assert sum(sink.counts) == 3
+
+
+def test_quantile():
+    values = list(range(1, 101))
+    assert quantile(values, 0.5) == 50
+    assert quantile(values, 0.99) == 99
+    assert quantile(values, 1.0) == 100
+    assert quantile([7], 0.5) == 7
+
+
+def test_collect_reports_state(casino):
+    metrics = LiveMetrics(casino)
+    metrics.attach()
+    listed = ListSink()
+    casino.attach_sink(listed)
+    for _ in range(300):
+        casino.perform_step()
+    data = metrics.collect()
+    assert data["steps"] == casino.step_count == 300
+    assert data["sim_time"] == casino.clock.now()
+    for kind in EventKind:
+        assert data["events"][kind.name] == sum(1 for e in listed.events if e.kind == kind)
+    assert sum(data["population"].values()) == len(casino.players) + len(casino.geese)
+    assert data["balance"]["total"] == sum(p.balance for p in casino.players)
+    assert data["open_bets"] == len(casino.bets)
+    assert data["psycho"]["count"] == casino.psycho_count()
+    assert data["steps_per_second"] > 0
+    json.dumps(data)
+    metrics.detach()
+    assert metrics.sink not in casino.sinks
+
+
+def test_rates_use_window(casino):
+    metrics = LiveMetrics(casino, window=1e-9)
+    metrics.attach()
+    metrics.collect()
+    for _ in range(50):
+        casino.perform_step()
+    first = metrics.collect()
+    assert first["steps"] == 50
+    # Окно почти нулевое: следующая частота считается только от предыдущего опроса
+    assert metrics.collect()["steps_per_second"] == 0.0
+    assert len(metrics._samples) == 2
+
+
+def test_kills_per_hour(casino):
+    metrics = LiveMetrics(casino)
+    metrics.attach()
+    casino.clock.reset(1800.0)
+    metrics.sink(Event(1, 0.0, EventKind.KILL))
+    assert metrics.collect()["kills_per_hour"] == pytest.approx(2.0)
+
+
+def test_bad_arguments(casino):
+    with pytest.raises(ValueError):
+        LiveMetrics(casino, window=0)
+
+
+def test_render_prometheus(casino):
+    text = render_prometheus(LiveMetrics(casino).collect())
+    assert "casino_steps_total 0" in text
+    assert 'casino_events_total{kind="KILL"} 0' in text
+    assert 'casino_population{class="Player"} 2' in text
+    assert "casino_balance_sum 450" in text
+    assert 'casino_balance{quantile="0.5"} 100' in text
+    assert 'casino_psycho_level_bucket{le="+Inf"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_http_endpoint_while_running(casino):
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            casino.perform_step()
+
+    with serve_metrics(casino, ("127.0.0.1", 0)) as server:
+        worker = threading.Thread(target=run)
+        worker.start()
+        try:
+            for _ in range(5):
+                with urllib.request.urlopen(server.url + ".json") as response:
+                    data = json.load(response)
+            with urllib.request.urlopen(server.url) as response:
+                assert "casino_steps_total" in response.read().decode()
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(server.url.replace("/metrics", "/other"))
+        finally:
+            stop.set()
+            worker.join()
+    assert data["steps"] > 0
+    assert casino.sinks == []
+
+
+def test_unix_socket_endpoint(casino, tmp_path):
+    path = str(tmp_path / "metrics.sock")
+    server = MetricsServer(LiveMetrics(casino), path)
+    with server:
+        assert server.url == f"unix:{path}"
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            client.sendall(b"GET /metrics.json HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(65536):
+                response += chunk
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.0 200")
+    assert json.loads(body)["population"]["Player"] == 2
+    assert not (tmp_path / "metrics.sock").exists()
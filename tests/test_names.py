@@ -0,0 +1,68 @@
+import random
+
+import pytest
+from src.names import NamePool, PLAYER_NAMES
+
+
+def test_name_pool_takes_unique_names_beyond_base():
+    pool = NamePool(["Иван", "Пётр"])
+    rng = random.Random(1)
+    names = [pool.take(rng) for _ in range(1000)]
+    assert len(set(names)) == 1000
+    assert set(names[:2]) == {"Иван", "Пётр"}
+    assert "Иван 2" in names and "Пётр 500" in names
+    assert pool.generation == 500
+    assert len(pool) == 0
+
+
+def test_name_pool_release_and_reuse():
+    pool = NamePool(PLAYER_NAMES)
+    rng = random.Random(2)
+    name = pool.take(rng)
+    assert name not in pool
+    assert len(pool) == len(PLAYER_NAMES) - 1
+    pool.release(name)
+    pool.release(name)
+    assert name in pool and pool[-1] == name
+    assert len(pool) == len(PLAYER_NAMES)
+    assert sorted(pool) == sorted(PLAYER_NAMES)
+    assert "NamePool" in repr(pool)
+
+
+def test_name_pool_restored_from_state():
+    pool = NamePool(["А"], free=["А 3"], generation=3)
+    rng = random.Random(3)
+    assert pool.take(rng) == "А 3"
+    assert pool.take(rng) == "А 4"
+
+
+def test_name_pool_requires_base_names():
+    with pytest.raises(ValueError):
+        NamePool([])
+
+
+def test_name_pool_skips_names_in_use():
+    held = {"Иван 2", "Пётр"}
+    pool = NamePool(["Иван", "Пётр"], free=["Иван"], in_use=held.__contains__)
+    rng = random.Random(4)
+    names = [pool.take(rng) for _ in range(3)]
+    assert names[0] == "Иван" and sorted(names[1:]) == ["Иван 3", "Пётр 2"]
+    pool.release("Пётр")
+    assert "Пётр" not in pool
+    held.discard("Пётр")
+    pool.release("Пётр")
+    assert "Пётр" in pool
+
+
+def test_casino_pool_does_not_reissue_seated_name():
+    from src.casino import Casino
+    from src.chip import ChipCollection
+    from src.player import Player
+
+    casino = Casino(ChipCollection(), seed=1, headless=True)
+    # Имя следующего поколения занято в обход пула, как у пришедшего с другого стола
+    casino.add_player(Player(f"{PLAYER_NAMES[0]} 2", 10))
+    rng = random.Random(5)
+    names = [casino.player_names.take(rng) for _ in range(2 * len(PLAYER_NAMES))]
+    assert f"{PLAYER_NAMES[0]} 2" not in names
+    assert len(set(names)) == len(names)
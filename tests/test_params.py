@@ -0,0 +1,91 @@
+import pytest
+
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+from src.events import ListSink
+# Классы из тех же модулей, что импортирует движок
+from goose import Goose
+from player import Player
+from src.params import CasinoParams, DEFAULT_PARAMS, coerce
+from src.snapshot import capture, restore
+
+CUSTOM = CasinoParams(goose_balance_scale=50.0, balance_weights=(0, 0, 0, 0, 0, 1), player_class_weights=(0, 1),
+                      bet_weights=(0, 0, 1), suicide_chance=1.0, psycho_growth=0.5)
+
+
+def run(params=None, steps=500, seed=3):
+    casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True,
+                    **({} if params is None else {"params": params}))
+    sink = ListSink()
+    casino.attach_sink(sink)
+    for _ in range(steps):
+        casino.perform_step()
+    return casino, sink.events
+
+
+def test_default_params_reproduce_run():
+    assert run()[1] == run(DEFAULT_PARAMS)[1]
+    assert run()[1] == run(CasinoParams())[1]
+
+
+def test_custom_params_change_behaviour():
+    casino, events = run(CUSTOM)
+    assert casino.params is CUSTOM
+    joins = [e for e in events if e.kind.name == "JOIN" and e.tag in ("Player", "PsychoPlayer")]
+    assert joins and all(e.tag == "PsychoPlayer" and e.balance == 500 for e in joins)
+    assert {e.tag for e in events if e.kind.name == "BET"} == {"зеро"}
+    assert not any(e.kind.name == "KILL" for e in events)
+    assert casino.players.psycho_growth == 0.5
+
+
+def test_event_weights_use_params():
+    plain = Casino(ChipCollection(), 0, clock=VirtualClock(), headless=True)
+    scaled = Casino(ChipCollection(), 0, clock=VirtualClock(), headless=True,
+                    params=DEFAULT_PARAMS._replace(goose_balance_scale=75.0))
+    for casino in (plain, scaled):
+        casino.add_player(Player("Игрок", 300))
+        casino.add_goose(Goose("Гусь"))
+    assert scaled.event_weights_for(300)["goose_action"] == pytest.approx(
+        2 * plain.event_weights_for(300)["goose_action"])
+
+
+@pytest.mark.parametrize("changes", [
+    {"goose_balance_scale": 0.0},
+    {"balance_weights": (1.0,)},
+    {"balance_values": (0, 1, 2, 3, 4, 5)},
+    {"bet_weights": (0.0, 0.0, 0.0)},
+    {"player_class_weights": (-1.0, 2.0)},
+    {"suicide_chance": 1.5},
+    {"psycho_growth": -0.1},
+])
+def test_check_rejects_bad_params(changes):
+    with pytest.raises(ValueError):
+        DEFAULT_PARAMS._replace(**changes).check()
+    with pytest.raises(ValueError):
+        Casino(ChipCollection(), params=DEFAULT_PARAMS._replace(**changes))
+
+
+def test_digest_and_changes():
+    assert DEFAULT_PARAMS.digest() == CasinoParams().digest()
+    assert CUSTOM.digest() != DEFAULT_PARAMS.digest()
+    assert DEFAULT_PARAMS.changes() == {}
+    assert DEFAULT_PARAMS._replace(suicide_chance=0.1).changes() == {"suicide_chance": 0.1}
+
+
+def test_coerce():
+    assert coerce("suicide_chance", "0.25") == 0.25
+    assert coerce("bet_weights", "0.4/0.4/0.2") == (0.4, 0.4, 0.2)
+    assert coerce("balance_values", "10/20") == (10, 20)
+    with pytest.raises(ValueError):
+        coerce("unknown", "1")
+
+
+def test_snapshot_keeps_params():
+    casino, _ = run(CUSTOM, steps=200)
+    restored = restore(capture(casino))
+    assert restored.params == CUSTOM
+    assert restored.players.psycho_growth == 0.5
+    state = capture(casino)
+    del state["params"]
+    assert restore(state).params == DEFAULT_PARAMS
@@ -1,5 +1,5 @@
 import pytest
-from src.player import Player, PsychoPlayer, PlayerCollection
+from src.player import Player, PsychoPlayer, PlayerCollection, PsychoIndex
 
 
 def test_player_init():
@@ -78,6 +78,34 @@ def test_player_collection_getitem_by_name(player_collection):
     assert player_collection["Bob"].name == "Bob"
 
 
+def test_player_collection_name_lookup_survives_namesake_removal():
+    collection = PlayerCollection()
+    first, second = Player("Иван", 1), Player("Иван", 2)
+    collection.append(first)
+    collection.append(Player("Пётр", 3))
+    collection.append(second)
+    collection.remove(first)
+    assert collection.get_player_by_name("Иван") is second
+    collection.remove(second)
+    assert collection.get_player_by_name("Иван") is None
+
+
+def test_player_collection_name_lookup_after_setitem():
+    collection = PlayerCollection()
+    first, second = Player("Иван", 1), Player("Иван", 2)
+    for player in (first, Player("Пётр", 3), second):
+        collection.append(player)
+    # Тёзка на месте Петра стоит раньше второго Ивана
+    third = Player("Иван", 4)
+    collection[1] = third
+    assert collection.get_player_by_name("Иван") is first
+    assert collection.get_player_by_name("Пётр") is None
+    collection[0] = Player("Олег", 5)
+    assert collection.get_player_by_name("Иван") is third
+    collection.remove(third)
+    assert collection.get_player_by_name("Иван") is second
+
+
 def test_player_collection_getitem_slice(player_collection):
     sliced = player_collection[0:2]
     assert len(sliced) == 2
@@ -92,3 +120,153 @@ def test_player_collection_contains(player_collection):
 def test_player_collection_get_player_by_name(player_collection):
     assert player_collection.get_player_by_name("Alice").name == "Alice"
     assert player_collection.get_player_by_name("Charlie") is None
+
+
+def test_psycho_player_update_psycho_broke_no_money():
+    psycho = PsychoPlayer("Test", 0)
+    psycho.psycho = 0.5
+    psycho.update_psycho(0)
+    assert 0.5 <= psycho.psycho <= 1.0
+
+
+def test_player_collection_assigns_stable_ids(player_collection):
+    alice, bob = player_collection["Alice"], player_collection["Bob"]
+    assert (alice.id, bob.id) == (0, 1)
+    player_collection.remove(alice)
+    carol = Player("Carol", 10)
+    player_collection.append(carol)
+    assert carol.id == 2
+    assert player_collection.get_player_by_id(1) is bob
+    assert player_collection.get_player_by_id(0) is None
+
+
+def test_player_collection_remove_keeps_order(player_collection):
+    player_collection.append(Player("Carol", 10))
+    player_collection.remove(player_collection["Bob"])
+    assert [p.name for p in player_collection] == ["Alice", "Carol"]
+    assert player_collection[1].name == "Carol"
+    assert player_collection["Bob"] is None
+
+
+def test_player_collection_remove_equal_foreign_object(player_collection):
+    player_collection.remove(Player("Alice", 100))
+    assert len(player_collection) == 1
+    with pytest.raises(ValueError):
+        player_collection.remove(Player("Nobody", 1))
+
+
+def test_player_collection_setitem_and_delitem(player_collection):
+    player_collection[0] = Player("Zoe", 5)
+    assert player_collection["Zoe"].id == 0
+    assert player_collection["Alice"] is None
+    del player_collection[0]
+    assert [p.name for p in player_collection] == ["Bob"]
+    assert "Bob" in repr(player_collection)
+
+
+def test_player_collection_tracks_total_balance(player_collection):
+    assert player_collection.total_balance == 300
+    player_collection["Alice"].balance -= 40
+    player_collection["Bob"].update_balance(15)
+    assert player_collection.total_balance == 275
+    player_collection.remove(player_collection["Bob"])
+    assert player_collection.total_balance == 60
+    player_collection[0] = Player("Zoe", 7)
+    assert player_collection.total_balance == 7
+
+
+def test_removed_player_no_longer_updates_collection(player_collection):
+    alice = player_collection["Alice"]
+    player_collection.remove(alice)
+    alice.balance += 1000
+    assert player_collection.total_balance == 200
+
+
+def test_player_collection_counts_classes(player_collection):
+    player_collection.append(PsychoPlayer("Psycho", 10))
+    assert player_collection.count_of(Player) == 3
+    assert player_collection.count_of(PsychoPlayer) == 1
+    player_collection.remove(player_collection["Psycho"])
+    assert player_collection.count_of(PsychoPlayer) == 0
+
+
+def test_psycho_index_tracks_levels():
+    players = PlayerCollection()
+    first, second = PsychoPlayer("P1", 10), PsychoPlayer("P2", 10)
+    players.append(Player("Calm", 10))
+    players.append(first)
+    players.append(second)
+    index = players.psycho_index
+    assert len(index) == 2
+    assert index.max_level() == 0.0
+    assert index.first_above(0.0) is None
+
+    second.psycho = 0.9
+    first.psycho = 0.6
+    assert index.max_level() == 0.9
+    # Срывается первый по порядку прихода, а не самый безумный
+    assert index.first_above(0.5) is first
+    assert index.first_above(0.7) is second
+
+    second.psycho = 0.1
+    assert index.max_level() == 0.6
+    assert index.first_above(0.7) is None
+
+    players.remove(first)
+    first.psycho = 1.0
+    assert len(index) == 1
+    assert index.first_above(0.05) is second
+
+
+def test_psycho_index_compacts_heap():
+    index = PsychoIndex()
+    players = PlayerCollection()
+    player = PsychoPlayer("P", 10)
+    players.append(player)
+    index.add(player)
+    for step in range(100):
+        player.psycho = step / 100
+        index.update(player)
+    assert len(index._heap) <= 2 * len(index) + 17
+    assert index.max_level() == 0.99
+
+
+def test_player_collection_append_with_id():
+    players = PlayerCollection()
+    players.append(Player("Old", 1), 7)
+    players.append(Player("New", 1))
+    assert [p.id for p in players] == [7, 8]
+    assert players.get_player_by_id(7).name == "Old"
+
+
+def test_players_have_no_instance_dict():
+    for player in (Player("Slim", 1), PsychoPlayer("Slim", 1)):
+        assert not hasattr(player, "__dict__")
+        with pytest.raises(AttributeError):
+            player.nickname = "x"
+
+
+def test_player_balance_cannot_be_negative():
+    with pytest.raises(ValueError):
+        Player("Debtor", -1)
+    player = Player("Debtor", 10)
+    with pytest.raises(ValueError):
+        player.balance = -10
+    with pytest.raises(ValueError):
+        player.update_balance(-11)
+    assert player.balance == 10
+    player.update_balance(-10)
+    assert player.balance == 0
+
+
+def test_player_balance_cannot_be_negative_with_chips():
+    from src.chip import Chip, ChipCollection, ChipRack
+    collection = PlayerCollection()
+    collection.chip_rack = ChipRack(ChipCollection([Chip("Белый", 1), Chip("Красный", 5)]))
+    player = Player("Debtor", 10)
+    collection.append(player)
+    holding, tray = list(player.chips), list(collection.chip_rack.tray)
+    with pytest.raises(ValueError):
+        player.balance = -10
+    assert (player.balance, player.chips, collection.chip_rack.tray) == (10, holding, tray)
+    assert collection.total_balance == 10
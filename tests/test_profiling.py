@@ -0,0 +1,81 @@
+import pytest
+
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+from src.events import ListSink
+from src.profiling import EventProfile, Profiler, profile
+from src.simulation import run_simulation
+
+
+@pytest.fixture
+def casino():
+    return Casino(ChipCollection(), 3, clock=VirtualClock(), headless=True)
+
+
+def test_profile_records_step_events(casino):
+    casino.attach_sink(ListSink())
+    with profile(casino) as profiler:
+        for _ in range(500):
+            casino.perform_step()
+    profiles = profiler.profiles
+    assert profiles["step"].count == 500
+    assert profiles["psycho_check"].count == 500
+    assert profiles["weights"].count + profiles.get("psycho_kill", EventProfile("")).count == 500
+    handled = sum(profiles[event].count for event in casino.events if event in profiles)
+    assert handled == profiles["weights"].count
+    assert profiles["sink:ListSink"].count > 0
+    assert profiles["step"].total >= profiles["weights"].total
+    assert "step" in profiler.report()
+
+
+def test_profile_detach_restores_casino(casino):
+    original_events = dict(casino.events)
+    sink = ListSink()
+    casino.attach_sink(sink)
+    with profile(casino):
+        casino.perform_step()
+    assert "perform_step" not in casino.__dict__
+    assert casino.events == original_events
+    assert casino.sinks == [sink]
+
+
+def test_profile_is_deterministic(casino):
+    plain = Casino(ChipCollection(), 3, clock=VirtualClock(), headless=True)
+    with profile(casino):
+        for _ in range(300):
+            casino.perform_step()
+    for _ in range(300):
+        plain.perform_step()
+    assert [p.balance for p in casino.players] == [p.balance for p in plain.players]
+
+
+def test_event_profile_histogram():
+    event_profile = EventProfile("x")
+    assert event_profile.percentile(50) == 0.0 and event_profile.mean == 0.0
+    for micros in (1, 3, 3, 100):
+        event_profile.add(micros / 1e6)
+    assert event_profile.count == 4
+    assert event_profile.percentile(50) == pytest.approx(4e-6)
+    assert event_profile.percentile(100) == pytest.approx(100e-6)
+    assert event_profile.mean == pytest.approx(26.75e-6)
+    assert "EventProfile" in repr(event_profile)
+
+
+def test_profiler_timed_propagates_errors():
+    profiler = Profiler()
+
+    def broken():
+        raise KeyError("x")
+
+    with pytest.raises(KeyError):
+        profiler.timed("broken", broken)()
+    assert profiler.profiles["broken"].count == 1
+    assert "broken" in repr(profiler)
+
+
+def test_run_simulation_with_profiler():
+    profiler = Profiler()
+    run_simulation(steps=50, seed=1, clock=VirtualClock(), headless=False, profiler=profiler)
+    assert profiler.profiles["step"].count == 50
+    assert profiler.profiles["logging"].count > 0
@@ -0,0 +1,173 @@
+import random
+
+import pytest
+
+from src.casino import Casino
+from src.chip import Chip, ChipCollection
+from src.clock import VirtualClock
+from src.events import EventKind, ListSink
+from src.replay import DecisionRecorder, DecisionReplayer, ReplayLog, ReplayRecorder, use_rng
+from src.snapshot import capture, load_snapshot, save_snapshot
+
+
+def make_casino(seed, rng=None):
+    chips = ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Чёрный", 100)])
+    return Casino(chips, seed, clock=VirtualClock(), headless=True, rng=rng)
+
+
+def run(casino, steps, recorder=None):
+    for _ in range(steps):
+        casino.perform_step()
+        if recorder is not None:
+            recorder.step()
+
+
+@pytest.fixture(scope="module")
+def recorded():
+    casino = make_casino(11)
+    recorder = ReplayRecorder(casino, keyframe_every=500)
+    run(casino, 3000, recorder)
+    recorder.close()
+    return casino, recorder.log()
+
+
+def test_recording_does_not_change_run(recorded):
+    casino, _ = recorded
+    plain = make_casino(11)
+    run(plain, 3000)
+    assert capture(casino) == capture(plain)
+    assert isinstance(casino.rng, random.Random)
+
+
+def test_recorder_keyframes(recorded):
+    _, log = recorded
+    assert [keyframe.step for keyframe in log.keyframes] == list(range(0, 3001, 500))
+    assert log.first_step == 0 and log.last_step == 3000
+    assert log.keyframe_for(1499).step == 1000
+    assert log.keyframe_for(1500).step == 1500
+
+
+@pytest.mark.parametrize("step", [0, 1, 777, 1500, 2999, 3000])
+def test_seek_matches_rerun(recorded, step):
+    _, log = recorded
+    plain = make_casino(11)
+    run(plain, step)
+    assert capture(log.seek(step)) == capture(plain)
+
+
+def test_seek_continues_with_same_events(recorded):
+    _, log = recorded
+    plain = make_casino(11)
+    run(plain, 2200)
+    replayed = log.seek(2200)
+    plain_sink, replayed_sink = ListSink(), ListSink()
+    plain.attach_sink(plain_sink)
+    replayed.attach_sink(replayed_sink)
+    run(plain, 800)
+    run(replayed, 800)
+    assert replayed_sink.events == plain_sink.events
+    with pytest.raises(RuntimeError):
+        run(replayed, 50)
+
+
+def test_seek_result_can_be_checkpointed(recorded, tmp_path):
+    _, log = recorded
+    replayed = log.seek(1234)
+    run(replayed, 100)
+    path = str(tmp_path / "seek.snap")
+    save_snapshot(replayed, path)
+    restored = load_snapshot(path)
+    assert isinstance(restored.rng, random.Random)
+    plain = make_casino(11)
+    run(plain, 1334)
+    assert capture(restored) == capture(plain)
+    # Снимок продолжается как исходный прогон, и за концом записи тоже
+    run(restored, 2000)
+    run(plain, 2000)
+    assert capture(restored) == capture(plain)
+
+
+def test_replayer_without_source_has_no_state():
+    with pytest.raises(TypeError):
+        DecisionReplayer([0.5], [1]).getstate()
+
+
+def test_seek_out_of_range(recorded):
+    _, log = recorded
+    with pytest.raises(ValueError):
+        log.seek(3001)
+    with pytest.raises(ValueError):
+        log.seek(-1)
+
+
+def test_replay_detects_divergence():
+    replayer = DecisionReplayer([0.5], [7])
+    with pytest.raises(RuntimeError):
+        replayer.randint(0, 5)
+    assert replayer.choice("abcdefgh") == "h"
+    assert replayer.random() == 0.5
+    with pytest.raises(RuntimeError):
+        replayer.random()
+
+
+@pytest.mark.parametrize("kind", ["stdlib", "numpy"])
+def test_decision_recorder_consumes_rng_like_source(kind):
+    if kind == "numpy":
+        pytest.importorskip("numpy")
+    from src.rng import make_rng
+    plain, wrapped = make_rng(5, kind), DecisionRecorder(make_rng(5, kind))
+    items = list("abcdefg")
+    for _ in range(100):
+        assert wrapped.random() == plain.random()
+        assert wrapped.randint(3, 90) == plain.randint(3, 90)
+        assert wrapped.choice(items) == plain.choice(items)
+        assert wrapped.choices(items, weights=[1, 2, 3, 4, 5, 6, 7]) == plain.choices(items, weights=[1, 2, 3, 4, 5, 6, 7])
+    assert len(wrapped.floats) == 100 and len(wrapped.ints) == 300
+
+
+def test_save_and_load(recorded, tmp_path):
+    _, log = recorded
+    path = str(tmp_path / "run.replay")
+    log.save(path)
+    loaded = ReplayLog.load(path)
+    assert loaded.last_step == 3000 and len(loaded.keyframes) == len(log.keyframes)
+    assert list(loaded.ints) == list(log.ints)
+    assert capture(loaded.seek(2345)) == capture(log.seek(2345))
+    (tmp_path / "bad").write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        ReplayLog.load(str(tmp_path / "bad"))
+
+
+def test_seek_to_kill(tmp_path):
+    casino = make_casino(3)
+    sink = ListSink()
+    casino.attach_sink(sink)
+    with ReplayRecorder(casino, str(tmp_path / "run.replay"), keyframe_every=1000) as recorder:
+        run(casino, 4000, recorder)
+    kills = [event for event in sink.events if event.kind in (EventKind.KILL, EventKind.SUICIDE)]
+    assert kills
+    log = ReplayLog.load(str(tmp_path / "run.replay"))
+    before = log.seek(kills[0].step - 1)
+    replayed_sink = ListSink()
+    before.attach_sink(replayed_sink)
+    before.perform_step()
+    assert kills[0] in replayed_sink.events
+
+
+def test_keyframes_and_checkpoints_capture_real_rng(tmp_path):
+    casino = make_casino(8)
+    recorder = ReplayRecorder(casino)
+    run(casino, 100, recorder)
+    path = str(tmp_path / "casino.snap")
+    save_snapshot(casino, path)
+    restored = load_snapshot(path)
+    assert isinstance(restored.rng, random.Random)
+    run(casino, 100, recorder)
+    run(restored, 100)
+    assert capture(restored) == capture(casino)
+    assert recorder.keyframes[0].state["rng"][0] == "stdlib"
+
+
+def test_invalid_keyframe_interval():
+    with pytest.raises(ValueError):
+        ReplayRecorder(make_casino(1), keyframe_every=0)
@@ -0,0 +1,109 @@
+import random
+import threading
+
+import pytest
+
+from src.rng import NumpyRandom, make_rng
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+
+
+def run_casino(seed, steps, rng=None):
+    casino = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True, rng=rng)
+    for _ in range(steps):
+        casino.perform_step()
+    return [(p.name, p.balance) for p in casino.players]
+
+
+def test_make_rng_stdlib():
+    assert isinstance(make_rng(1), random.Random)
+    assert make_rng(1).random() == make_rng(1).random()
+
+
+def test_make_rng_unknown():
+    with pytest.raises(ValueError):
+        make_rng(1, "mersenne")
+
+
+def test_casinos_do_not_share_rng():
+    alone = run_casino(5, 300)
+    first = Casino(ChipCollection(), 5, clock=VirtualClock(), headless=True)
+    second = Casino(ChipCollection(), 6, clock=VirtualClock(), headless=True)
+    for _ in range(300):
+        first.perform_step()
+        second.perform_step()
+        random.random()
+    assert [(p.name, p.balance) for p in first.players] == alone
+
+
+def test_casinos_reproducible_in_threads():
+    expected = {seed: run_casino(seed, 300) for seed in range(4)}
+    results = {}
+    threads = [threading.Thread(target=lambda s=seed: results.__setitem__(s, run_casino(s, 300)))
+               for seed in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == expected
+
+
+def test_add_goose_shares_casino_rng():
+    from src.goose import RichGoose
+    casino = Casino(ChipCollection(), 1, clock=VirtualClock(), headless=True)
+    goose = RichGoose("Rich", 1)
+    casino.add_goose(goose)
+    assert goose.rng is casino.rng
+
+
+@pytest.fixture
+def numpy_rng():
+    pytest.importorskip("numpy")
+    return NumpyRandom(42, block_size=16)
+
+
+def test_make_rng_numpy(numpy_rng):
+    assert isinstance(make_rng(1, "numpy"), NumpyRandom)
+
+
+def test_numpy_rng_reproducible(numpy_rng):
+    other = NumpyRandom(42, block_size=16)
+    assert [numpy_rng.random() for _ in range(40)] == [other.random() for _ in range(40)]
+
+
+def test_numpy_rng_ranges(numpy_rng):
+    values = [numpy_rng.randint(1, 6) for _ in range(500)]
+    assert set(values) == {1, 2, 3, 4, 5, 6}
+    assert numpy_rng.choice("abc") in "abc"
+    with pytest.raises(IndexError):
+        numpy_rng.choice([])
+
+
+def test_numpy_rng_choices(numpy_rng):
+    assert set(numpy_rng.choices("ab", k=50)) == {"a", "b"}
+    assert numpy_rng.choices("abc", weights=[0, 1, 0], k=10) == ["b"] * 10
+    with pytest.raises(ValueError):
+        numpy_rng.choices("ab", weights=[1])
+    with pytest.raises(ValueError):
+        numpy_rng.choices("ab", weights=[0, 0])
+
+
+def test_numpy_rng_batches(numpy_rng):
+    assert len(numpy_rng.random_batch(10)) == 10
+    batch = numpy_rng.integers_batch(0, 36, 1000)
+    assert batch.min() >= 0 and batch.max() <= 36
+
+
+def test_numpy_rng_state_roundtrip(numpy_rng):
+    numpy_rng.random()
+    state = numpy_rng.getstate()
+    expected = [numpy_rng.random() for _ in range(30)]
+    numpy_rng.setstate(state)
+    assert [numpy_rng.random() for _ in range(30)] == expected
+    assert "NumpyRandom" in repr(numpy_rng)
+
+
+def test_casino_runs_on_numpy_rng():
+    pytest.importorskip("numpy")
+    assert run_casino(1, 300, NumpyRandom(1)) == run_casino(1, 300, NumpyRandom(1))
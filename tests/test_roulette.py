@@ -0,0 +1,56 @@
+from fractions import Fraction
+
+import pytest
+
+from src.roulette import BET_BOOK, BET_INDEX, PAYOUT_TABLE, POCKET_COLORS, POCKETS, make_bet
+
+
+def test_bet_book_covers_european_layout():
+    kinds = {}
+    for spec in BET_BOOK:
+        kind = spec.name.split()[0]
+        kinds[kind] = kinds.get(kind, 0) + 1
+    assert kinds == {"зеро": 1, "стрейт": 36, "сплит": 60, "стрит": 12, "каре": 22, "дюжина": 3, "колонна": 3,
+                     "красное": 1, "чёрное": 1, "нечет": 1, "чёт": 1, "малые": 1, "большие": 1}
+    assert len(BET_INDEX) == len(BET_BOOK) + 1
+
+
+def test_straight_columns_match_numbers():
+    for number in range(POCKETS):
+        assert BET_BOOK[number].numbers == {number}
+    assert BET_INDEX["стрейт 0"] == BET_INDEX["зеро"] == 0
+
+
+@pytest.mark.parametrize("name,numbers,payout", [
+    ("сплит 0-2", {0, 2}, 18),
+    ("сплит 2-3", {2, 3}, 18),
+    ("сплит 33-36", {33, 36}, 18),
+    ("стрит 34-36", {34, 35, 36}, 12),
+    ("каре 32-36", {32, 33, 35, 36}, 9),
+    ("дюжина 2", set(range(13, 25)), 3),
+    ("колонна 3", set(range(3, 37, 3)), 3),
+    ("малые", set(range(1, 19)), 2),
+])
+def test_bet_specs(name, numbers, payout):
+    spec = BET_BOOK[BET_INDEX[name]]
+    assert spec.numbers == numbers
+    assert spec.payout == payout
+
+
+def test_payout_table_gives_house_edge_of_one_pocket():
+    assert len(PAYOUT_TABLE) == POCKETS
+    for column, spec in enumerate(BET_BOOK):
+        expected = Fraction(sum(row[column] for row in PAYOUT_TABLE), POCKETS)
+        assert expected == Fraction(36, 37), spec.name
+
+
+def test_pocket_colors():
+    assert POCKET_COLORS[0] == "зеро"
+    assert POCKET_COLORS.count("красное") == POCKET_COLORS.count("чёрное") == 18
+    assert POCKET_COLORS[1] == "красное" and POCKET_COLORS[2] == "чёрное"
+
+
+def test_make_bet():
+    assert make_bet("стрейт 0", 5) == ("зеро", 5, 0)
+    with pytest.raises(ValueError):
+        make_bet("каре 3-7", 5)
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+import pytest
+from src.rng import NumpyRandom
+from src.sampler import AliasSampler, CumulativeSampler
+
+
+def test_alias_sampler_matches_distribution():
+    sampler = AliasSampler("abc", [0.47, 0.48, 0.05])
+    rng = random.Random(1)
+    counts = Counter(sampler.draw(rng) for _ in range(40000))
+    assert counts["a"] / 40000 == pytest.approx(0.47, abs=0.015)
+    assert counts["b"] / 40000 == pytest.approx(0.48, abs=0.015)
+    assert counts["c"] / 40000 == pytest.approx(0.05, abs=0.01)
+    assert len(sampler) == 3
+    assert "AliasSampler" in repr(sampler)
+
+
+def test_alias_sampler_zero_weight_never_drawn():
+    sampler = AliasSampler("abc", [0, 1, 0])
+    rng = random.Random(2)
+    assert set(sampler.draw_batch(rng, 200)) == {"b"}
+
+
+@pytest.mark.parametrize("population,weights", [("ab", [1]), ("", []), ("ab", [0, 0])])
+def test_alias_sampler_invalid(population, weights):
+    with pytest.raises(ValueError):
+        AliasSampler(population, weights)
+
+
+def test_alias_sampler_batch_uses_one_uniform_per_draw():
+    sampler = AliasSampler([50, 100, 150], [0.5, 0.3, 0.2])
+    single, batch = random.Random(3), random.Random(3)
+    expected = [sampler.draw(single) for _ in range(100)]
+    assert sampler.draw_batch(batch, 100) == expected
+    assert single.random() == batch.random()
+
+
+def test_alias_sampler_numpy_batch():
+    pytest.importorskip("numpy")
+    sampler = AliasSampler("ab", [0.25, 0.75])
+    indices = sampler.draw_indices(NumpyRandom(4), 20000)
+    assert len(indices) == 20000
+    assert indices.mean() == pytest.approx(0.75, abs=0.02)
+
+
+def test_cumulative_sampler_matches_random_choices():
+    weights = {"x": 0.2, "y": 0.0, "z": 1.3}
+    sampler = CumulativeSampler(weights)
+    ours, theirs = random.Random(5), random.Random(5)
+    for _ in range(200):
+        assert sampler.draw(ours) == theirs.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def test_cumulative_sampler_set_weight():
+    sampler = CumulativeSampler({"x": 1.0})
+    rng = random.Random(6)
+    sampler.draw(rng)
+    cached = sampler._cum_weights
+    sampler.set_weight("x", 1.0)
+    assert sampler._cum_weights is cached
+    sampler.set_weight("w", 5.0)
+    sampler.set_weight("x", 0.0)
+    assert sampler.draw_batch(rng, 10) == ["w"] * 10
+    assert "CumulativeSampler" in repr(sampler)
+
+
+def test_cumulative_sampler_zero_total():
+    sampler = CumulativeSampler({"x": 0.0})
+    with pytest.raises(ValueError):
+        sampler.draw(random.Random(7))
+
+
+def test_cumulative_sampler_numpy_batch():
+    pytest.importorskip("numpy")
+    sampler = CumulativeSampler({"x": 1.0, "y": 3.0})
+    counts = Counter(sampler.draw_batch(NumpyRandom(8), 20000))
+    assert counts["y"] / 20000 == pytest.approx(0.75, abs=0.02)
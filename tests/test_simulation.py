@@ -13,3 +13,60 @@ def test_run_simulation_calls_casino():
 
         args, kwargs = mock_casino_class.call_args
         assert args[1] == 42
+
+
+def test_run_simulation_writes_event_stream(tmp_path):
+    from src.clock import VirtualClock
+    from src.event_stream import EventStreamReader
+
+    path = str(tmp_path / "events.bin")
+    run_simulation(steps=30, seed=1, clock=VirtualClock(), headless=True, events_path=path)
+    with EventStreamReader(path) as reader:
+        assert len(reader) > 0
+        assert reader[0].step == 1
+
+
+def test_run_simulation_checkpoint(tmp_path):
+    from src.clock import VirtualClock
+    from src.snapshot import load_snapshot
+
+    path = str(tmp_path / "casino.snap")
+    run_simulation(steps=130, seed=3, clock=VirtualClock(), headless=True, checkpoint_path=path,
+                   checkpoint_every=50)
+    assert load_snapshot(path).step_count == 130
+
+
+def test_run_simulation_records_replay(tmp_path):
+    from src.clock import VirtualClock
+    from src.replay import ReplayLog
+
+    path = str(tmp_path / "run.replay")
+    run_simulation(steps=250, seed=4, clock=VirtualClock(), headless=True, record_path=path, keyframe_every=100,
+                   checkpoint_path=str(tmp_path / "casino.snap"), checkpoint_every=100)
+    log = ReplayLog.load(path)
+    assert [keyframe.step for keyframe in log.keyframes] == [0, 100, 200]
+    assert log.seek(250).step_count == 250
+
+
+
+def test_run_simulation_serves_metrics(tmp_path):
+    import os
+    from contextlib import contextmanager
+    import metrics
+    from src.clock import VirtualClock
+
+    servers = []
+    original = metrics.serve_metrics
+
+    @contextmanager
+    def spy(casino, address):
+        with original(casino, address) as server:
+            servers.append(server)
+            yield server
+
+    path = str(tmp_path / "metrics.sock")
+    with patch("metrics.serve_metrics", spy):
+        run_simulation(steps=50, seed=5, clock=VirtualClock(), headless=True, metrics_address=path)
+    assert servers[0].metrics.collect()["steps"] == 50
+    assert servers[0].metrics.sink not in servers[0].metrics.casino.sinks
+    assert not os.path.exists(path)
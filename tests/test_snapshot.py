@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from src.casino import Casino
+from src.chip import Chip, ChipCollection
+from src.clock import VirtualClock
+from src.events import ListSink
+# Генератор из того же модуля, что импортирует snapshot, иначе не сработает isinstance
+from rng import make_rng
+from src.snapshot import Checkpointer, capture, restore, save_snapshot, load_snapshot, rng_kind
+
+
+def warmed_casino(steps=300, kind="stdlib"):
+    casino = Casino(ChipCollection([Chip("Белый", 1)]), clock=VirtualClock(), headless=True,
+                    rng=make_rng(11, kind))
+    for _ in range(steps):
+        casino.perform_step()
+    return casino
+
+
+def continue_run(casino, steps=200):
+    sink = ListSink()
+    casino.attach_sink(sink)
+    for _ in range(steps):
+        casino.perform_step()
+    return sink.events
+
+
+@pytest.mark.parametrize("kind", ["stdlib", "numpy"])
+def test_restore_continues_identically(kind):
+    if kind == "numpy":
+        pytest.importorskip("numpy")
+    original = warmed_casino(kind=kind)
+    copy = restore(capture(original))
+    assert copy.step_count == original.step_count
+    assert copy.clock.now() == original.clock.now()
+    assert continue_run(copy) == continue_run(original)
+    assert capture(copy) == capture(original)
+
+
+def test_restore_keeps_ids_bets_and_pools():
+    casino = warmed_casino()
+    player = casino.players[len(casino.players) - 1]
+    casino.bets.clear_bets()
+    casino.bets.place_bet(player.id, "зеро", 5)
+    copy = restore(capture(casino))
+    assert [p.id for p in copy.players] == [p.id for p in casino.players]
+    assert copy.bets.data == casino.bets.data
+    assert list(copy.player_names) == list(casino.player_names)
+    assert copy.player_names.generation == casino.player_names.generation
+    assert copy.max_entities == casino.max_entities
+    assert copy.event_weights == casino.event_weights
+    assert copy.psycho_count() == casino.psycho_count()
+    assert [g.rng for g in copy.geese] == [copy.rng] * len(copy.geese)
+    assert [(c.color, c.value) for c in copy.chips] == [("Белый", 1)]
+
+
+def test_restore_keeps_chips():
+    chips = ChipCollection([Chip("Белый", 1), Chip("Красный", 5), Chip("Зелёный", 25), Chip("Чёрный", 100)])
+    casino = Casino(chips, clock=VirtualClock(), headless=True, rng=make_rng(11))
+    for _ in range(300):
+        casino.perform_step()
+    state = capture(casino)
+    copy = restore(state)
+    assert [p.chips for p in copy.players] == [p.chips for p in casino.players]
+    assert copy.chip_rack.tray == casino.chip_rack.tray
+    # Состояние не делит списки фишек ни с исходным, ни с восстановленным казино
+    copy.perform_step()
+    assert capture(casino) == state
+    assert capture(restore(state))["chip_tray"] == state["chip_tray"]
+
+
+def test_snapshot_file_roundtrip(tmp_path):
+    casino = warmed_casino()
+    path = str(tmp_path / "casino.snap")
+    save_snapshot(casino, path)
+    assert not os.path.exists(path + ".tmp")
+    copy = load_snapshot(path, headless=False)
+    assert not copy.headless and copy.sinks
+    assert capture(load_snapshot(path)) == capture(casino)
+
+
+def test_load_snapshot_rejects_foreign_file(tmp_path):
+    path = tmp_path / "junk.snap"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+
+def test_capture_rejects_unsupported_state():
+    casino = warmed_casino(10)
+    casino.rng = object()
+    with pytest.raises(TypeError):
+        capture(casino)
+    with pytest.raises(TypeError):
+        rng_kind(None)
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_checkpointer_saves_every_n_steps(tmp_path, background):
+    casino = warmed_casino(0)
+    path = str(tmp_path / "casino.snap")
+    with Checkpointer(casino, path, every=50, background=background) as checkpointer:
+        for _ in range(120):
+            casino.perform_step()
+            checkpointer.step()
+    assert load_snapshot(path).step_count == 100
+
+
+def test_checkpointer_reports_failed_background_write(tmp_path):
+    casino = warmed_casino(1)
+    checkpointer = Checkpointer(casino, str(tmp_path / "missing" / "casino.snap"), background=True)
+    checkpointer.save()
+    with pytest.raises(RuntimeError):
+        checkpointer.close()
+
+
+def test_checkpointer_invalid_interval():
+    with pytest.raises(ValueError):
+        Checkpointer(warmed_casino(0), "unused", every=0)
@@ -0,0 +1,86 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.ensemble import run_replica
+from src.params import CasinoParams, DEFAULT_PARAMS
+from src.sweep import SweepCache, Uniform, grid, parse_axis, random_search, run_sweep
+
+
+def test_grid_covers_all_combinations():
+    points = grid(suicide_chance=[0.2, 0.4, 0.6], psycho_growth=[0.01, 0.05])
+    assert len(points) == 6
+    assert len(set(points)) == 6
+    assert points[0] == DEFAULT_PARAMS._replace(suicide_chance=0.2, psycho_growth=0.01)
+    assert grid() == [DEFAULT_PARAMS]
+    with pytest.raises(ValueError):
+        grid(unknown=[1])
+    with pytest.raises(ValueError):
+        grid(suicide_chance=[2.0])
+
+
+def test_random_search():
+    space = {"psycho_growth": Uniform(0.01, 0.05), "bet_weights": [(0.47, 0.48, 0.05), (0.3, 0.3, 0.4)]}
+    points = random_search(space, 5, seed=1)
+    assert points == random_search(space, 5, seed=1)
+    assert len(points) == 5
+    assert all(0.01 <= p.psycho_growth <= 0.05 for p in points)
+    assert all(p.suicide_chance == DEFAULT_PARAMS.suicide_chance for p in points)
+    with pytest.raises(ValueError):
+        random_search({"bet_weights": Uniform(0, 1)}, 1)
+
+
+def test_parse_axis():
+    assert parse_axis("suicide_chance=0.2,0.4") == ("suicide_chance", [0.2, 0.4])
+    assert parse_axis("bet-weights=0.5/0.5/0") == ("bet_weights", [(0.5, 0.5, 0.0)])
+    assert parse_axis("psycho_growth=0.01:0.05", ranges=True) == ("psycho_growth", Uniform(0.01, 0.05))
+    for text in ("suicide_chance", "suicide_chance=", "unknown=1"):
+        with pytest.raises(ValueError):
+            parse_axis(text)
+    with pytest.raises(ValueError):
+        parse_axis("bet_weights=0:1", ranges=True)
+
+
+def test_cache_round_trip(tmp_path):
+    cache = SweepCache(str(tmp_path))
+    key = cache.key(DEFAULT_PARAMS, 7, 100, "stdlib")
+    assert key != cache.key(DEFAULT_PARAMS._replace(suicide_chance=0.5), 7, 100, "stdlib")
+    assert key != cache.key(DEFAULT_PARAMS, 8, 100, "stdlib")
+    assert cache.get(key) is None
+    summary = run_replica(0, 7, 100)
+    cache.put(key, summary)
+    assert cache.get(key) == summary
+    assert (cache.hits, cache.misses) == (1, 1)
+    with open(os.path.join(tmp_path, key[:2], key + ".json"), "w") as f:
+        f.write("{")
+    assert cache.get(key) is None
+
+
+def test_run_sweep_uses_common_seeds():
+    points = grid(suicide_chance=[0.0, 1.0])
+    results = run_sweep(points, steps=200, replicas=3, base_seed=4, workers=1)
+    assert [r.params for r in results] == points
+    assert [s.seed for s in results[0].summaries] == [s.seed for s in results[1].summaries]
+    assert results[1].metrics["kills"].mean == 0.0
+    assert all(r.cached == 0 for r in results)
+
+
+def test_run_sweep_skips_cached_replicas(tmp_path):
+    points = grid(psycho_growth=[0.02, 0.1])
+    cache = SweepCache(str(tmp_path))
+    first = run_sweep(points[:1], steps=150, replicas=2, workers=1, cache=cache)
+    with patch("src.sweep.run_replica", wraps=run_replica) as runner:
+        second = run_sweep(points, steps=150, replicas=2, workers=1, cache=cache)
+    assert runner.call_count == 2
+    assert [r.cached for r in second] == [2, 0]
+    assert second[0].summaries == first[0].summaries
+    assert run_sweep(points, steps=150, replicas=2, workers=1) == [r._replace(cached=0) for r in second]
+
+
+def test_run_sweep_process_pool_matches_inline(tmp_path):
+    points = grid(suicide_chance=[0.2, 0.8])
+    inline = run_sweep(points, steps=100, replicas=2, workers=1)
+    pooled = run_sweep(points, steps=100, replicas=2, workers=2, cache=SweepCache(str(tmp_path)))
+    assert pooled == inline
+    assert len(list(tmp_path.rglob("*.json"))) == 4
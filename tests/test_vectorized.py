@@ -0,0 +1,173 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.casino import Casino
+from src.chip import ChipCollection
+from src.clock import VirtualClock
+from src.events import EventKind, ListSink
+# Классы берутся из тех же модулей, что импортирует движок, иначе не сработает isinstance
+from goose import HonkGoose, RichGoose
+from player import Player, PsychoPlayer
+from src.vectorized import PlayerArrays, VectorCasino, NO_BET
+from src.roulette import BET_INDEX
+
+
+def state(players):
+    return [(p.name, p.balance, getattr(p, "psycho", None)) for p in players]
+
+
+@pytest.fixture
+def vector_casino():
+    return VectorCasino(ChipCollection(), seed=42, clock=VirtualClock(), headless=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_vector_casino_matches_casino(seed):
+    plain = Casino(ChipCollection(), seed, clock=VirtualClock(), headless=True)
+    vector = VectorCasino(ChipCollection(), seed, clock=VirtualClock(), headless=True)
+    plain_sink, vector_sink = ListSink(), ListSink()
+    plain.attach_sink(plain_sink)
+    vector.attach_sink(vector_sink)
+    for _ in range(1500):
+        plain.perform_step()
+        vector.perform_step()
+    assert state(vector.players.to_players()) == state(plain.players)
+    assert sorted(vector_sink.events) == sorted(plain_sink.events)
+
+
+def test_player_arrays_append_and_grow():
+    store = PlayerArrays(capacity=2)
+    for i in range(5):
+        store.append(f"p{i}", 10 * i, is_psycho=i % 2 == 1)
+    assert len(store) == 5
+    assert store.balance.tolist() == [0, 10, 20, 30, 40]
+    assert store.is_psycho.tolist() == [False, True, False, True, False]
+    assert store.bet_type.tolist() == [NO_BET] * 5
+    assert "size=5" in repr(store)
+
+
+def test_player_arrays_delete_keeps_order():
+    store = PlayerArrays()
+    store.extend(["a", "b", "c"], [1, 2, 3], [False, True, False])
+    store.delete(1)
+    assert store.names == ["a", "c"]
+    assert store.balance.tolist() == [1, 3]
+    assert store.is_psycho.tolist() == [False, False]
+
+
+def test_player_arrays_to_players():
+    store = PlayerArrays()
+    store.append("a", 5)
+    store.append("b", 7, is_psycho=True, psycho=0.5)
+    players = store.to_players()
+    assert isinstance(players[0], Player) and not isinstance(players[0], PsychoPlayer)
+    assert isinstance(players[1], PsychoPlayer) and players[1].psycho == 0.5
+
+
+def test_vector_casino_bulk_spin(vector_casino):
+    vector_casino.add_players([f"p{i}" for i in range(1000)], 100, [i % 2 == 1 for i in range(1000)])
+    players = vector_casino.players
+    players.bet_type[:] = BET_INDEX["красное"]
+    players.bet_amount[:] = 10
+    players.balance[:] -= 10
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(vector_casino.rng, "randint", lambda a, b: 1)
+        vector_casino.spin_wheel()
+    assert (players.balance == 110).all()
+    assert (players.bet_type == NO_BET).all()
+    assert vector_casino.open_bets_count() == 0
+
+
+def test_vector_casino_goose_broadcasts(vector_casino):
+    vector_casino.add_player(PsychoPlayer("Psycho", 100))
+    vector_casino.add_player(Player("Poor", 3))
+    honk, rich = HonkGoose("Honk", 2), RichGoose("Rich", 1)
+    vector_casino.add_goose(honk)
+    vector_casino.add_goose(rich)
+    sink = ListSink()
+    vector_casino.attach_sink(sink)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(vector_casino.rng, "choice", lambda seq: honk)
+        vector_casino.goose_action()
+    assert vector_casino.players.balance.tolist() == [96, 3]
+    assert vector_casino.players.psycho[0] > 0.0
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(vector_casino.rng, "choice", lambda seq: rich)
+        mp.setattr(vector_casino.rng, "randint", lambda a, b: 5)
+        vector_casino.goose_action()
+    assert vector_casino.players.balance.tolist() == [101, 8]
+    assert [e.kind for e in sink.events] == [EventKind.HONK, EventKind.GIFT]
+
+
+def test_vector_casino_kill_and_suicide(vector_casino):
+    vector_casino.add_player(Player("Victim", 0))
+    vector_casino.add_player(PsychoPlayer("Psycho", 0))
+    sink = ListSink()
+    vector_casino.attach_sink(sink)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(vector_casino.rng, "random", lambda: 0.9)
+        vector_casino.kill_player(1)
+    assert vector_casino.players.names == ["Psycho"]
+    assert sink.events[-1].kind == EventKind.KILL
+    vector_casino.kill_player(0)
+    assert len(vector_casino.players) == 0
+    assert sink.events[-1].kind == EventKind.SUICIDE
+    assert "Victim" in vector_casino.player_names and "Psycho" in vector_casino.player_names
+
+
+def test_vector_casino_find_killer_first_in_order(vector_casino):
+    vector_casino.add_player(PsychoPlayer("A", 10))
+    vector_casino.add_player(PsychoPlayer("B", 10))
+    vector_casino.players.psycho[:] = [0.3, 0.9]
+    assert vector_casino.find_killer(0.5) == 1
+    assert vector_casino.find_killer(0.1) == 0
+    assert vector_casino.find_killer(0.95) is None
+
+
+def test_vector_casino_goose_steal_edge_cases(vector_casino):
+    vector_casino.goose_steal()
+    vector_casino.add_player(Player("Broke", 0))
+    vector_casino.add_goose(HonkGoose("Honk", 1))
+    vector_casino.goose_steal()
+    assert vector_casino.players.balance.tolist() == [0]
+    vector_casino.make_random_bet()
+    assert vector_casino.open_bets_count() == 0
+
+
+def test_vector_casino_snapshot_not_supported(vector_casino):
+    from src.snapshot import capture
+    with pytest.raises(TypeError):
+        capture(vector_casino)
+
+
+def test_vector_casino_matches_casino_with_params():
+    from src.params import CasinoParams
+    params = CasinoParams(goose_balance_scale=100.0, bet_weights=(0.2, 0.2, 0.6), suicide_chance=0.9,
+                          psycho_growth=0.2, psycho_exponent=0.5)
+    plain = Casino(ChipCollection(), 5, clock=VirtualClock(), headless=True, params=params)
+    vector = VectorCasino(ChipCollection(), 5, clock=VirtualClock(), headless=True, params=params)
+    for _ in range(1500):
+        plain.perform_step()
+        vector.perform_step()
+    assert state(vector.players.to_players()) == state(plain.players)
+
+
+def test_vector_casino_rejects_bet_book_bets(vector_casino):
+    vector_casino.add_player(Player("Игрок", 100))
+    with pytest.raises(TypeError):
+        vector_casino.place_bet(Player("Игрок", 100), "красное", 10)
+    with pytest.raises(TypeError):
+        vector_casino.place_player_bet(Player("Игрок", 100))
+    assert vector_casino.players.balance.tolist() == [100]
+    assert vector_casino.open_bets_count() == 0
+
+
+def test_vector_casino_remove_player(vector_casino):
+    for name, balance in (("a", 10), ("b", 20), ("c", 30)):
+        vector_casino.add_player(Player(name, balance))
+    vector_casino.remove_player(Player("b", 0))
+    assert vector_casino.players.names == ["a", "c"]
+    assert vector_casino.players.balance.tolist() == [10, 30]
+    with pytest.raises(ValueError):
+        vector_casino.remove_player(Player("b", 0))